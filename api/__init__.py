@@ -0,0 +1,2 @@
+#!/usr/bin/python3
+"""HTTP JSON API serving the models held in storage"""
@@ -0,0 +1,492 @@
+#!/usr/bin/python3
+"""
+API Server: Definition, documentation and encapsulation of a
+read-only HTTP JSON API over the models held in storage
+
+Routes
+------
+    GET /api/<model>        all instances of the model
+    GET /api/<model>/<id>   the instance of the given id
+
+Responses carry an `ETag` derived from the instances' ids and
+`updated_at`, such that polling clients revalidating with
+`If-None-Match` are answered with a bodiless `304 Not Modified`
+while the data is unchanged. Single instances also carry a
+`Last-Modified` honoured by `If-Modified-Since`; listings do
+not, a deletion leaving the latest `updated_at` unmoved
+
+Usage
+-----
+    python3 -m api.server [--host 0.0.0.0] [--port 5000] [--workers 8]
+"""
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib import import_module
+from time import monotonic
+import argparse
+import selectors
+import threading
+import hashlib
+import socket
+import queue
+import json
+
+
+models = import_module("models")
+
+
+class APIHandler(BaseHTTPRequestHandler):
+    """
+    Handles requests of a single, possibly kept-alive, connection,
+    one request at a time, the connection being left to the server
+    between requests rather than held by a worker thread
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = "AirBnBAPI/1.0"
+    timeout = 15
+
+    def do_GET(self):
+        """Serves an instance or all instances of a model"""
+
+        parts = self.path.split("?")[0].strip("/").split("/")
+
+        if len(parts) not in [2, 3] or parts[0] != "api":
+            return self.send_json(404, {"error": "Not found"})
+
+        model_name = parts[1]
+        is_model = model_name in models.ALL_MODELS
+
+        if not is_model or models.BaseModel.is_base_model(model_name):
+            return self.send_json(404, {"error": "Model not found"})
+
+        models.storage.refresh()
+
+        if len(parts) == 3:
+            return self.send_instance(f"{model_name}.{parts[2]}")
+
+        self.send_instances(f"{model_name}.")
+
+    def finish(self):
+        """
+        Flushes the response, closing the files of the connection
+        only once the connection is to be closed
+        """
+
+        if self.close_connection:
+            return super().finish()
+
+        self.wfile.flush()
+
+    def handle(self):
+        """Serves the first request of the connection"""
+
+        self.close_connection = True
+        self.handle_one_request()
+
+    def is_pending(self):
+        """
+        Whether the next request, or the end of the connection, has
+        arrived, found without waiting
+
+        Return
+        ------
+        bool
+            whether the connection can be read without blocking
+        """
+
+        self.connection.settimeout(0)
+
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            return True
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def resume(self):
+        """Serves the next request of a kept-alive connection"""
+
+        try:
+            self.close_connection = True
+            self.handle_one_request()
+        finally:
+            self.finish()
+
+    def log_message(self, format, *args):
+        """Logs requests only should the server be verbose"""
+
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_instance(self, key):
+        """
+        Serves the instance of the given key, revalidated on its
+        own `updated_at`
+
+        Parameter
+        ---------
+        key : str
+            retrieval key of <model class name>.id
+        """
+
+        dict_ = models.storage.get(key)
+
+        if not dict_:
+            return self.send_json(404, {"error": "Instance not found"})
+
+        updated_at = dict_.get("updated_at", "")
+        etag = entity_tag([(key, updated_at)])
+
+        if self.is_not_modified(etag, updated_at):
+            return self.send_not_modified(etag, updated_at)
+
+        self.send_json(200, dict_, etag, updated_at)
+
+    def send_instances(self, prefix):
+        """
+        Serves all instances of a model, revalidated on the ids
+        and `updated_at` of every instance, such that additions,
+        changes and deletions all alter the `ETag`. No time of
+        last modification is given, the latest `updated_at` being
+        unmoved by deletions, nor restores of older instances
+
+        Parameter
+        ---------
+        prefix : str
+            <model class name>. shared by the instances' keys
+        """
+
+        items = [
+            (key, dict_)
+            for key, dict_ in models.storage.snapshot().items()
+            if key.startswith(prefix)
+        ]
+
+        versions = [(key, dict_.get("updated_at", "")) for key, dict_ in items]
+        etag = entity_tag(versions)
+
+        if self.is_not_modified(etag):
+            return self.send_not_modified(etag)
+
+        body = [dict_ for _, dict_ in items]
+        self.send_json(200, body, etag)
+
+    def is_not_modified(self, etag, updated_at=None):
+        """
+        Evaluates the request's preconditions, `If-None-Match`
+        taking precedence over `If-Modified-Since`
+
+        Parameters
+        ----------
+        etag : str
+            current entity tag of the resource
+
+        updated_at : str | None
+            ISO formatted time the resource was last modified, None
+            where it is unknown and `If-Modified-Since` is ignored
+        """
+
+        if_none_match = self.headers.get("If-None-Match")
+
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        last_modified = http_datetime(updated_at)
+
+        if not if_modified_since or not last_modified:
+            return False
+
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+        return last_modified <= since
+
+    def send_not_modified(self, etag, updated_at=None):
+        """Answers a revalidation of an unchanged resource"""
+
+        self.send_response(304)
+        self.send_validators(etag, updated_at)
+        self.end_headers()
+
+    def send_json(self, status, body, etag=None, updated_at=None):
+        """
+        Answers with a JSON body
+
+        Parameters
+        ----------
+        status : int
+            HTTP status code
+
+        body : Any
+            JSON serialisable content
+
+        etag : str | None
+            entity tag of the resource
+
+        updated_at : str | None
+            ISO formatted time the resource was last modified
+        """
+
+        content = json.dumps(body).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+
+        if etag:
+            self.send_validators(etag, updated_at)
+
+        self.end_headers()
+        self.wfile.write(content)
+
+    def send_validators(self, etag, updated_at=None):
+        """Sends the headers used by clients to revalidate"""
+
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", "no-cache")
+        last_modified = http_datetime(updated_at)
+
+        if last_modified:
+            self.send_header(
+                "Last-Modified", format_datetime(last_modified, usegmt=True)
+            )
+
+
+class APIServer(HTTPServer):
+    """
+    HTTP server handing each request to a bounded pool of worker
+    threads. Between requests, kept-alive connections are watched
+    by a single thread rather than holding a worker, such that
+    idle clients never keep others waiting, and are closed once
+    idle for the handler's timeout
+    """
+
+    """seconds between checks for connections idle too long"""
+    POLL = 0.5
+
+    def __init__(self, address, workers=8, verbose=False):
+        """
+        Parameters
+        ----------
+        address : tuple[str, int]
+            host and port to listen on, port 0 choosing any
+
+        workers : int
+            maximum number of requests served at once
+
+        verbose : bool
+            whether each request is logged to stderr
+        """
+
+        super().__init__(address, APIHandler)
+
+        self.verbose = verbose
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix="api")
+
+        self.__closed = False
+        self.__idle = {}
+        self.__returned = queue.SimpleQueue()
+        self.__selector = selectors.DefaultSelector()
+        self.__wakeup, self.__waker = socket.socketpair()
+        self.__selector.register(self.__wakeup, selectors.EVENT_READ)
+        self.__watcher = threading.Thread(
+            target=self.__watch__, name="api-idle", daemon=True
+        )
+        self.__watcher.start()
+
+    def process_request(self, request, client_address):
+        """Hands the connection to the worker pool"""
+
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address, handler=None):
+        """
+        Serves the first, else the next, request of a connection
+        within a worker thread, as well as those already arrived,
+        then leaves the connection to be watched while idle
+
+        Parameters
+        ----------
+        request : socket.socket
+            connection to the client
+
+        client_address : tuple[str, int]
+            host and port of the client
+
+        handler : APIHandler | None
+            handler of the connection, None should it be new
+        """
+
+        try:
+            if handler is None:
+                handler = self.RequestHandlerClass(
+                    request, client_address, self
+                )
+            else:
+                handler.resume()
+
+            while not handler.close_connection and handler.is_pending():
+                handler.resume()
+
+            if not handler.close_connection and not self.__closed:
+                self.__returned.put(handler)
+                self.__waker.send(b"\0")
+                return
+        except Exception:
+            self.handle_error(request, client_address)
+
+        self.shutdown_request(request)
+
+    def server_close(self):
+        """
+        Stops listening, closes idle connections and waits for
+        workers to finish
+        """
+
+        super().server_close()
+
+        self.__closed = True
+        self.__waker.send(b"\0")
+        self.__watcher.join()
+
+        self.pool.shutdown(wait=True)
+        idle = list(self.__idle)
+
+        while not self.__returned.empty():
+            idle.append(self.__returned.get())
+
+        for handler in idle:
+            self.__close__(handler)
+
+        self.__selector.close()
+        self.__wakeup.close()
+        self.__waker.close()
+
+    def __close__(self, handler):
+        """Closes an idle connection"""
+
+        handler.close_connection = True
+        handler.finish()
+        self.shutdown_request(handler.request)
+
+    def __watch__(self):
+        """
+        Watches idle connections, handing each to the worker pool
+        as its next request arrives and closing those idle for
+        longer than the handler's timeout, until the server closes
+        """
+
+        while not self.__closed:
+            for key, _ in self.__selector.select(self.POLL):
+                if key.fileobj is self.__wakeup:
+                    self.__wakeup.recv(4096)
+                    self.__watch_returned__()
+                    continue
+
+                handler = key.data
+                self.__selector.unregister(handler.connection)
+                del self.__idle[handler]
+
+                self.pool.submit(
+                    self.process_request_thread,
+                    handler.request,
+                    handler.client_address,
+                    handler,
+                )
+
+            now = monotonic()
+
+            for handler, since in list(self.__idle.items()):
+                if now - since > handler.timeout:
+                    self.__selector.unregister(handler.connection)
+                    del self.__idle[handler]
+                    self.__close__(handler)
+
+    def __watch_returned__(self):
+        """Starts watching the connections left idle by workers"""
+
+        while not self.__returned.empty():
+            handler = self.__returned.get()
+            self.__idle[handler] = monotonic()
+            self.__selector.register(
+                handler.connection, selectors.EVENT_READ, handler
+            )
+
+
+def entity_tag(versions):
+    """
+    Derives a strong entity tag from the keys and `updated_at`
+    of the instances making up a resource
+
+    Parameter
+    ---------
+    versions : list[tuple[str, str]]
+        key and ISO formatted `updated_at` of each instance
+
+    Return
+    ------
+    str
+        quoted entity tag
+    """
+
+    digest = hashlib.blake2b(digest_size=12)
+
+    for key, updated_at in versions:
+        digest.update(f"{key}@{updated_at};".encode("utf-8"))
+
+    return f'"{digest.hexdigest()}"'
+
+
+def http_datetime(updated_at):
+    """
+    Converts an ISO formatted local time into the UTC time, to
+    the second, used by HTTP dates
+
+    Parameter
+    ---------
+    updated_at : str
+        as held by serialised models
+
+    Return
+    ------
+    datetime | None
+        aware UTC time, else None should the time be malformed
+    """
+
+    try:
+        local = datetime.fromisoformat(updated_at)
+    except (TypeError, ValueError):
+        return None
+
+    return local.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def main(argv=None):
+    """Serves the API until interrupted"""
+
+    parser = argparse.ArgumentParser(description="AirBnB JSON API")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    server = APIServer((args.host, args.port), args.workers, args.verbose)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Benchmark: event loop latency while the store is saved, either
+synchronously on the loop or through `storage.asave()`
+
+Usage
+-----
+    python3 benchmarks/async_save.py [<number of models>]
+"""
+from importlib import import_module
+from pathlib import Path
+import tempfile
+import asyncio
+import sys
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+models = import_module("models")
+metrics = import_module("models.engine.metrics")
+
+
+async def measure_lag(stop, histogram, interval=0.001):
+    """Records by how much a periodic tick is late, in microseconds"""
+
+    loop = asyncio.get_running_loop()
+
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        histogram.record((loop.time() - expected) * 1_000_000)
+
+
+async def run(storage, save, rounds=10):
+    """Saves repeatedly while measuring event loop lag"""
+
+    stop = asyncio.Event()
+    histogram = metrics.Histogram()
+    ticker = asyncio.create_task(measure_lag(stop, histogram))
+
+    for _ in range(rounds):
+        await save(storage)
+        await asyncio.sleep(0.005)
+
+    stop.set()
+    await ticker
+
+    return histogram
+
+
+async def save_blocking(storage):
+    """Saves on the event loop itself"""
+
+    storage.save()
+
+
+async def save_async(storage):
+    """Saves through the executor"""
+
+    await storage.asave()
+
+
+def main(count=50_000):
+    """Prints event loop lag percentiles for both ways of saving"""
+
+    with tempfile.TemporaryDirectory() as directory:
+        storage = models.FileStorage(f"{directory}/file.json")
+        objects = storage.all()
+
+        for number in range(count):
+            objects[f"Review.{number:08}"] = {
+                "__class__": "Review",
+                "id": f"{number:08}",
+                "text": "a comfortable stay, would return " * 4,
+            }
+
+        print(f"{count} models, loop lag in microseconds")
+        print(f"{'save':<12}{'p50':>10}{'p99':>10}{'max':>10}")
+
+        for name, save in [("blocking", save_blocking), ("asave", save_async)]:
+            lag = asyncio.run(run(storage, save))
+            print(
+                f"{name:<12}{lag.percentile(50):>10}"
+                f"{lag.percentile(99):>10}{lag.max:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
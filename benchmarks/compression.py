@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""
+Benchmark: size of the store on file against the time taken to
+save and reload it, uncompressed and by each codec and level
+
+Usage
+-----
+    python3 benchmarks/compression.py [<number of places>]
+"""
+from importlib import import_module
+from datetime import datetime
+from time import perf_counter
+from pathlib import Path
+import tempfile
+import random
+import uuid
+import sys
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+models = import_module("models")
+
+
+CASES = [
+    ("", None),
+    (".gz", 1), (".gz", 6), (".gz", 9),
+    (".xz", 0), (".xz", 6),
+    (".zz", 1), (".zz", 6), (".zz", 9),
+]
+
+
+def populate(storage, count):
+    """Adds places of typical attributes"""
+
+    rng = random.Random(0)
+    objects = storage.all()
+    city_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(50)]
+
+    for _ in range(count):
+        instance_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        created_at = datetime(2024, 1, 1, 0, 0, rng.randint(0, 59)).isoformat()
+
+        objects[f"Place.{instance_id}"] = {
+            "__class__": "Place",
+            "amenity_ids": [],
+            "city_id": rng.choice(city_ids),
+            "created_at": created_at,
+            "description": "A bright loft, a short walk from the market",
+            "id": instance_id,
+            "latitude": rng.uniform(-90, 90),
+            "longitude": rng.uniform(-180, 180),
+            "max_guest": rng.randint(1, 8),
+            "name": f"Loft {rng.randint(1, 10_000)}",
+            "number_bathrooms": rng.randint(1, 3),
+            "number_rooms": rng.randint(1, 5),
+            "price_by_night": rng.randint(40, 400),
+            "updated_at": created_at,
+            "user_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        }
+
+
+def timed(function):
+    """Provides the wall time of a call in seconds"""
+
+    start = perf_counter()
+    function()
+
+    return perf_counter() - start
+
+
+def main(count=50_000):
+    """Prints the size, save and reload time of each case"""
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{count} places")
+        print(
+            f"{'store':<14}{'level':>6}{'size KiB':>11}{'ratio':>8}"
+            f"{'save s':>9}{'reload s':>10}"
+        )
+
+        plain = None
+
+        for suffix, level in CASES:
+            file_path = f"{directory}/file{level}.json{suffix}"
+
+            storage = models.FileStorage(file_path, level)
+            populate(storage, count)
+
+            saved = timed(storage.save)
+            size = Path(file_path).stat().st_size
+            plain = plain or size
+
+            other = models.FileStorage(file_path)
+            reloaded = timed(other.reload)
+
+            name = f"file.json{suffix}"
+            shown = "-" if level is None else level
+
+            print(
+                f"{name:<14}{shown:>6}"
+                f"{size / 1024:>11.0f}{plain / size:>7.1f}x"
+                f"{saved:>9.3f}{reloaded:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
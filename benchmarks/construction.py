@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""
+Benchmark: cost of constructing models, fresh and from their
+serialised form as stored, through the constructors generated
+from each class's fields
+
+Usage
+-----
+    python3 benchmarks/construction.py [<number of models>]
+"""
+from importlib import import_module
+from time import perf_counter
+from pathlib import Path
+import tempfile
+import sys
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+models = import_module("models")
+
+
+def main(count=100_000):
+    """Prints microseconds per model constructed, by class"""
+
+    with tempfile.TemporaryDirectory() as directory:
+        models.storage = models.FileStorage(f"{directory}/file.json")
+        models.storage.new = lambda model: None
+
+        print(f"{count} models, us per model")
+        print(f"{'':<10}{'fresh':>10}{'loaded':>10}")
+
+        for name in ["Place", "Review", "User"]:
+            Model = models.ALL_MODELS.get(name)
+            dicts = [dict(Model().to_dict()) for _ in range(count)]
+
+            start = perf_counter()
+
+            for _ in range(count):
+                Model()
+
+            fresh = (perf_counter() - start) / count * 1e6
+            start = perf_counter()
+
+            for dict_ in dicts:
+                Model(**dict_)
+
+            loaded = (perf_counter() - start) / count * 1e6
+
+            print(f"{name:<10}{fresh:>10.2f}{loaded:>10.2f}")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
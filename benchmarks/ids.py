@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Benchmark: throughput of generating ids and of creating models,
+random version four UUIDs against time-ordered version seven,
+and the locality of inserting each into a sorted index of ids
+
+Usage
+-----
+    python3 benchmarks/ids.py [<number of ids>]
+"""
+from importlib import import_module
+from time import perf_counter
+from pathlib import Path
+import tempfile
+import uuid
+import sys
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+models = import_module("models")
+indexes = import_module("models.engine.indexes")
+ids = import_module("models.engine.ids")
+
+
+SCHEMES = {
+    "uuid4": lambda: str(uuid.uuid4()),
+    "uuid7": ids.uuid7,
+}
+
+
+def timed(function, *args):
+    """Provides the result of a call and its wall time in seconds"""
+
+    start = perf_counter()
+    result = function(*args)
+
+    return result, perf_counter() - start
+
+
+def created(scheme, count):
+    """Creates models of the given id scheme"""
+
+    class Booking(models.BaseModel):
+        __ID_SCHEME__ = scheme
+
+    return [Booking() for _ in range(count)]
+
+
+def appended(generated):
+    """Fraction of ids greater than all generated before them"""
+
+    highest, count = "", 0
+
+    for id_ in generated:
+        if id_ > highest:
+            highest, count = id_, count + 1
+
+    return count / len(generated)
+
+
+def inserted(generated):
+    """Inserts ids into a sorted index, one at a time"""
+
+    index = indexes.SortedList()
+
+    for id_ in generated:
+        index.add(id_)
+
+    return index
+
+
+def main(count=200_000):
+    """Prints ids and models per second and index insert locality"""
+
+    with tempfile.TemporaryDirectory() as directory:
+        models.storage = models.FileStorage(f"{directory}/file.json")
+
+        print(f"{count} ids")
+        print(
+            f"{'scheme':<8}{'ids/s':>12}{'models/s':>12}"
+            f"{'appended':>10}{'insert s':>10}"
+        )
+
+        for name, generate in SCHEMES.items():
+            generated, elapsed = timed(
+                lambda: [generate() for _ in range(count)]
+            )
+            _, creating = timed(created, name, count // 10)
+            _, inserting = timed(inserted, generated)
+
+            print(
+                f"{name:<8}{count / elapsed:>12.0f}"
+                f"{count // 10 / creating:>12.0f}"
+                f"{appended(generated):>9.1%}{inserting:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+"""
+Benchmark: memory held by a reloaded store of each model, its
+repeated values read as separate objects against shared ones
+
+Usage
+-----
+    python3 benchmarks/memory.py [<number of models per class>]
+"""
+from importlib import import_module
+from datetime import datetime
+from time import perf_counter
+from pathlib import Path
+import tracemalloc
+import tempfile
+import random
+import uuid
+import json
+import sys
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+interning = import_module("models.engine.interning")
+
+
+AMENITIES = ["wifi", "kitchen", "heating", "parking", "pool", "washer"]
+
+
+def ids(rng, count):
+    """Provides reproducible random ids"""
+
+    return [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(count)]
+
+
+def store(count):
+    """Provides models of each class, keyed by class, as on file"""
+
+    rng = random.Random(0)
+    states, cities, users = ids(rng, 50), ids(rng, 500), ids(rng, 2_000)
+    places = ids(rng, 5_000)
+
+    def dict_(model_name, **attributes):
+        """Serialised model of the class and attributes given"""
+
+        created_at = datetime(2024, 1, 1, 0, 0, rng.randint(0, 59))
+        instance_id = str(uuid.UUID(int=rng.getrandbits(128)))
+
+        return {
+            "__class__": model_name,
+            "created_at": created_at.isoformat(),
+            "id": instance_id,
+            "updated_at": created_at.isoformat(),
+            **attributes,
+        }
+
+    factories = {
+        "Amenity": lambda: dict_("Amenity", name=rng.choice(AMENITIES)),
+        "City": lambda: dict_(
+            "City", name="Cape Town", state_id=rng.choice(states)
+        ),
+        "Place": lambda: dict_(
+            "Place",
+            amenity_ids=rng.sample(AMENITIES, rng.randint(0, 2)),
+            city_id=rng.choice(cities),
+            description="A bright loft, a short walk from the market",
+            max_guest=rng.randint(1, 8),
+            name=f"Loft {rng.randint(1, 10_000)}",
+            user_id=rng.choice(users),
+        ),
+        "Review": lambda: dict_(
+            "Review",
+            place_id=rng.choice(places),
+            text="Lovely stay",
+            user_id=rng.choice(users),
+        ),
+        "User": lambda: dict_(
+            "User",
+            email=f"guest{rng.randint(1, 10_000)}@example.com",
+            first_name="Anna",
+            last_name="Monde",
+        ),
+    }
+
+    return {
+        name: {
+            f"{name}.{index}": factory() for index in range(count)
+        }
+        for name, factory in factories.items()
+    }
+
+
+def loaded(path, object_hook):
+    """
+    Provides the memory held by a store once read, and the time
+    taken to read it
+    """
+
+    tracemalloc.start()
+    start = perf_counter()
+
+    with open(path) as file:
+        objects = json.load(file, object_hook=object_hook)
+
+    elapsed = perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+
+    return held, elapsed
+
+
+def main(count=20_000):
+    """Prints the memory and time to read each class's store"""
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{count} models per class")
+        print(
+            f"{'class':<10}{'plain KiB':>11}{'shared KiB':>12}"
+            f"{'saved':>8}{'plain s':>9}{'shared s':>10}"
+        )
+
+        for name, objects in store(count).items():
+            path = f"{directory}/{name}.json"
+
+            with open(path, "w") as file:
+                json.dump(objects, file)
+
+            plain, plain_s = loaded(path, None)
+            shared, shared_s = loaded(path, interning.Interner())
+
+            print(
+                f"{name:<10}{plain / 1024:>11.0f}{shared / 1024:>12.0f}"
+                f"{1 - shared / plain:>8.0%}"
+                f"{plain_s:>9.3f}{shared_s:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
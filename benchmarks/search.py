@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+Benchmark: latency of ranked full-text search of reviews, once
+the index is built from the store or loaded from beside it
+
+Usage
+-----
+    python3 benchmarks/search.py [<number of reviews>]
+"""
+from importlib import import_module
+from time import perf_counter
+from pathlib import Path
+import tempfile
+import random
+import sys
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+models = import_module("models")
+metrics = import_module("models.engine.metrics")
+
+
+WORDS = (
+    "quiet garden street station lovely noisy clean spacious cosy loft "
+    "view river market host kind bed comfortable breakfast late check "
+    "walk park bus tram museum cafe warm cold small large bright dark"
+).split()
+
+
+VOCABULARY = WORDS + [f"term{number}" for number in range(20_000)]
+WEIGHTS = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+
+def populate(storage, count):
+    """Adds reviews of text drawn from a Zipfian vocabulary"""
+
+    rng = random.Random(0)
+    objects = storage.all()
+
+    for number in range(count):
+        length = rng.randint(5, 40)
+        words = rng.choices(VOCABULARY, WEIGHTS, k=length)
+
+        objects[f"Review.{number:08}"] = {
+            "__class__": "Review",
+            "id": f"{number:08}",
+            "text": " ".join(words),
+        }
+
+
+def timed(function, *args):
+    """Provides the result of a call and its wall time in seconds"""
+
+    start = perf_counter()
+    result = function(*args)
+
+    return result, perf_counter() - start
+
+
+def main(count=200_000, queries=200):
+    """Prints index build and load times and query percentiles"""
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = f"{directory}/file.json"
+        index = models.TextIndex(models.SEARCHABLE)
+
+        storage = models.FileStorage(file_path)
+        storage.add_index("search", index)
+        populate(storage, count)
+
+        _, built = timed(storage.search, "Review", "garden")
+        storage.save()
+
+        other = models.FileStorage(file_path)
+        other.add_index("search", models.TextIndex(models.SEARCHABLE))
+        other.reload()
+
+        _, loaded = timed(other.search, "Review", "garden")
+
+        rng = random.Random(1)
+        latency = metrics.Histogram()
+
+        for _ in range(queries):
+            terms = " ".join(rng.choices(VOCABULARY, WEIGHTS, k=2))
+            _, elapsed = timed(other.search, "Review", terms)
+            latency.record(elapsed * 1_000_000)
+
+        print(f"{count} reviews")
+        print(f"index built in {built:.3f}s, loaded in {loaded:.3f}s")
+        print(f"{'query µs':<12}{'p50':>10}{'p99':>10}{'max':>10}")
+        print(
+            f"{'2 terms':<12}{latency.percentile(50):>10}"
+            f"{latency.percentile(99):>10}{latency.max:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
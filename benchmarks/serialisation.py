@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+"""
+Benchmark: cost of serialising an unchanged model, whereby the
+cached forms are reused, against building them anew
+
+Usage
+-----
+    python3 benchmarks/serialisation.py [<number of calls>]
+"""
+from importlib import import_module
+from pathlib import Path
+import tempfile
+import timeit
+import sys
+
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+models = import_module("models")
+
+
+def place():
+    """Provides a place of typical attributes"""
+
+    model = models.Place()
+    model.name = "Loft by the river"
+    model.description = "A bright loft, a short walk from the market " * 4
+    model.number_rooms = 2
+    model.price_by_night = 120
+    model.amenity_ids = ["wifi", "kitchen", "heating"]
+
+    return model
+
+
+def main(number=100_000):
+    """Prints nanoseconds per call, cached and built anew"""
+
+    with tempfile.TemporaryDirectory() as directory:
+        models.storage = models.FileStorage(f"{directory}/file.json")
+        model = place()
+        storage = models.storage
+
+        cases = [
+            ("to_dict", model.to_dict, model.__serialise__),
+            ("__str__", model.__str__, model.__represent__),
+            (
+                "storage.new",
+                lambda: storage.new(model),
+                lambda: storage.new(model) or model.__setattr__("n", 0),
+            ),
+        ]
+
+        print(f"{number} calls, ns per call")
+        print(f"{'':<14}{'cached':>10}{'built':>10}{'speed-up':>10}")
+
+        for name, cached, built in cases:
+            hit = timeit.timeit(cached, number=number) / number * 1e9
+            miss = timeit.timeit(built, number=number) / number * 1e9
+            print(f"{name:<14}{hit:>10.0f}{miss:>10.0f}{miss / hit:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""
+Benchmark: wall time of starting the console for a command that
+never accesses storage, `help`, against one that does, `count`,
+over stores of increasing size, the store being read lazily
+
+Usage
+-----
+    python3 benchmarks/startup.py [<number of runs>]
+"""
+from time import perf_counter
+from pathlib import Path
+import subprocess
+import tempfile
+import json
+import uuid
+import sys
+
+
+CONSOLE = Path(__file__).resolve().parent.parent / "console.py"
+
+SIZES = (0, 10_000, 100_000)
+
+COMMANDS = {"help": "help quit", "count": "Place.count()"}
+
+
+def populate(path, count):
+    """Writes a store of places"""
+
+    objects = {}
+
+    for _ in range(count):
+        instance_id = str(uuid.uuid4())
+        objects[f"Place.{instance_id}"] = {
+            "__class__": "Place",
+            "amenity_ids": [],
+            "city_id": str(uuid.uuid4()),
+            "created_at": "2024-01-01T00:00:00",
+            "id": instance_id,
+            "name": "Loft by the river",
+            "updated_at": "2024-01-01T00:00:00",
+            "user_id": str(uuid.uuid4()),
+        }
+
+    with open(path, "w") as file:
+        json.dump(objects, file)
+
+
+def started(directory, command, runs):
+    """Provides the fastest of several runs of a command, in ms"""
+
+    fastest = float("inf")
+
+    for _ in range(runs):
+        start = perf_counter()
+        subprocess.run(
+            [sys.executable, str(CONSOLE), "-q", "-c", command],
+            cwd=directory,
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        fastest = min(fastest, perf_counter() - start)
+
+    return fastest * 1000
+
+
+def main(runs=5):
+    """Prints console start latency per store size and command"""
+
+    print(f"fastest of {runs} runs, ms")
+    print(f"{'models':>8}" + "".join(f"{name:>10}" for name in COMMANDS))
+
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            populate(f"{directory}/file.json", size)
+
+            times = [
+                started(directory, command, runs)
+                for command in COMMANDS.values()
+            ]
+
+        print(f"{size:>8}" + "".join(f"{time:>10.0f}" for time in times))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -1,25 +1,323 @@
 #!/usr/bin/python3
 """CLI Backend Console"""
+from models.engine.metrics import Histogram
+from contextlib import redirect_stdout
 from collections import OrderedDict
 from importlib import import_module
+from datetime import datetime
+from time import perf_counter
+from io import StringIO
+import argparse
+import atexit
+import json
 import shlex
+import ast
 import cmd
+import sys
+import re
 
 
 """blanket import allows for Console.default to work"""
 from models import *
 
 
+models = import_module("models")
+
+
+CALL_PATTERN = re.compile(r"^\s*(\w+)\.(\w+)\((.*)\)\s*$")
+
+
+class Renderer:
+    """
+    Buffered writer of command results, whereby results are
+    rendered as text or, for machine consumers, as one JSON
+    object per line (NDJSON) and written in chunks of up to
+    `LIMIT` characters rather than one write per result
+
+    Example
+    -------
+        with Renderer(as_json=True) as render:
+            render.ids(User.all())
+    """
+
+    LIMIT = 1 << 16
+
+    def __init__(self, as_json=False):
+        """
+        Parameter
+        ---------
+        as_json : bool
+            whether results are rendered as NDJSON
+        """
+
+        self.as_json = as_json
+        self.__lines = []
+        self.__size = 0
+
+    def changed(self, model_name, change, count):
+        """
+        Renders the number of instances of a model changed at once,
+        told apart from a count of the instances held
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model
+
+        change : str
+            `updated` or `destroyed`
+
+        count : int
+            number of instances changed
+        """
+
+        if self.as_json:
+            return self.__write__({"__class__": model_name, change: count})
+
+        self.__write__(f"** {count} instances {change} **")
+
+    def count(self, model_name, count):
+        """Renders the number of instances of a model"""
+
+        if self.as_json:
+            return self.__write__({"__class__": model_name, "count": count})
+
+        self.__write__(f"{model_name} count: {count}")
+
+    def flush(self):
+        """Writes buffered results in a single write"""
+
+        if self.__lines:
+            print("\n".join(self.__lines))
+
+        self.__lines = []
+        self.__size = 0
+
+    def ids(self, super_ids):
+        """
+        Renders instances by their super ids, or as their stored
+        representations when rendering NDJSON
+
+        Parameter
+        ---------
+        super_ids : Iterable[str]
+            keys of <model class name>.id
+        """
+
+        for super_id in super_ids:
+            if not self.as_json:
+                self.__write__(super_id)
+                continue
+
+            dict_ = models.storage.get(super_id)
+
+            if dict_ is not None:
+                self.__write__(dict_)
+
+    def model(self, model):
+        """Renders an instance"""
+
+        self.__write__(model.to_dict() if self.as_json else str(model))
+
+    def printed(self, text, created=None):
+        """
+        Renders text printed by a command rather than rendered,
+        which when rendering NDJSON is a record per line: results
+        already rendered are kept, messages of the form `** ... **`
+        are held under `message`, the id of a created instance
+        under `id` and any other text under `text`
+
+        Parameters
+        ----------
+        text : str
+            as printed by the command
+
+        created : str | None
+            name of the model created by the command, if any
+        """
+
+        for line in filter(None, text.splitlines()):
+            if not self.as_json or line.startswith("{"):
+                self.__write__(line)
+            elif line.startswith("** ") and line.endswith(" **"):
+                self.__write__({"message": line[3:-3]})
+            elif created:
+                self.__write__({"__class__": created, "id": line})
+            else:
+                self.__write__({"text": line})
+
+    def scored(self, results):
+        """
+        Renders instances ranked by score, or as their stored
+        representations under `__score__` when rendering NDJSON
+
+        Parameter
+        ---------
+        results : Iterable[tuple[str, float]]
+            keys of <model class name>.id paired with their score
+        """
+
+        for super_id, score in results:
+            if not self.as_json:
+                self.__write__(f"{super_id} {score:.4f}")
+                continue
+
+            dict_ = models.storage.get(super_id)
+
+            if dict_ is not None:
+                self.__write__({**dict_, "__score__": score})
+
+    def __enter__(self):
+        """Renders results until the block exits"""
+
+        return self
+
+    def __exit__(self, *exc_info):
+        """Writes results rendered within the block"""
+
+        self.flush()
+
+    def __write__(self, result):
+        """
+        Buffers a rendered result, writing the buffer should it
+        exceed the limit
+
+        Parameter
+        ---------
+        result : str | dict
+            text, else a record to be serialised as JSON
+        """
+
+        line = result if isinstance(result, str) else json.dumps(result)
+
+        self.__lines.append(line)
+        self.__size += len(line) + 1
+
+        if self.__size >= self.LIMIT:
+            self.flush()
+
+
 class Console(cmd.Cmd):
     """CLI Backend Console"""
 
     prompt = "(anna) "
 
+    __DOT_METHODS__ = (
+        "all", "count", "create", "destroy", "destroy_where", "page",
+        "search", "show", "update", "update_where",
+    )
+    __ID_METHODS__ = ("destroy", "show", "update")
+    __COMPLETIONS__ = 50
+    __commands__ = {}
+
+    def __init__(self, *args, as_json=False, **kwargs):
+        """
+        Prepares the console with timing disabled
+
+        Parameter
+        ---------
+        as_json : bool
+            whether results are rendered as NDJSON
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self.renderer = Renderer(as_json)
+        self.timing = False
+        self.timings = {}
+        self.__started__ = None
+        self.__timing_path__ = None
+
+    def onecmd(self, line):
+        """
+        Executes a command, whereby when rendering NDJSON the text
+        it prints rather than renders, e.g. messages and the ids of
+        created instances, is rendered as records in its stead
+        """
+
+        if not self.renderer.as_json:
+            return super().onecmd(line)
+
+        printed = StringIO()
+
+        with redirect_stdout(printed):
+            stop = super().onecmd(line)
+
+        with self.renderer as render:
+            render.printed(printed.getvalue(), self.__created__(line))
+
+        return stop
+
+    def precmd(self, line):
+        """
+        Marks the start of a command when timing is enabled and
+        brings storage up to date with changes made by other
+        processes, which costs a single `stat` when there are none
+        """
+
+        if self.timing:
+            self.__started__ = perf_counter()
+
+        if line.strip():
+            models.storage.refresh()
+
+        return line
+
+    def postcmd(self, stop, line):
+        """
+        Records the wall time of a command into the histogram of
+        its verb and model when timing is enabled
+        """
+
+        if self.timing and self.__started__ is not None:
+            elapsed = perf_counter() - self.__started__
+            label = self.__label__(line)
+
+            if label and not label.startswith("timing"):
+                histogram = self.timings.setdefault(label, Histogram())
+                histogram.record(elapsed * 1_000_000)
+
+        self.__started__ = None
+        return stop
+
+    def complete_all(self, text, line, begidx, endidx):
+        """Completes the model name"""
+
+        return self.__complete__(text, line, begidx)
+
+    def complete_create(self, text, line, begidx, endidx):
+        """Completes the model name"""
+
+        return self.__complete__(text, line, begidx)
+
+    def complete_destroy(self, text, line, begidx, endidx):
+        """Completes the model name, then the instance id"""
+
+        return self.__complete__(text, line, begidx, with_ids=True)
+
+    def complete_search(self, text, line, begidx, endidx):
+        """Completes the model name"""
+
+        return self.__complete__(text, line, begidx)
+
+    def complete_show(self, text, line, begidx, endidx):
+        """Completes the model name, then the instance id"""
+
+        return self.__complete__(text, line, begidx, with_ids=True)
+
+    def complete_update(self, text, line, begidx, endidx):
+        """Completes the model name, then the instance id"""
+
+        return self.__complete__(text, line, begidx, with_ids=True)
+
     def default(self, line):
         """
         Attempt at executing cli input when provided command
-        does not match the provided definitions, where code
-        is executed as though it is Python code
+        does not match the provided definitions, where input of
+        the form `<model>.<method>(<args>)` is parsed and
+        dispatched to the model. Arguments are restricted to
+        literals (bare names being read as strings), such that
+        no code is ever executed on behalf of the user
 
         Parameter
         ---------
@@ -30,27 +328,49 @@ class Console(cmd.Cmd):
         -------
             (anna) User.all()
             User.0aff3461-4768-4d00-9a2e-0d58ce3e4a58
+            (anna) User.update("0aff3461", {"first_name": "Anna"})
         """
 
-        if "basemodel" in line.lower():
+        parsed = self.__parse_call__(line)
+
+        if not parsed:
+            return print(f"** unknown syntax: {line} **")
+
+        model_name, method_name, args, kwargs = parsed
+        method = self.__command__(model_name, method_name)
+
+        if not method:
             return print(f"** unknown syntax: {line} **")
 
+        if method_name in self.__ID_METHODS__ and args:
+            resolved = {"model_name": model_name, "instance_id": args[0]}
+
+            if not self.__resolve__(resolved):
+                return
+
+            args = (resolved.get("instance_id"), *args[1:])
+
         try:
-            exec(line)
+            self.__render__(model_name, method_name, method(*args, **kwargs))
         except Exception:
             print(f"** unknown syntax: {line} **")
 
-    def do_all(self, model_name):
+    def do_all(self, line):
         """
         Prints a list of string representations of all model
         instances. Where model name is provided, models are
         scoped to said model. Where no model name is provided,
         all instance representations are printed.
 
+        Models of a class can be paged through in ascending order
+        of id, whereby each page starts after the last id of the
+        page before it
+
         Parameter
         ---------
-        model_name : str
-            name of model to be represented
+        line : str
+            name of model to be represented, optionally followed
+            by `--limit <count>` and `--after <id>`
 
         Expected
         --------
@@ -58,24 +378,131 @@ class Console(cmd.Cmd):
             (anna) all <model>
             <model>.<id>
 
+        Paged
+        -----
+            (anna) all <model> --limit 2
+            <model>.<id 1>
+            <model>.<id 2>
+            (anna) all <model> --limit 2 --after <id 2>
+            <model>.<id 3>
+
         Non-Existant Model
         ------------------
             (anna) all DoesNotExist
             ** model doesn't exist **
+
+        Invalid Paging
+        --------------
+            (anna) all <model> --limit many
+            ** usage: all <model> [--limit <count>] [--after <id>] **
         """
 
+        model_name, *options = line.split() if line else [line]
+
         is_not_model = model_name and model_name not in ALL_MODELS
         is_base_model = BaseModel.is_base_model(model_name)
 
         if is_base_model or is_not_model:
             return print("** model doesn't exist **")
 
-        if not model_name:
-            for Model in ALL_MODELS.values():
-                Model.all()
-        else:
-            Model = ALL_MODELS.get(model_name)
-            Model.all()
+        if options:
+            return self.__page__(model_name, options)
+
+        Models = ALL_MODELS.values()
+
+        if model_name:
+            Models = [ALL_MODELS.get(model_name)]
+
+        with self.renderer as render:
+            for Model in Models:
+                render.ids(Model.all())
+
+    def do_backup(self, line):
+        """
+        Writes to file the instances created or updated after a
+        point in time, together with the ids of those deleted
+        after it, else all instances where no time is given. The
+        number of instances and deletions backed up is printed
+
+        Usage
+        -----
+            backup [--since <iso timestamp>] <path>
+
+        Expected
+        --------
+            (anna) backup base.json.gz
+            ** 120 objects, 0 deletions backed up **
+            (anna) backup --since 2024-05-27T03:39:12 monday.json.gz
+            ** 4 objects, 1 deletions backed up **
+
+        Invalid Timestamp
+        -----------------
+            (anna) backup --since yesterday monday.json.gz
+            ** usage: backup [--since <iso timestamp>] <path> **
+        """
+
+        usage = "** usage: backup [--since <iso timestamp>] <path> **"
+
+        try:
+            words = shlex.split(line)
+        except ValueError:
+            return print(usage)
+
+        since = None
+
+        if words[:1] == ["--since"] and len(words) == 3:
+            _, since, *words = words
+
+            try:
+                since = datetime.fromisoformat(since).isoformat()
+            except ValueError:
+                return print(usage)
+
+        if len(words) != 1:
+            return print(usage)
+
+        try:
+            objects, deleted = models.storage.backup(words[0], since)
+        except OSError as error:
+            return print(f"** backup failed: {error.strerror} **")
+
+        print(f"** {objects} objects, {deleted} deletions backed up **")
+
+    def do_compact(self, line):
+        """
+        Drops the records of deletions made at or before a point
+        in time, e.g. that of the latest full backup, such that
+        they are no longer kept beside the store. The number of
+        records dropped is printed
+
+        Usage
+        -----
+            compact <iso timestamp>
+
+        Expected
+        --------
+            (anna) compact 2024-05-27T03:39:12
+            ** 12 deletions dropped **
+
+        Invalid Timestamp
+        -----------------
+            (anna) compact yesterday
+            ** usage: compact <iso timestamp> **
+        """
+
+        usage = "** usage: compact <iso timestamp> **"
+
+        try:
+            before = datetime.fromisoformat(line.strip()).isoformat()
+        except ValueError:
+            return print(usage)
+
+        try:
+            dropped = models.storage.compact(before)
+        except OSError as error:
+            return print(f"** compact failed: {error.strerror} **")
+
+        print(f"** {dropped} deletions dropped **")
 
     def do_create(self, model_name):
         """
@@ -141,11 +568,30 @@ class Console(cmd.Cmd):
         ------------------------
             (anna) destroy <model> <id>
             ** no instance found **
+
+        All instances whose attributes equal the given values can
+        be deleted at once, with a single write to storage, the
+        number of instances deleted being printed
+
+        Usage
+        -----
+            destroy <model> where <attribute>=<value> ...
+
+        Expected
+        --------
+            (anna) destroy Review where user_id=<id>
+            ** 12 instances destroyed **
         """
 
+        if self.__is_where__(line):
+            return self.__where__("destroy_where", line)
+
         parsed = self.__parse_line__(line)
 
-        if BaseModel.is_valid_model(parsed.get("model_name")):
+        if not BaseModel.is_valid_model(parsed.get("model_name")):
+            return
+
+        if self.__resolve__(parsed):
             Model = ALL_MODELS.get(parsed.get("model_name"))
             Model.destroy(parsed.get("instance_id"))
 
@@ -155,11 +601,173 @@ class Console(cmd.Cmd):
         print()
         return True
 
+    def do_profile(self, line):
+        """
+        Executes a command under cProfile, printing the functions
+        with the greatest cumulative time. The statistics can be
+        written to a `.pstats` file for later analysis, e.g. by
+        `python3 -m pstats <path>` or snakeviz.
+
+        Usage
+        -----
+            profile [-n <limit>] [-o <path>] <command>
+
+        Expected
+        --------
+            (anna) profile -n 5 show User 1234-1234-1234
+            <command output>
+                     1002 function calls in 0.002 seconds
+               Ordered by: cumulative time
+               List reduced from 40 to 5 due to restriction <5>
+               ...
+
+        Missing Command
+        ---------------
+            (anna) profile
+            ** usage: profile [-n <limit>] [-o <path>] <command> **
+
+        Unwritable Path
+        ---------------
+            (anna) profile -o /nonexistent/all.pstats all
+            ** profile failed: No such file or directory **
+            <statistics>
+        """
+
+        limit, path, command = 20, None, line.strip()
+
+        try:
+            while command.startswith(("-n ", "-o ")):
+                option, value, command = (command.split(None, 2) + [""])[:3]
+
+                if option == "-n":
+                    limit = int(value)
+                else:
+                    path = value
+        except ValueError:
+            command = None
+
+        if not command:
+            return print(
+                "** usage: profile [-n <limit>] [-o <path>] <command> **"
+            )
+
+        """profiling modules are imported on use, sparing startup"""
+        cProfile = import_module("cProfile")
+        pstats = import_module("pstats")
+
+        profiler = cProfile.Profile()
+        stop = profiler.runcall(self.onecmd, command)
+
+        if path:
+            try:
+                profiler.dump_stats(path)
+            except OSError as error:
+                print(f"** profile failed: {error.strerror} **")
+
+        stream = StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(limit)
+        print(stream.getvalue().rstrip())
+
+        return stop
+
     def do_quit(self, line):
         """Quit command to exit the program"""
 
         return True
 
+    def do_restore(self, line):
+        """
+        Replaces all instances by those of a full backup, onto
+        which incremental backups are merged oldest first, the
+        result being saved to storage
+
+        Usage
+        -----
+            restore <full backup> [<incremental backup> ...]
+
+        Expected
+        --------
+            (anna) restore base.json.gz monday.json.gz tuesday.json.gz
+            ** 123 objects restored **
+
+        Missing Backup
+        --------------
+            (anna) restore
+            ** usage: restore <full backup> [<incremental backup> ...] **
+        """
+
+        usage = "** usage: restore <full backup> [<incremental backup> ...] **"
+
+        try:
+            paths = shlex.split(line)
+        except ValueError:
+            return print(usage)
+
+        if not paths:
+            return print(usage)
+
+        try:
+            count = models.storage.restore(*paths)
+        except OSError as error:
+            return print(f"** restore failed: {error.strerror} **")
+        except ValueError:
+            return print("** restore failed: backup unreadable **")
+
+        print(f"** {count} objects restored **")
+
+    def do_search(self, line):
+        """
+        Prints the instances of a model whose searchable text
+        best matches the terms, most relevant first, alongside
+        their score. The user is informed should:
+            - The model's name be missing or invalid
+            - The model not exist or not be searchable
+            - The terms be missing
+
+        Expected
+        --------
+            (anna) search Review "quiet garden"
+            Review.<id> 2.7310
+            Review.<id> 0.9125
+            (anna) search Place loft --limit 1
+            Place.<id> 1.3862
+
+        Missing Terms
+        -------------
+            (anna) search Review
+            ** search terms missing **
+
+        Unsearchable Model
+        ------------------
+            (anna) search User anna
+            ** model not searchable **
+        """
+
+        try:
+            model_name, *terms = shlex.split(line)
+        except ValueError:
+            model_name, terms = None, []
+
+        if not BaseModel.is_valid_model(model_name):
+            return
+
+        usage = "** usage: search <model> <terms> [--limit <count>] **"
+        limit = 10
+
+        if terms[-2:-1] == ["--limit"]:
+            terms, limit = terms[:-2], terms[-1]
+
+            if not limit.isdigit() or not int(limit):
+                return print(usage)
+
+            limit = int(limit)
+
+        Model = ALL_MODELS.get(model_name)
+        results = Model.search(" ".join(terms), limit)
+
+        self.__render__(model_name, "search", results)
+
     def do_show(self, line):
         """
         Prints the string representation of an instance
@@ -213,49 +821,149 @@ class Console(cmd.Cmd):
         if not BaseModel.is_valid_model(parsed.get("model_name")):
             return
 
-        Model = ALL_MODELS.get(parsed.get("model_name"))
-        Model.show(parsed.get("instance_id"))
+        if not self.__resolve__(parsed):
+            return
 
-    def do_update(self, line):
-        """
-        Updates an instance based on the model name and id
-        by adding or updating attribute, which is then sent
-        to storage. One attribute can be updated at a time,
-        whereby the attribute value is cast into one of
-        three type, float, int or str.
+        Model = ALL_MODELS.get(parsed.get("model_name"))
+        model = Model.show(parsed.get("instance_id"))
 
-        N.B.: It is advise to input the attribute value within
-        quotations
+        self.__render__(Model.__name__, "show", model)
 
-        Of note is that `id`, `created_at` and `updated_at`
-        cannot be updated.
+    def do_stats(self, line):
+        """
+        Prints the counters and timers of storage operations.
+        Where a path is given, the metrics are instead written to
+        it in the Prometheus text format, once or, where an
+        interval in seconds is also given, periodically.
 
         Usage
         -----
-            update <model name> <id> <attribute name> "<attribute value>"
+            stats [<path> [<interval>]]
 
         Expected
         --------
-            (anna) update User 1234-1234-1234 email "aibnb@mail.com"
+            (anna) stats
+            bytes_read_total: 2048
+            bytes_written_total: 4096
+            ...
+            write_amplification: 2048.0
+
+            (anna) stats /var/lib/node_exporter/airbnb.prom 15
+
+        Invalid Interval
+        ----------------
+            (anna) stats metrics.prom often
+            ** usage: stats [<path> [<interval>]] **
+
+        Unwritable Path
+        ---------------
+            (anna) stats /nonexistent/metrics.prom
+            ** stats failed: No such file or directory **
+        """
 
-        Missing Model Name
-        ------------------
-            (anna) update
-            ** model name missing **
+        path, _, interval = line.strip().partition(" ")
 
-        Non-Existant Model
-        ------------------
-            (anna) update DoesNotExist
-            ** model doesn't exist **
+        if not path:
+            for name, value in sorted(models.storage.metrics().items()):
+                print(f"{name}: {value}")
+            return
 
-        Missing Instance ID
-        -------------------
-            (anna) update Amenity
-            ** instance id missing **
+        try:
+            interval = float(interval) if interval.strip() else None
+        except ValueError:
+            return print("** usage: stats [<path> [<interval>]] **")
 
-        Non-Existant Instance ID
-        ------------------------
-            (anna) update Place 123-456-789
+        try:
+            models.storage.export_metrics(path, interval)
+        except OSError as error:
+            print(f"** stats failed: {error.strerror} **")
+
+    def do_timing(self, line):
+        """
+        Records the wall time of each command, per command verb
+        and model, into latency histograms. Where a path is given
+        when enabling, the histograms are dumped to it as JSON on
+        exit, allowing for comparison across releases.
+
+        Usage
+        -----
+            timing on [<path>]
+            timing off
+            timing report
+
+        Expected
+        --------
+            (anna) timing on
+            (anna) show User 1234-1234-1234
+            (anna) timing report
+            command         count  p50(us)  p95(us)  p99(us)  max(us)
+            show User           1      112      112      112      112
+
+        Unknown Option
+        --------------
+            (anna) timing sideways
+            ** usage: timing on [<path>] | off | report **
+        """
+
+        option, _, path = line.strip().partition(" ")
+
+        if option == "on":
+            self.timing = True
+            return self.__dump_timings_at_exit__(path.strip())
+
+        if option == "off":
+            self.timing = False
+            return
+
+        if option == "report":
+            return print(self.__timings_report__())
+
+        print("** usage: timing on [<path>] | off | report **")
+
+    def do_update(self, line):
+        """
+        Updates an instance based on the model name and id
+        by adding or updating attribute, which is then sent
+        to storage. Either one attribute or a dictionary of
+        attributes is given, the latter being applied to the
+        instance at once and sent to storage in a single write.
+        Values are cast into the type of the field updated,
+        else into one of three types, float, int or str.
+
+        N.B.: It is advise to input the attribute value within
+        quotations
+
+        Of note is that `id`, `created_at` and `updated_at`
+        cannot be updated.
+
+        Usage
+        -----
+            update <model name> <id> <attribute name> "<attribute value>"
+            update <model name> <id> <dictionary>
+
+        Expected
+        --------
+            (anna) update User 1234-1234-1234 email "aibnb@mail.com"
+            (anna) update Place 1234-1234-1234 {"name": "Loft", "max_guest": 2}
+
+        Missing Model Name
+        ------------------
+            (anna) update
+            ** model name missing **
+
+        Non-Existant Model
+        ------------------
+            (anna) update DoesNotExist
+            ** model doesn't exist **
+
+        Missing Instance ID
+        -------------------
+            (anna) update Amenity
+            ** instance id missing **
+
+        Non-Existant Instance ID
+        ------------------------
+            (anna) update Place 123-456-789
             ** no instance found **
 
         Missing Attribute Name
@@ -272,11 +980,39 @@ class Console(cmd.Cmd):
         ----------------------------
             (anna) update User 123-456-789 first_name
             ** value missing **
+
+        Invalid Dictionary
+        ------------------
+            (anna) update User 123-456-789 {"first_name":
+            ** dictionary invalid **
+
+        All instances whose attributes equal the given values can
+        be updated at once, with a single write to storage, the
+        number of instances updated being printed
+
+        Usage
+        -----
+            update <model> where <attribute>=<value> ...
+                set <attribute>=<value> ...
+
+        Expected
+        --------
+            (anna) update Place where city_id=<id> set price_by_night=120
+            ** 3 instances updated **
         """
 
-        parsed = self.__parse_line__(line)
+        if self.__is_where__(line):
+            return self.__where__("update_where", line)
 
-        if BaseModel.is_valid_model(parsed.get("model_name")):
+        parsed = self.__parse_update__(line)
+
+        if parsed is None:
+            return print("** dictionary invalid **")
+
+        if not BaseModel.is_valid_model(parsed.get("model_name")):
+            return
+
+        if self.__resolve__(parsed):
             ALL_MODELS.get(parsed.get("model_name")).update(
                 instance_id=parsed.get("instance_id"),
                 attribute=parsed.get("attribute"),
@@ -288,6 +1024,284 @@ class Console(cmd.Cmd):
 
         pass
 
+    @classmethod
+    def __command__(cls, model_name, method_name):
+        """
+        Resolves the model method callable via dot notation,
+        caching the resolution per model and method such that
+        repeated calls are a single dictionary lookup
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model, BaseModel being inaccessible
+
+        method_name : str
+            name of the model method
+
+        Return
+        ------
+        Callable | None
+            bound class method, else None if not callable
+            via dot notation
+        """
+
+        key = (model_name, method_name)
+
+        if key in cls.__commands__:
+            return cls.__commands__[key]
+
+        Model = models.ALL_MODELS.get(model_name)
+        is_callable = method_name in cls.__DOT_METHODS__
+
+        if not Model or BaseModel.is_base_model(model_name) or not is_callable:
+            return None
+
+        cls.__commands__[key] = getattr(Model, method_name)
+        return cls.__commands__[key]
+
+    def __complete__(self, text, line, begidx, with_ids=False):
+        """
+        Provides the completions of the word being typed, being
+        model names for the first argument and, where the command
+        takes one, ids of the model for the second. Ids are read
+        from the sorted id index, such that completing costs
+        O(log N + k) however large the store
+
+        Parameters
+        ----------
+        text : str
+            word being completed
+
+        line : str
+            line typed so far
+
+        begidx : int
+            index within the line at which the word starts
+
+        with_ids : bool
+            whether the command takes an instance id
+
+        Return
+        ------
+        list[str]
+            at most `__COMPLETIONS__` completions
+        """
+
+        words = line[:begidx].split()
+
+        if len(words) == 1:
+            return [
+                name for name in ALL_MODELS
+                if name.startswith(text) and not BaseModel.is_base_model(name)
+            ]
+
+        if len(words) == 2 and with_ids and words[1] in ALL_MODELS:
+            return models.storage.complete(
+                words[1], text, self.__COMPLETIONS__
+            )
+
+        return []
+
+    def __created__(self, line):
+        """
+        Provides the name of the model a command creates, be it of
+        the form `create <model>` or `<model>.create()`
+
+        Return
+        ------
+        str | None
+            name of the model, else None should none be created
+        """
+
+        command, arg, _ = self.parseline(line)
+
+        if command == "create" and arg:
+            return arg.split()[0]
+
+        match = CALL_PATTERN.match(line)
+
+        if match and match.group(2) == "create":
+            return match.group(1)
+
+        return None
+
+    def __dump_timings__(self):
+        """Writes the recorded histograms to the timing path as JSON"""
+
+        timings = {
+            label: histogram.to_dict()
+            for label, histogram in sorted(self.timings.items())
+        }
+
+        with open(self.__timing_path__, "w") as file:
+            json.dump(timings, file, indent=2)
+
+    def __dump_timings_at_exit__(self, path):
+        """
+        Registers the dumping of histograms on exit, once per
+        console regardless of how often the path is changed
+
+        Parameter
+        ---------
+        path : str
+            file to which histograms are written, ignored if empty
+        """
+
+        if not path:
+            return
+
+        if not self.__timing_path__:
+            atexit.register(self.__dump_timings__)
+
+        self.__timing_path__ = path
+
+    @staticmethod
+    def __is_where__(line):
+        """Determines if a line selects instances by their attributes"""
+
+        words = line.split(maxsplit=2)
+        return len(words) > 1 and words[1] == "where"
+
+    @staticmethod
+    def __label__(line):
+        """
+        Names a command by its verb and model, irrespective of
+        whether dot notation was used
+
+        Parameter
+        ---------
+        line : str
+            user provided input
+
+        Return
+        ------
+        str
+            e.g. `show User`, or `all` should no model be given
+        """
+
+        match = CALL_PATTERN.match(line)
+
+        if match:
+            model_name, method_name, _ = match.groups()
+            return f"{method_name} {model_name}"
+
+        return " ".join(line.split()[:2])
+
+    @staticmethod
+    def __literal__(node):
+        """
+        Evaluates a parsed argument, where bare names are read
+        as strings and all else must be a Python literal
+
+        Parameter
+        ---------
+        node : ast.expr
+            parsed argument
+
+        Return
+        ------
+        Any
+            value of the literal
+
+        Raises
+        ------
+        ValueError
+            should the argument not be a literal
+        """
+
+        if isinstance(node, ast.Name):
+            return node.id
+
+        return ast.literal_eval(node)
+
+    def __page__(self, model_name, options):
+        """
+        Prints a page of models of a class
+
+        Parameters
+        ----------
+        model_name : str
+            name of model to be represented
+
+        options : list[str]
+            pairs of `--limit <count>` and `--after <id>`
+        """
+
+        usage = "** usage: all <model> [--limit <count>] [--after <id>] **"
+        paging = {"--limit": 100, "--after": None}
+
+        if not model_name or len(options) % 2:
+            return print(usage)
+
+        for option, value in zip(options[::2], options[1::2]):
+            if option not in paging:
+                return print(usage)
+
+            paging[option] = value
+
+        try:
+            limit = int(paging["--limit"])
+        except ValueError:
+            return print(usage)
+
+        if limit < 1:
+            return print(usage)
+
+        Model = ALL_MODELS.get(model_name)
+
+        with self.renderer as render:
+            render.ids(Model.page(paging["--after"], limit))
+
+    def __parse_call__(self, line):
+        """
+        Separate `<model>.<method>(<args>)` into its parts
+
+        Parameter
+        ---------
+        line : str
+            user provided input
+
+        Return
+        ------
+        tuple | None
+            model name, method name, positional and keyword
+            arguments, else None should the line not be a
+            call of literal arguments
+        """
+
+        match = CALL_PATTERN.match(line)
+
+        if not match:
+            return None
+
+        model_name, method_name, arguments = match.groups()
+
+        try:
+            call = ast.parse(f"_({arguments})", mode="eval").body
+        except SyntaxError:
+            return None
+
+        is_call = isinstance(call, ast.Call)
+
+        if not is_call or not isinstance(call.func, ast.Name):
+            return None
+
+        try:
+            args = [self.__literal__(arg) for arg in call.args]
+            kwargs = {
+                keyword.arg: self.__literal__(keyword.value)
+                for keyword in call.keywords
+                if keyword.arg
+            }
+        except (TypeError, ValueError, RecursionError):
+            return None
+
+        if len(kwargs) != len(call.keywords):
+            return None
+
+        return model_name, method_name, args, kwargs
+
     def __parse_line__(self, line):
         """
         Separate line into model name and instance id
@@ -319,15 +1333,208 @@ class Console(cmd.Cmd):
         for key, value in zip(parsed, split):
             parsed[key] = value
 
-        parsed["value"] = self.__type_value__(parsed.get("value"))
+        parsed["value"] = self.__typed__(
+            parsed.get("model_name"),
+            parsed.get("attribute"),
+            parsed.get("value"),
+        )
+
+        return parsed
+
+    def __parse_update__(self, line):
+        """
+        Parses the line of an update, as does `__parse_line__`,
+        save that a dictionary following the id is read whole as
+        the attribute, its values keeping their literal types
+
+        Parameter
+        ---------
+        line : str
+            user input after the `update` command
+
+        Return
+        ------
+        OrderedDict | None
+            the model name, instance id, attribute and value, else
+            None should the dictionary not be a literal dictionary
+        """
+
+        words = line.split(maxsplit=2)
+
+        if len(words) < 3 or not words[2].startswith("{"):
+            return self.__parse_line__(line)
+
+        parsed = self.__parse_line__(" ".join(words[:2]))
+
+        try:
+            attributes = ast.literal_eval(words[2])
+        except (ValueError, SyntaxError, TypeError, RecursionError):
+            return None
+
+        if not isinstance(attributes, dict):
+            return None
 
+        parsed["attribute"] = attributes
         return parsed
 
+    def __parse_where__(self, line):
+        """
+        Parses the line of a bulk update or deletion, being the
+        model name followed by `where` and the conditions, and for
+        an update `set` and the attributes, each of the form
+        <attribute>=<value>. Values are typed as by `__typed__`
+
+        Parameter
+        ---------
+        line : str
+            user input after the command
+
+        Return
+        ------
+        tuple[str, dict, dict]
+            the model name, conditions and attributes
+
+        Raises
+        ------
+        ValueError
+            should a pairing not be of the form <attribute>=<value>
+
+        Example
+        -------
+            self.__parse_where__("Place where city_id=7 set rating=4")
+            ('Place', {'city_id': '7'}, {'rating': 4})
+        """
+
+        model_name, _, *words = shlex.split(line)
+        conditions, attributes = {}, {}
+        pairings = conditions
+
+        for word in words:
+            if word == "set" and pairings is conditions:
+                pairings = attributes
+                continue
+
+            name, equals, value = word.partition("=")
+
+            if not name or not equals:
+                raise ValueError(f"{word} is not of the form name=value")
+
+            pairings[name] = self.__typed__(model_name, name, value)
+
+        return model_name, conditions, attributes
+
+    def __render__(self, model_name, method_name, result):
+        """
+        Renders the result of a model method, methods which
+        inform the user themselves rendering nothing
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model
+
+        method_name : str
+            name of the model method
+
+        result : Any
+            as returned by the model method
+        """
+
+        if result is None:
+            return
+
+        with self.renderer as render:
+            if method_name in ("all", "page"):
+                render.ids(result)
+            elif method_name == "count":
+                render.count(model_name, result)
+            elif method_name == "destroy_where":
+                render.changed(model_name, "destroyed", result)
+            elif method_name == "update_where":
+                render.changed(model_name, "updated", result)
+            elif method_name == "search":
+                render.scored(result)
+            elif method_name == "show":
+                render.model(result)
+
+    def __resolve__(self, parsed):
+        """
+        Replaces a unique prefix of an instance id with the id
+        itself, whereby an id matching exactly is kept as given.
+        The user is informed should the prefix be ambiguous
+
+        Parameter
+        ---------
+        parsed : dict
+            model name and instance id, as parsed from input
+
+        Return
+        ------
+        bool
+            False if the prefix is ambiguous, else True
+
+        Expected
+        --------
+            (anna) show Place 3f2a
+            [Place] (3f2a9c1e-5b0d-4e43-9f5e-0c7d2b8a6e14) {...}
+
+        Ambiguous Instance ID
+        ---------------------
+            (anna) show Place 3
+            ** instance id ambiguous **
+        """
+
+        model_name = parsed.get("model_name")
+        instance_id = parsed.get("instance_id")
+
+        if not isinstance(instance_id, str) or not instance_id:
+            return True
+
+        if model_name not in ALL_MODELS:
+            return True
+
+        matches = models.storage.complete(model_name, instance_id, 2)
+
+        if len(matches) == 1:
+            parsed["instance_id"] = matches[0]
+        elif len(matches) > 1 and instance_id not in matches:
+            print("** instance id ambiguous **")
+            return False
+
+        return True
+
+    def __timings_report__(self):
+        """
+        Tabulates count, p50, p95, p99 and max latency in
+        microseconds of each recorded command
+
+        Return
+        ------
+        str
+            report of recorded commands, ordered by label
+        """
+
+        columns = ["count", "p50(us)", "p95(us)", "p99(us)", "max(us)"]
+        rows = [f"{'command':<16}" + "".join(f"{c:>11}" for c in columns)]
+
+        for label, histogram in sorted(self.timings.items()):
+            values = [
+                histogram.count,
+                histogram.percentile(50),
+                histogram.percentile(95),
+                histogram.percentile(99),
+                histogram.max,
+            ]
+            rows.append(f"{label:<16}" + "".join(f"{v:>11}" for v in values))
+
+        return "\n".join(rows)
+
     @staticmethod
     def __type_value__(value):
         """
         Set the type of the value, at present limited to
-        `float`, `int` and `str`
+        `float`, `int` and `str`, values that are not numbers,
+        e.g. "Mr. Smith", being kept as strings
 
         Parameter
         ---------
@@ -346,11 +1553,213 @@ class Console(cmd.Cmd):
         if value.isdigit():
             return int(value)
 
-        if value.count(".") and not value.replace(".", "").count("@"):
+        if "." not in value:
+            return value
+
+        try:
             return float(value)
+        except ValueError:
+            return value
+
+    @classmethod
+    def __typed__(cls, model_name, attribute, value):
+        """
+        Types the value of an attribute, values of fields declared
+        by the model being kept as typed, e.g. "007", such that
+        they are cast into the type of the field alone, else as
+        by `__type_value__`
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model
+
+        attribute : str
+            name of the attribute
+
+        value : str
+            user provided input
+
+        Return
+        ------
+        float | int | str
+            typed input from user
+        """
+
+        Model = models.ALL_MODELS.get(model_name)
+
+        if Model and attribute in Model.__types__:
+            return value
+
+        return cls.__type_value__(value)
+
+    def __where__(self, method_name, line):
+        """
+        Updates or deletes all instances of a model matching the
+        conditions of a line, printing the number of instances
+        updated or deleted
+
+        Parameters
+        ----------
+        method_name : str
+            `update_where` or `destroy_where`
+
+        line : str
+            user input after the command
+        """
+
+        usage = {
+            "destroy_where": "destroy <model> where <attribute>=<value> ...",
+            "update_where": (
+                "update <model> where <attribute>=<value> ... "
+                "set <attribute>=<value> ..."
+            ),
+        }
+
+        try:
+            model_name, conditions, attributes = self.__parse_where__(line)
+        except ValueError:
+            return print(f"** usage: {usage.get(method_name)} **")
+
+        if method_name == "destroy_where" and attributes:
+            return print(f"** usage: {usage.get(method_name)} **")
+
+        if not BaseModel.is_valid_model(model_name):
+            return
+
+        Model = ALL_MODELS.get(model_name)
+
+        if method_name == "update_where":
+            result = Model.update_where(conditions, attributes)
+        else:
+            result = Model.destroy_where(conditions)
+
+        self.__render__(model_name, method_name, result)
+
+
+def run_script(lines, quiet=False, as_json=False):
+    """
+    Executes commands non-interactively within a single storage
+    batch, such that however many commands mutate storage only
+    one write is made to file. Blank lines and lines starting
+    with `#` are skipped, and execution halts on `quit`/`EOF`.
+    A command which fails is reported as unknown syntax, the
+    commands following it being executed nonetheless
+
+    Parameter
+    ---------
+    lines : Iterable[str]
+        commands to be executed, one per item
+
+    quiet : bool
+        suppresses the throughput report, which is otherwise
+        written to stderr so as not to mix with command output
+
+    as_json : bool
+        whether results are rendered as NDJSON
+
+    Return
+    ------
+    int
+        number of commands executed
+    """
+
+    console = Console(as_json=as_json)
+    console.prompt = ""
+    executed = 0
+
+    start = perf_counter()
+
+    with models.storage.batch():
+        for line in lines:
+            line = line.strip()
+
+            if not line or line.startswith("#"):
+                continue
+
+            try:
+                line = console.precmd(line)
+                stop = console.postcmd(console.onecmd(line), line)
+            except Exception:
+                stop = False
+
+                with console.renderer as render:
+                    render.printed(f"** unknown syntax: {line} **")
+
+            executed += 1
+
+            if stop:
+                break
+
+    elapsed = perf_counter() - start
+
+    if not quiet:
+        rate = executed / elapsed if elapsed else 0
+        print(
+            f"** {executed} commands in {elapsed:.3f}s ({rate:.0f}/s) **",
+            file=sys.stderr,
+        )
+
+    return executed
+
+
+def main(argv=None):
+    """
+    Entry point of the console, running interactively unless
+    commands are provided by `-c` or a script by `-f`
+
+    Usage
+    -----
+        ./console.py
+        ./console.py -c "show User <id>" -c "User.count()"
+        ./console.py -f commands.txt
+        cat commands.txt | ./console.py -f -
+        ./console.py --json -c "all User"
+    """
+
+    parser = argparse.ArgumentParser(description="CLI Backend Console")
+    source = parser.add_mutually_exclusive_group()
+
+    source.add_argument(
+        "-c",
+        "--command",
+        action="append",
+        help="command to execute, may be repeated",
+    )
+
+    source.add_argument(
+        "-f",
+        "--file",
+        help="file of commands to execute, '-' for stdin",
+    )
+
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="do not report throughput of executed commands",
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="render results as newline-delimited JSON",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.command:
+        return run_script(args.command, args.quiet, args.json)
+
+    if args.file == "-":
+        return run_script(sys.stdin, args.quiet, args.json)
+
+    if args.file:
+        with open(args.file, "r") as file:
+            return run_script(file, args.quiet, args.json)
 
-        return value
+    Console(as_json=args.json).cmdloop()
 
 
 if __name__ == "__main__":
-    Console().cmdloop()
+    main()
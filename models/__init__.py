@@ -1,7 +1,8 @@
 #!/usr/bin/python3
 """Pre-Initial vital system components, ordered for dynamic imports"""
+from models.engine.indexes import TextIndex, ValueIndex
 from models.engine.file_storage import FileStorage
-from models.base_model import BaseModel
+from models.base_model import BaseModel, Field
 from models.amenity import Amenity
 from models.city import City
 from models.place import Place
@@ -21,5 +22,21 @@ ALL_MODELS = {
 }
 
 
+SEARCHABLE = {
+    name: Model.__SEARCHABLE__
+    for name, Model in ALL_MODELS.items()
+    if Model.__SEARCHABLE__
+}
+
+
+INDEXED = {
+    name: Model.__INDEXED__
+    for name, Model in ALL_MODELS.items()
+    if Model.__INDEXED__
+}
+
+
 storage = FileStorage()
-storage.reload()
+storage.add_index("search", TextIndex(SEARCHABLE))
+storage.add_index("values", ValueIndex(INDEXED))
+storage.reload(lazy=True)
@@ -15,12 +15,4 @@ class Amenity(models.BaseModel):
     attributes and methods for the Amenity class
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initialises attributes to empty strings if not kwargs
-        provided, else passes initialisation on to the the
-        parent
-        """
-
-        self.name = ""
-        super().__init__(*args, **kwargs)
+    __FIELDS__ = (models.Field("name", str),)
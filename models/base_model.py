@@ -3,7 +3,10 @@
 Base Module: Definition, documentation and encapsulation of
 all common attributes and methods for the project's classes
 """
+from collections import namedtuple
 from importlib import import_module
+from models.engine.ids import uuid7
+from operator import itemgetter
 from datetime import datetime
 import uuid
 
@@ -11,13 +14,97 @@ import uuid
 models = import_module("models")
 
 
+class Field(namedtuple("Field", ["name", "type", "default"])):
+    """
+    Declaration of an attribute of a model, being its name, its
+    type and its default value, which where omitted is the empty
+    value of the type, e.g. `""`, `0` or a new `[]` per instance
+
+    Example
+    -------
+        Field("name", str)
+        Field("latitude", float)
+        Field("amenity_ids", list)
+    """
+
+    __slots__ = ()
+
+    MUTABLE_TYPES = (list, dict, set)
+
+    def __new__(cls, name, type=str, default=None):
+        return super().__new__(cls, name, type, default)
+
+    @property
+    def is_shared(self):
+        """Whether one default value may serve every instance"""
+
+        return self.default is not None or self.type not in self.MUTABLE_TYPES
+
+
 class BaseModel:
     """
     Definition, documentation and encapsulation of all common
     attributes and methods for the project's classes
+
+    Subclasses declare their attributes as `__FIELDS__`, from
+    which the defaults assigned by their constructors are
+    prepared once per class
+
+    New instances are given random version four UUIDs, unless
+    `__ID_SCHEME__` is `uuid7`, whereby ids are ordered by time
+    of creation, e.g. `BaseModel.__ID_SCHEME__ = "uuid7"`
     """
 
     __IMMUTABLES__ = ["id", "created_at", "updated_at"]
+    __ID_SCHEMES__ = ("uuid4", "uuid7")
+    __ID_SCHEME__ = "uuid4"
+    __INDEXED__ = ()
+    __SEARCHABLE__ = ()
+
+    __FIELDS__ = ()
+    __defaults__ = {}
+    __factories__ = ()
+    __types__ = {}
+
+    """the serialisation cache is kept out of `__dict__`"""
+    __slots__ = ("__dict__", "__weakref__", "__cache")
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Prepares the defaults of a subclass from its fields, those
+        shared by all instances being copied in a single update
+        and the others built anew for each instance
+        """
+
+        super().__init_subclass__(**kwargs)
+
+        if cls.__ID_SCHEME__ not in cls.__ID_SCHEMES__:
+            raise ValueError(f"unknown id scheme: {cls.__ID_SCHEME__}")
+
+        cls.__defaults__ = {
+            field.name: field.type() if field.default is None
+            else field.default
+            for field in cls.__FIELDS__
+            if field.is_shared
+        }
+        cls.__factories__ = tuple(
+            (field.name, field.type)
+            for field in cls.__FIELDS__
+            if not field.is_shared
+        )
+        cls.__types__ = {field.name: field.type for field in cls.__FIELDS__}
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Allocates a model alongside an empty cache of its
+        serialised forms, which is cleared whenever an attribute
+        is assigned or deleted
+        """
+
+        model = super().__new__(cls)
+        BaseModel.__cache.__set__(model, {})
+
+        return model
 
     def __init__(self, *args, **kwargs):
         """
@@ -39,18 +126,20 @@ class BaseModel:
     @classmethod
     def all(cls):
         """
-        Prints a list of string representations of all instances.
-        Where instances are scoped to calling class.
+        Provides the super ids of all instances. Where instances
+        are scoped to calling class.
+
+        Return
+        ------
+        list[str]
+            keys of <model class name>.id, rendered by the console
         """
 
-        all_super_ids = [
-            model for model in models.storage.all().keys()
+        return [
+            model for model in models.storage.snapshot()
             if model.count(cls.__name__)
         ]
 
-        for super_id in all_super_ids:
-            print(super_id)
-
     @classmethod
     def create(cls):
         """
@@ -68,15 +157,13 @@ class BaseModel:
 
     @classmethod
     def count(cls):
-        """Display number of all class specific instances in storage"""
+        """Provides number of all class specific instances in storage"""
 
-        count = sum(
+        return sum(
             model.get("__class__") == cls.__name__
-            for model in models.storage.all().values()
+            for model in models.storage.snapshot().values()
         )
 
-        print(f"{cls.__name__} count: {count}")
-
     @classmethod
     def destroy(cls, instance_id=None):
         """
@@ -95,9 +182,53 @@ class BaseModel:
             return
 
         key = f"{cls.__name__}.{instance_id}"
-        models.storage.all().pop(key)
+
+        if models.storage.delete(key) is None:
+            return print("** no instance found **")
+
         models.storage.save()
 
+    @classmethod
+    def destroy_where(cls, where=None):
+        """
+        Deletes every instance of the model whose attributes equal
+        the given values, in one pass over storage and with a
+        single save, however many instances match
+
+        Parameter
+        ---------
+        where : dict
+            attribute-to-value pairings to be matched
+
+        Return
+        ------
+        int | None
+            number of instances deleted, else None if not deleted
+
+        Expected
+        --------
+            (anna) Review.destroy_where({"user_id": "<id>"})
+            ** 12 instances destroyed **
+        """
+
+        if BaseModel.is_base_model(cls.__name__):
+            return print("** model doesn't exist **")
+
+        where = cls.__conditions__(where)
+
+        if where is None:
+            return
+
+        keys = models.storage.where(cls.__name__, where)
+
+        for key in keys:
+            models.storage.delete(key)
+
+        if keys:
+            models.storage.save()
+
+        return len(keys)
+
     @classmethod
     def is_base_model(cls, model_name):
         return model_name.lower() in ["basemodel", cls.__name__.lower()]
@@ -106,7 +237,7 @@ class BaseModel:
     def is_valid_id(cls, instance_id):
         """Validates instance id as being existant"""
 
-        keys = models.storage.all().keys()
+        keys = models.storage.snapshot()
         elements = [element for key in keys for element in key.split(".")]
 
         if not instance_id:
@@ -136,24 +267,105 @@ class BaseModel:
 
         return True
 
+    @classmethod
+    def page(cls, after=None, limit=100):
+        """
+        Provides the super ids of a page of instances in ascending
+        order of id, whereby the next page starts after the last
+        id provided. BaseModel is not recognised as a valid model
+
+        Parameters
+        ----------
+        after : str | None
+            id after which the page starts, None being the start
+
+        limit : int
+            maximum number of instances
+
+        Return
+        ------
+        list[str]
+            keys of <model class name>.id, rendered by the console
+
+        Expected
+        --------
+            (anna) <model>.page(None, 2)
+            <model>.<id 1>
+            <model>.<id 2>
+            (anna) <model>.page("<id 2>", 2)
+            <model>.<id 3>
+        """
+
+        if BaseModel.is_base_model(cls.__name__):
+            return print("** model doesn't exist **")
+
+        return models.storage.page(cls.__name__, after, limit)
+
     def save(self):
         """Saves present model to storage"""
 
         self.updated_at = datetime.now()
+        models.storage.new(self)
         models.storage.save()
 
+    @classmethod
+    def search(cls, terms=None, limit=10):
+        """
+        Provides the instances whose searchable attributes best
+        match the terms, ranked by relevance. The user is
+        informed should:
+            - The model not exist
+            - The model not be searchable
+            - The terms be missing
+
+        Parameters
+        ----------
+        terms : str
+            words to be searched for, case insensitive
+
+        limit : int | None
+            maximum number of instances, None being all
+
+        Return
+        ------
+        list[tuple[str, float]]
+            keys of <model class name>.id paired with their
+            score, rendered by the console
+
+        Expected
+        --------
+            (anna) <model>.search("quiet garden")
+            <model>.<id> 2.7310
+        """
+
+        if BaseModel.is_base_model(cls.__name__):
+            return print("** model doesn't exist **")
+
+        if not cls.__SEARCHABLE__:
+            return print("** model not searchable **")
+
+        if not terms:
+            return print("** search terms missing **")
+
+        return models.storage.search(cls.__name__, terms, limit)
+
     @classmethod
     def show(cls, instance_id=None):
         """
-        Prints the string representation of an instance
-        based on the model name and id. If the model name
-        or id are missing, the user is informed.
+        Provides an instance based on the model name and id,
+        its string representation being rendered by the console.
+        If the model name or id are missing, the user is informed.
 
         Parameter
         ---------
         instance_id: str
             id of instance
 
+        Return
+        ------
+        BaseModel | None
+            the instance, else None if not found
+
         Expected
         --------
             (anna) <model>.show(<id>)
@@ -176,22 +388,20 @@ class BaseModel:
             return
 
         key = f"{cls.__name__}.{instance_id}"
-        kwargs = models.storage.all().get(key)
+        kwargs = models.storage.get(key)
 
         if not kwargs:
             return print("** no instance found **")
 
         Model = models.ALL_MODELS.get(cls.__name__)
-        model = Model(**kwargs)
-
-        print(model)
+        return Model(**kwargs)
 
     @property
     def super_id(self):
         """
         Returns the model's name prepended to its version four
         form of the RFC 4122 Standardised UUID (Universally Unique
-        Identifiers)
+        Identifiers), being cheaper to build than to cache
         """
 
         return f"{self.__class__.__name__}.{self.id}"
@@ -199,67 +409,372 @@ class BaseModel:
     def to_dict(self):
         """
         Returns serialised method/attr-to-value pair for current
-        model
+        model, built once until an attribute is assigned or a
+        mutable value, e.g. a list, is changed in place. The
+        dictionary is shared by all callers and is not to be
+        changed in place. Reuse costs a comparison of the model's
+        lists and dictionaries with copies of them, and thereby
+        grows with their size
         """
 
-        dict_ = {
-            key: value.isoformat() if isinstance(value, datetime) else value
-            for key, value in sorted(self.__dict__.items())
-        }
+        dict_ = self.__cached__("dict")
 
-        return {
-            "__class__": self.__class__.__name__,
-            **dict_,
-        }
+        if dict_ is None:
+            dict_ = self.__cache__("dict", self.__serialise__())
+
+        return dict_
 
     @classmethod
     def update(cls, instance_id=None, attribute=None, value=None):
         """
-        Updates an instance of the model matching the
-        given id. The updated instance is then sent to
-        storage. One attribute can be updated at a time,
-        whereby the attribute value is cast into one of
-        three types: float, int or str
+        Updates an instance of the model matching the given id,
+        whereby either one attribute and its value or a dictionary
+        of attribute-to-value pairings are given. All attributes
+        are applied to the one instance, which is then sent to
+        storage once, however many attributes change
+
+        Values of declared fields are cast into the type of the
+        field, e.g. "120" into 120 for an `int` field, while those
+        of undeclared attributes are kept as given
 
         Of note is that `id`, `created_at` and `updated_at`
         cannot be updated.
+
+        Parameters
+        ----------
+        instance_id : str
+            id of instance
+
+        attribute : str | dict
+            name of the attribute, else attribute-to-value pairings
+
+        value : Any
+            value of the attribute, unused given a dictionary
+
+        Return
+        ------
+        BaseModel | None
+            the updated instance, else None if not updated
+
+        Expected
+        --------
+            (anna) <model>.update(<id>, "name", "Loft")
+            (anna) <model>.update(<id>, {"name": "Loft", "rooms": 2})
+
+        Invalid Value
+        -------------
+            (anna) Place.update(<id>, {"number_rooms": "many"})
+            ** invalid value **
         """
 
         if BaseModel.is_base_model(cls.__name__):
             return print("** model doesn't exist **")
 
-        if attribute in cls.__IMMUTABLES__:
+        if isinstance(attribute, dict):
+            attributes = attribute
+        else:
+            attributes = {attribute: value}
+
+        if any(name in cls.__IMMUTABLES__ for name in attributes):
             return print("** immutable attribute **")
 
         if not BaseModel.is_valid_id(instance_id):
             return
 
-        if not attribute:
+        if not attributes:
             return print("** attribute missing **")
 
-        if not value:
-            return print("** value missing **")
+        attributes = cls.__cast__(attributes)
+
+        if attributes is None:
+            return
 
         key = f"{cls.__name__}.{instance_id}"
-        kwargs = models.storage.all().get(key)
+        kwargs = models.storage.get(key)
 
-        if attribute:
-            kwargs[attribute] = value
+        if not kwargs:
+            return print("** no instance found **")
 
-        model = cls(**kwargs)
+        model = cls(**{**kwargs, **attributes})
         model.save()
         return model
 
+    @classmethod
+    def update_where(cls, where=None, attributes=None):
+        """
+        Updates every instance of the model whose attributes equal
+        the given values, in one pass over storage and with a
+        single save, however many instances match. Values are
+        cast as by `update`
+
+        Parameters
+        ----------
+        where : dict
+            attribute-to-value pairings to be matched
+
+        attributes : dict
+            attribute-to-value pairings to be assigned
+
+        Return
+        ------
+        int | None
+            number of instances updated, else None if not updated
+
+        Expected
+        --------
+            (anna) Place.update_where({"city_id": "<id>"}, {"max_guest": 4})
+            ** 3 instances updated **
+        """
+
+        if BaseModel.is_base_model(cls.__name__):
+            return print("** model doesn't exist **")
+
+        where = cls.__conditions__(where)
+
+        if where is None:
+            return
+
+        if not isinstance(attributes, dict) or not attributes:
+            return print("** attribute missing **")
+
+        if any(name in cls.__IMMUTABLES__ for name in attributes):
+            return print("** immutable attribute **")
+
+        attributes = cls.__cast__(attributes)
+
+        if attributes is None:
+            return
+
+        keys = models.storage.where(cls.__name__, where)
+        updated_at = datetime.now().isoformat()
+
+        for key in keys:
+            kwargs = models.storage.get(key)
+            cls(**{**kwargs, **attributes, "updated_at": updated_at})
+
+        if keys:
+            models.storage.save()
+
+        return len(keys)
+
+    def __cache__(self, form, value):
+        """
+        Caches a serialised form alongside copies of the mutable
+        values it was built from, by which `__cached__` finds
+        whether they have since been changed in place
+
+        Parameters
+        ----------
+        form : str
+            name of the form, e.g. `dict` or `str`
+
+        value : Any
+            the form as built
+
+        Return
+        ------
+        Any
+            the form as given
+        """
+
+        cache = self.__cache
+
+        if "mutables" not in cache:
+            dict_ = self.__dict__
+            names = [
+                name
+                for name, attribute in dict_.items()
+                if isinstance(attribute, Field.MUTABLE_TYPES)
+            ]
+
+            """fetched at once, the getter being a single C call"""
+            get = itemgetter(*names) if names else None
+            cache["mutables"] = get and (get, self.__copied__(get(dict_)))
+
+        cache[form] = value
+        return value
+
+    def __cached__(self, form):
+        """
+        Provides a cached serialised form, clearing the cache should
+        a mutable value have been changed in place since it was
+        built, which assignment alone would not have cleared
+
+        Parameter
+        ---------
+        form : str
+            name of the form, e.g. `dict` or `str`
+
+        Return
+        ------
+        Any
+            the form, else None should it be built anew
+        """
+
+        cache = self.__cache
+        value = cache.get(form)
+
+        if value is None:
+            return None
+
+        mutables = cache["mutables"]
+
+        if mutables:
+            get, copies = mutables
+
+            if get(self.__dict__) != copies:
+                cache.clear()
+                return None
+
+        return value
+
+    @classmethod
+    def __cast__(cls, attributes):
+        """
+        Casts the values of attribute-to-value pairings into the
+        types of their fields. The user is informed should a name
+        not be a valid identifier, or a value be missing or invalid
+
+        Return
+        ------
+        dict | None
+            the cast pairings, else None if a name or value is invalid
+        """
+
+        if not all(
+            isinstance(name, str) and name.isidentifier()
+            for name in attributes
+        ):
+            print("** attribute missing **")
+            return None
+
+        if any(value is None or value == "" for value in attributes.values()):
+            print("** value missing **")
+            return None
+
+        try:
+            return {
+                name: cls.__coerce__(name, value)
+                for name, value in attributes.items()
+            }
+        except (TypeError, ValueError):
+            print("** invalid value **")
+            return None
+
+    @classmethod
+    def __coerce__(cls, name, value):
+        """
+        Casts a value into the type of the field of the given name,
+        undeclared attributes and values of the type being kept
+
+        Raises
+        ------
+        TypeError | ValueError
+            should the value not be castable
+        """
+
+        type_ = cls.__types__.get(name)
+
+        if type_ is None or isinstance(value, type_):
+            return value
+
+        if type_ in Field.MUTABLE_TYPES or isinstance(value, bool):
+            raise TypeError(f"{name} must be of type {type_.__name__}")
+
+        if type_ is int and isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                value = float(value)
+
+        if type_ is int and isinstance(value, float):
+            if not value.is_integer():
+                raise ValueError(f"{name} must be a whole number")
+
+        return type_(value)
+
+    @classmethod
+    def __conditions__(cls, where):
+        """
+        Validates the conditions of a bulk update or deletion,
+        casting their values as are those of `update`. The user
+        is informed should the conditions be missing or invalid
+
+        Return
+        ------
+        dict | None
+            the cast conditions, else None if invalid
+        """
+
+        if not isinstance(where, dict) or not where:
+            print("** conditions missing **")
+            return None
+
+        return cls.__cast__(where)
+
+    @staticmethod
+    def __copied__(value):
+        """
+        Copies lists, dictionaries and sets however nested, as well
+        as tuples which may hold them, other values being immutable
+        and thereby shared
+        """
+
+        if isinstance(value, list):
+            return [BaseModel.__copied__(item) for item in value]
+
+        if isinstance(value, tuple):
+            return tuple(BaseModel.__copied__(item) for item in value)
+
+        if isinstance(value, dict):
+            return {
+                key: BaseModel.__copied__(item)
+                for key, item in value.items()
+            }
+
+        if isinstance(value, set):
+            return set(value)
+
+        return value
+
+    def __delattr__(self, name):
+        """Deletes an attribute, clearing the serialisation cache"""
+
+        self.__cache.clear()
+        super().__delattr__(name)
+
     def __eq__(self, other):
         have_same_ids = self.super_id == other.super_id
         have_same_created_at = self.created_at == other.created_at
         return have_same_ids and have_same_created_at
 
     def __init_default__(self):
-        """Generates a new BaseModel object"""
+        """
+        Generates a new object, its fields holding their defaults,
+        by way of its `__dict__` rather than `__setattr__`
+        """
+
+        dict_ = self.__init_fields__()
+        dict_["id"] = self.__new_id__()
+        dict_["created_at"] = dict_["updated_at"] = datetime.now()
+
+    def __init_fields__(self):
+        """
+        Assigns the defaults of the class's fields
+
+        Return
+        ------
+        dict
+            the instance's `__dict__`
+        """
 
-        self.id = str(uuid.uuid4())
-        self.created_at = self.updated_at = datetime.now()
+        dict_ = self.__dict__
+        dict_.update(self.__defaults__)
+
+        for name, factory in self.__factories__:
+            dict_[name] = factory()
+
+        return dict_
 
     def __init_kwargs__(self, kwargs):
         """
@@ -272,21 +787,59 @@ class BaseModel:
             and spawn existing objects
         """
 
-        dt_attr = ["created_at", "updated_at"]
+        dict_ = self.__init_fields__()
+        dict_.update(kwargs)
+
+        """lists read from file are shared between models"""
+        for name, value in kwargs.items():
+            if type(value) is list:
+                dict_[name] = list(value)
+
+        for attr in ["created_at", "updated_at"]:
+            if attr in kwargs:
+                dict_[attr] = datetime.fromisoformat(kwargs[attr])
+
+    @classmethod
+    def __new_id__(cls):
+        """Generates an id of the class's scheme, `uuid4` or `uuid7`"""
+
+        if cls.__ID_SCHEME__ == "uuid7":
+            return uuid7()
+
+        return str(uuid.uuid4())
 
-        for attr, value in kwargs.items():
+    def __represent__(self):
+        """Builds the string returned by `__str__`"""
+
+        dict_ = {key: value for key, value in sorted(self.__dict__.items())}
+        name = self.__class__.__name__
+        return f"[{name}] ({self.id}) {dict_}"
+
+    def __serialise__(self):
+        """
+        Builds the serialised form returned by `to_dict`, its lists
+        and dictionaries being copies such that the form, once held
+        by storage and its snapshots, does not follow the model
+        """
 
-            if attr in dt_attr:
-                format = "%Y-%m-%dT%H:%M:%S.%f"
-                value = datetime.strptime(value, format)
+        dict_ = {
+            key: value.isoformat()
+            if isinstance(value, datetime)
+            else self.__copied__(value)
+            for key, value in sorted(self.__dict__.items())
+        }
 
-            self.__dict__[attr] = value
+        return {
+            "__class__": self.__class__.__name__,
+            **dict_,
+        }
 
     def __setattr__(self, name, value):
         """
         Customised process when creating or updating an
         attribute, principally to update the `updated_at`
-        attribute to the time of use
+        attribute to the time of use and to clear the cached
+        serialised forms
 
         Parameters
         ----------
@@ -298,14 +851,23 @@ class BaseModel:
             attribute
         """
 
+        self.__cache.clear()
+
         if name.count("updated_at"):
             return super().__setattr__(name, value)
         self.__dict__["updated_at"] = datetime.now()
         super().__setattr__(name, value)
 
     def __str__(self):
-        """Returns a string representing the current model"""
+        """
+        Returns a string representing the current model, built
+        once until an attribute is assigned or a mutable value
+        is changed in place
+        """
 
-        dict_ = {key: value for key, value in sorted(self.__dict__.items())}
-        name = self.__class__.__name__
-        return f"[{name}] ({self.id}) {dict_}"
+        string = self.__cached__("str")
+
+        if string is None:
+            string = self.__cache__("str", self.__represent__())
+
+        return string
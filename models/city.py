@@ -15,13 +15,9 @@ class City(models.BaseModel):
     attributes and methods for the City class
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initialises attributes to empty strings if not kwargs
-        provided, else passes initialisation on to the the
-        parent
-        """
+    __INDEXED__ = ("state_id",)
 
-        self.name = ""
-        self.state_id = ""
-        super().__init__(*args, **kwargs)
+    __FIELDS__ = (
+        models.Field("name", str),
+        models.Field("state_id", str),
+    )
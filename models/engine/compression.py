@@ -0,0 +1,219 @@
+#!/usr/bin/python3
+"""
+Compression Module: Definition, documentation and encapsulation
+of the codecs by which stores are compressed on file, chosen by
+the suffix of the file:
+    - `.gz`: gzip
+    - `.xz`: xz (LZMA)
+    - `.zz`: zlib
+    - any other: uncompressed
+
+Stores are compressed as they are written and decompressed as
+they are read, a chunk at a time, such that neither the
+compressed nor the uncompressed file is held whole in memory
+by the codec
+"""
+from pathlib import Path
+import gzip
+import lzma
+import zlib
+import io
+
+
+"""compression level used where none is given, by suffix"""
+DEFAULT_LEVELS = {".gz": 6, ".xz": 6, ".zz": 6}
+
+"""compression levels accepted by every codec"""
+LEVELS = range(0, 10)
+
+
+class ZlibFile(io.RawIOBase):
+    """
+    Binary file of a zlib stream, compressed as written and
+    decompressed as read, the standard library offering no file
+    object of its own for the format
+
+    Example
+    -------
+        with ZlibFile("file.json.zz", "w", 6) as file:
+            file.write(b"{}")
+    """
+
+    CHUNK = 1 << 16
+
+    def __init__(self, path, mode="r", level=-1):
+        """
+        Parameters
+        ----------
+        path : str
+            location of the file
+
+        mode : str
+            `r` to decompress, else `w` to compress
+
+        level : int
+            compression level from 0 to 9, -1 being zlib's default
+        """
+
+        super().__init__()
+
+        self.mode = mode
+        self.__file = open(path, f"{mode}b")
+        self.__buffer = memoryview(b"")
+
+        if mode == "w":
+            self.__codec = zlib.compressobj(level)
+        else:
+            self.__codec = zlib.decompressobj()
+
+    def close(self):
+        """Writes the end of the stream, should it be written, and closes"""
+
+        if self.closed:
+            return
+
+        try:
+            if self.writable():
+                self.__file.write(self.__codec.flush())
+        finally:
+            self.__file.close()
+            super().close()
+
+    def readable(self):
+        """Whether the file is being decompressed"""
+
+        return self.mode == "r"
+
+    def readinto(self, buffer):
+        """
+        Decompresses into a buffer, reading a chunk of the file
+        should none be left decompressed
+
+        Return
+        ------
+        int
+            number of bytes decompressed into the buffer, 0 being
+            the end of the stream
+        """
+
+        while not self.__buffer:
+            chunk = self.__file.read(self.CHUNK)
+
+            if not chunk:
+                self.__buffer = memoryview(self.__codec.flush())
+                break
+
+            self.__buffer = memoryview(self.__codec.decompress(chunk))
+
+        size = min(len(buffer), len(self.__buffer))
+        buffer[:size] = self.__buffer[:size]
+        self.__buffer = self.__buffer[size:]
+
+        return size
+
+    def writable(self):
+        """Whether the file is being compressed"""
+
+        return self.mode == "w"
+
+    def write(self, data):
+        """
+        Compresses bytes onto the file
+
+        Return
+        ------
+        int
+            number of bytes compressed
+        """
+
+        self.__file.write(self.__codec.compress(data))
+        return len(data)
+
+
+def level_of(path, level=None):
+    """
+    Validates the compression level of a store, defaulting to
+    that of its codec
+
+    Parameters
+    ----------
+    path : str
+        location of the store
+
+    level : int | None
+        compression level, None being the codec's default
+
+    Return
+    ------
+    int | None
+        compression level, None should the store be uncompressed
+
+    Raises
+    ------
+    ValueError
+        should the level not be from 0 to 9
+    """
+
+    suffix = Path(path).suffix
+
+    if suffix not in DEFAULT_LEVELS:
+        return None
+
+    if level is None:
+        return DEFAULT_LEVELS[suffix]
+
+    if level not in LEVELS:
+        raise ValueError(f"compression level must be from 0 to 9: {level}")
+
+    return level
+
+
+def open_store(path, mode="r", level=None):
+    """
+    Opens a store as text, compressed or decompressed as a
+    stream according to its suffix
+
+    Parameters
+    ----------
+    path : str
+        location of the store
+
+    mode : str
+        `r` to read, else `w` to write
+
+    level : int | None
+        compression level when writing, None being the codec's
+        default
+
+    Return
+    ------
+    TextIO
+        file of the store's JSON text
+
+    Example
+    -------
+        with open_store("file.json.gz", "w", level=9) as file:
+            json.dump(objects, file)
+    """
+
+    suffix = Path(path).suffix
+    level = level_of(path, level)
+
+    if suffix == ".gz":
+        return gzip.open(
+            path, f"{mode}t", compresslevel=level, encoding="utf-8"
+        )
+
+    if suffix == ".xz":
+        preset = level if mode == "w" else None
+        return lzma.open(path, f"{mode}t", preset=preset, encoding="utf-8")
+
+    if suffix == ".zz":
+        raw = ZlibFile(path, mode, level)
+
+        if mode == "w":
+            return io.TextIOWrapper(io.BufferedWriter(raw), encoding="utf-8")
+
+        return io.TextIOWrapper(io.BufferedReader(raw), encoding="utf-8")
+
+    return open(path, mode)
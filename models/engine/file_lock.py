@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+File Lock: Definition, documentation and encapsulation of
+advisory reader/writer locks shared between processes
+"""
+from contextlib import contextmanager
+from time import perf_counter
+import os
+
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileLock:
+    """
+    Advisory reader/writer lock held on a sidecar `<path>.lock`
+    file, such that any number of processes may hold the shared
+    lock at once while the exclusive lock is held by one alone.
+    Where `fcntl` is unavailable, locking is a no-op.
+
+    The lock is not re-entrant: acquiring it again while held
+    by the same thread blocks.
+
+    Example
+    -------
+        lock = FileLock("file.json")
+
+        with lock.shared():
+            data = json.load(...)
+
+        with lock.exclusive():
+            json.dump(...)
+    """
+
+    def __init__(self, path, metrics=None):
+        """
+        Parameters
+        ----------
+        path : str
+            file guarded by the lock
+
+        metrics : Metrics | None
+            registry into which time spent waiting on the lock
+            is accumulated, under `lock_<mode>_wait`
+        """
+
+        self.path = f"{path}.lock"
+        self.metrics = metrics
+
+    @contextmanager
+    def exclusive(self):
+        """Holds the lock to the exclusion of all others"""
+
+        with self.__hold__("exclusive"):
+            yield
+
+    @contextmanager
+    def shared(self):
+        """Holds the lock alongside other shared holders"""
+
+        with self.__hold__("shared"):
+            yield
+
+    @contextmanager
+    def __hold__(self, mode):
+        """
+        Acquires the lock in the given mode, blocking until
+        available, and releases it on exit
+
+        Parameter
+        ---------
+        mode : str
+            either `shared` or `exclusive`
+        """
+
+        if not fcntl:
+            yield
+            return
+
+        operation = fcntl.LOCK_SH if mode == "shared" else fcntl.LOCK_EX
+        descriptor = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+        try:
+            start = perf_counter()
+            fcntl.flock(descriptor, operation)
+
+            if self.metrics:
+                self.metrics.increment(
+                    f"lock_{mode}_wait_seconds", perf_counter() - start
+                )
+                self.metrics.increment(f"lock_{mode}_wait_count")
+
+            yield
+        finally:
+            os.close(descriptor)
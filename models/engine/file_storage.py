@@ -3,26 +3,564 @@
 File Storage: Definition, documentation and encapsulation
 of all models onto the operating system's file storage
 """
+from contextlib import contextmanager
+from importlib import import_module
+from types import MappingProxyType
 from datetime import datetime
+from time import monotonic
 from pathlib import Path
+import threading
+import atexit
 import json
 import uuid
+import os
+
+
+from models.engine.compression import level_of, open_store
+from models.engine.file_lock import FileLock
+from models.engine.indexes import IdIndex, UpdatedIndex
+from models.engine.interning import Interner
+from models.engine.metrics import Exporter, Metrics
+from models.engine.metrics import to_prometheus, write_atomically
 
 
 class FileStorage:
     """
     Definition, documentation and encapsulation of all
     models onto the operating system's file storage
+
+    Instances are safe to share between threads: reads are
+    lock-free dictionary lookups, whereas changes to the cache
+    are made under a mutex held only for the change itself,
+    never for the duration of file I/O or (de)serialisation
+
+    Iteration is made over snapshots, the cache being copied on
+    the first change after a snapshot is taken rather than
+    changed in place, such that a snapshot is never changed
     """
 
     __file_path = "file.json"
     __objects = {}
 
+    def __init__(self, file_path=None, level=None):
+        """
+        Prepares an empty cache bound to a file
+
+        Parameters
+        ----------
+        file_path : str
+            location of the JSON store, defaults to `file.json`
+            within the current working directory. The store is
+            compressed should the path end in `.gz`, `.xz` or `.zz`
+
+        level : int | None
+            compression level from 0 to 9, None being the default
+            of the codec and ignored should the store be
+            uncompressed
+        """
+
+        self.__file_path = file_path or FileStorage.__file_path
+        self.__level = level_of(self.__file_path, level)
+        self.__objects = {}
+        self.__shared = False
+        self.__batches = threading.local()
+        self.__dirty = False
+        self.__metrics = Metrics()
+        self.__exporter = None
+        self.__lock = FileLock(self.__file_path, self.__metrics)
+        self.__signature = None
+        self.__changed = set()
+        self.__deleted = set()
+        self.__mutex = threading.RLock()
+        self.__queued_save = None
+        self.__running_save = None
+        self.__unflushed = 0
+        self.__flusher = None
+        self.__flush_interval = None
+        self.__flush_threshold = None
+        self.__flush_lock = threading.Lock()
+        self.__load_lock = threading.Lock()
+        self.__flush_condition = threading.Condition(self.__mutex)
+        self.__flush_at_exit = False
+        self.__indexes = {"ids": IdIndex(), "updated": UpdatedIndex()}
+        self.__persisted_indexes = {}
+        self.__tombstones = {}
+        self.__pending = False
+
+    async def aget(self, key):
+        """
+        Provides the serialised model of the given key once
+        storage is brought up to date, without blocking the
+        event loop
+
+        Parameter
+        ---------
+        key : str
+            retrieval key of <model class name>.id
+
+        Return
+        ------
+        dict | None
+            serialised model, else None should it not exist
+        """
+
+        await self.arefresh()
+        return self.get(key)
+
+    async def aiter(self, model_name, chunk_size=1000):
+        """
+        Iterates asynchronously over the serialised models of a
+        class, yielding to the event loop every chunk such that
+        large classes do not starve other tasks
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        chunk_size : int
+            number of models between yields to the event loop
+
+        Example
+        -------
+            async for user in storage.aiter("User"):
+                print(user.get("email"))
+        """
+
+        asyncio = import_module("asyncio")
+        prefix = f"{model_name}."
+        objects = self.snapshot()
+        keys = [key for key in objects if key.startswith(prefix)]
+
+        for index, key in enumerate(keys, start=1):
+            yield objects[key]
+
+            if not index % chunk_size:
+                await asyncio.sleep(0)
+
+    def add_index(self, name, index):
+        """
+        Has storage keep an index up to date with its models,
+        the index being built on first use
+
+        Parameters
+        ----------
+        name : str
+            name by which the index is retrieved
+
+        index : Any
+            as described by `models.engine.indexes`
+        """
+
+        with self.__mutex:
+            index.clear()
+            self.__indexes[name] = index
+            self.__persisted_indexes.pop(name, None)
+
     def all(self):
-        """Provides all models in storage"""
+        """
+        Provides all models in storage, as a mapping which changes
+        with the cache and is therefore not to be iterated while
+        models may be changed, for which see `snapshot`. Should a
+        lazy reload be pending, the file is first read
+        """
 
+        self.__load__()
         return self.__objects
 
+    async def arefresh(self):
+        """Asynchronous counterpart of `refresh`, run in an executor"""
+
+        loop = import_module("asyncio").get_running_loop()
+        return await loop.run_in_executor(None, self.refresh)
+
+    async def areload(self):
+        """Asynchronous counterpart of `reload`, run in an executor"""
+
+        loop = import_module("asyncio").get_running_loop()
+        await loop.run_in_executor(None, self.reload)
+
+    async def asave(self):
+        """
+        Asynchronous counterpart of `save`, whereby serialisation
+        and writing are run in an executor. Requests made while a
+        write is underway are coalesced into a single next write,
+        which awaits the one underway. The write is a task of its
+        own, such that a cancelled caller leaves it to complete
+        for the others
+
+        Example
+        -------
+            await asyncio.gather(*(storage.asave() for _ in range(9)))
+        """
+
+        asyncio = import_module("asyncio")
+        self.__metrics.increment("async_save_requests_total")
+
+        """a write cancelled before it began never forgets itself"""
+        if not self.__queued_save or self.__queued_save.done():
+            queued = self.__queued_save = asyncio.ensure_future(
+                self.__asave__()
+            )
+            queued.add_done_callback(
+                lambda task: task.cancelled() or task.exception()
+            )
+
+        await asyncio.shield(self.__queued_save)
+
+    def backup(self, path, since=None):
+        """
+        Writes to file the models created or updated after a point
+        in time, together with the keys of those deleted after it
+        (tombstones), such that a chain of incremental backups can
+        be restored onto a full one. The backup is compressed
+        should its path end in `.gz`, `.xz` or `.zz`
+
+        Parameters
+        ----------
+        path : str
+            location of the backup
+
+        since : str | None
+            ISO formatted time after which changes are backed up,
+            None backing up all models
+
+        Return
+        ------
+        tuple[int, int]
+            number of models and of deletions backed up
+
+        Example
+        -------
+            storage.backup("base.json.gz")
+            storage.backup("monday.json.gz", "2024-05-27T00:00:00")
+        """
+
+        objects, deleted = self.changes(since)
+
+        backup = {
+            "since": since,
+            "taken_at": datetime.now().isoformat(),
+            "objects": objects,
+            "deleted": deleted,
+        }
+
+        with open_store(path, "w") as file:
+            json.dump(backup, file)
+
+        self.__metrics.increment("backups_total")
+        return len(objects), len(deleted)
+
+    @contextmanager
+    def batch(self):
+        """
+        Defers writing to file until the outermost batch is
+        exited, whereby any number of `save` calls made within
+        the batch amount to a single write
+
+        Example
+        -------
+            with storage.batch():
+                for _ in range(1000):
+                    User().save()
+        """
+
+        self.__batches.depth = self.__batch_depth__() + 1
+
+        try:
+            yield self
+        finally:
+            self.__batches.depth -= 1
+
+            if not self.__batches.depth and self.__dirty:
+                self.save()
+
+    def changes(self, since=None):
+        """
+        Provides the models created or updated after a point in
+        time, found through the `updated` index, and the keys of
+        the models deleted after it, as recorded on deletion
+
+        Parameter
+        ---------
+        since : str | None
+            ISO formatted time after which changes are provided,
+            None being all models and all deletions
+
+        Return
+        ------
+        tuple[dict, dict]
+            serialised models keyed by <model class name>.id, and
+            the time of each deletion keyed likewise
+        """
+
+        with self.index("updated") as updated:
+            objects = self.all()
+            changed = {key: objects[key] for key in updated.since(since)}
+
+        tombstones = {**self.__read_tombstones__(), **self.__tombstones}
+        objects = self.all()
+
+        deleted = {
+            key: deleted_at
+            for key, deleted_at in tombstones.items()
+            if (since is None or deleted_at > since) and key not in objects
+        }
+
+        return changed, deleted
+
+    def compact(self, before):
+        """
+        Drops the tombstones of models deleted at or before a point
+        in time, tombstones being otherwise kept for good. Once a
+        full backup is taken, those older than it are needed by no
+        incremental backup restored onto it
+
+        Parameter
+        ---------
+        before : str
+            ISO formatted time at or before which tombstones are
+            dropped, e.g. the time of the latest full backup
+
+        Return
+        ------
+        int
+            number of tombstones dropped
+
+        Example
+        -------
+            storage.backup("base.json.gz")
+            storage.compact("2024-05-27T03:39:12")
+        """
+
+        path = f"{self.__file_path}.tombstones"
+        dropped = 0
+
+        with self.__lock.exclusive():
+            with self.__mutex:
+                kept = {
+                    key: deleted_at
+                    for key, deleted_at in self.__tombstones.items()
+                    if deleted_at > before
+                }
+                dropped += len(self.__tombstones) - len(kept)
+                self.__tombstones = kept
+
+            try:
+                with open(path, "r") as file:
+                    tombstones = json.load(file)
+            except (OSError, ValueError):
+                tombstones = {}
+
+            kept = {
+                key: deleted_at
+                for key, deleted_at in tombstones.items()
+                if deleted_at > before
+            }
+
+            if len(kept) != len(tombstones):
+                write_atomically(path, json.dumps(kept))
+                dropped += len(tombstones) - len(kept)
+
+        self.__metrics.increment("tombstones_dropped_total", dropped)
+        return dropped
+
+    def complete(self, model_name, prefix, limit=None):
+        """
+        Provides the ids of a class which start with a prefix,
+        in ascending order and at a cost of O(log N + limit),
+        such as to resolve short ids or complete them
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        prefix : str
+            leading characters of the ids
+
+        limit : int | None
+            maximum number of ids, None being all
+
+        Return
+        ------
+        list[str]
+            ids starting with the prefix
+
+        Example
+        -------
+            storage.complete("Place", "3f2a", 2)
+            ['3f2a9c1e-5b0d-4e43-9f5e-0c7d2b8a6e14']
+        """
+
+        with self.index("ids") as ids:
+            return ids.complete(model_name, prefix, limit)
+
+    def delete(self, key):
+        """
+        Stops tracking the model of the given key
+
+        Parameter
+        ---------
+        key : str
+            retrieval key of <model class name>.id
+
+        Return
+        ------
+        dict | None
+            serialised model no longer tracked, else None
+            should the key not be tracked
+        """
+
+        self.__load__()
+
+        with self.__mutex:
+            self.__writable__()
+            model = self.all().pop(key, None)
+
+            if model is not None:
+                self.__changed.discard(key)
+                self.__deleted.add(key)
+                self.__tombstones[key] = datetime.now().isoformat()
+                self.__reindex__(key, model, None)
+
+        if model is not None:
+            self.__metrics.increment("changes_total")
+
+        return model
+
+    def export_metrics(self, path, interval=None):
+        """
+        Writes storage metrics to file in the Prometheus text
+        format, once or, where an interval is given, every
+        interval by a background thread until called again. The
+        first write is made at once, such that a path which cannot
+        be written is reported to the caller
+
+        Parameters
+        ----------
+        path : str
+            file to be written, e.g. for a textfile collector
+
+        interval : float | None
+            seconds between writes
+
+        Raises
+        ------
+        OSError
+            should the file not be written
+        """
+
+        if self.__exporter:
+            self.__exporter.stop()
+            self.__exporter = None
+
+        write_atomically(path, self.prometheus())
+
+        if not interval:
+            return
+
+        self.__exporter = Exporter(
+            self.prometheus, path, interval, self.__metrics
+        )
+        self.__exporter.start()
+
+    def flush(self):
+        """
+        Writes pending changes to file at once, providing a point
+        of durability within a batch or in write-behind mode
+
+        Return
+        ------
+        bool
+            whether there were changes to be written
+        """
+
+        with self.__flush_lock:
+            if not self.__dirty:
+                return False
+
+            self.__write__()
+
+        self.__metrics.increment("flushes_total")
+        return True
+
+    def get(self, key):
+        """
+        Provides the serialised model of the given key, counting
+        the lookup as a cache hit or miss
+
+        Parameter
+        ---------
+        key : str
+            retrieval key of <model class name>.id
+
+        Return
+        ------
+        dict | None
+            serialised model, else None should it not exist
+        """
+
+        model = self.all().get(key)
+        outcome = "hits" if model else "misses"
+        self.__metrics.increment(f"cache_{outcome}_total")
+
+        return model
+
+    @contextmanager
+    def index(self, name):
+        """
+        Provides an index, built should this be its first use,
+        for the duration of which models cannot be changed
+
+        Parameter
+        ---------
+        name : str
+            name of the index, e.g. `ids`
+
+        Example
+        -------
+            with storage.index("ids") as ids:
+                ids.count("User")
+        """
+
+        self.__load__()
+        index = self.__indexes[name]
+        persisted = None
+
+        if not index.built and index.persistent:
+            persisted = self.__read_index__(name)
+
+        with self.__mutex:
+            index = self.__indexes[name]
+
+            if not index.built:
+                self.__build_index__(name, index, persisted)
+
+            yield index
+
+    def metrics(self):
+        """
+        Provides counters and timers of storage operations,
+        together with the following derived gauges:
+            - objects: number of models presently tracked
+            - write_amplification: bytes written per change
+
+        Return
+        ------
+        dict
+            metric name-to-value pairings
+        """
+
+        metrics = self.__metrics.snapshot()
+        changes = metrics.get("changes_total", 0)
+        written = metrics.get("bytes_written_total", 0)
+
+        metrics["objects"] = len(self.all())
+        metrics["write_amplification"] = written / changes if changes else 0
+
+        return metrics
+
     def new(self, model):
         """
         Updates cached items with the retrieval
@@ -34,33 +572,951 @@ class FileStorage:
             model to be tracked
         """
 
-        self.__objects[model.super_id] = model.to_dict()
+        key = model.super_id
+        dict_ = model.to_dict()
+        stored = self.all().get(key)
+
+        if stored is dict_ or stored == dict_:
+            return
+
+        with self.__mutex:
+            objects = self.__writable__()
+            previous = objects.get(key)
+            objects[key] = dict_
+            self.__changed.add(key)
+            self.__deleted.discard(key)
+            self.__tombstones.pop(key, None)
+            self.__reindex__(key, previous, dict_)
+
+        self.__metrics.increment("changes_total")
+
+    def page(self, model_name, after=None, limit=100):
+        """
+        Provides the keys of a class in ascending order of id,
+        starting after the given id, at a cost of O(log N + limit)
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        after : str | None
+            id after which the page starts, None being the start
+
+        limit : int | None
+            maximum number of keys, None being all
 
-    def reload(self):
-        """Reload cache with models stored on file"""
+        Return
+        ------
+        list[str]
+            keys of <model class name>.id
+
+        Example
+        -------
+            page = storage.page("Review", limit=100)
+            page = storage.page("Review", page[-1].split(".")[1], 100)
+        """
+
+        with self.index("ids") as ids:
+            page = ids.page(model_name, after, limit)
+
+        return [f"{model_name}.{instance_id}" for instance_id in page]
+
+    def prometheus(self):
+        """Renders storage metrics in the Prometheus text format"""
+
+        return to_prometheus(self.metrics(), "airbnb_storage")
+
+    def refresh(self):
+        """
+        Brings the cache up to date with changes made to file by
+        other processes. Should the file be unchanged since last
+        read or written, as determined by its inode, size and
+        modification time, this costs a single `stat`; else only
+        the models added, changed or deleted on file are applied.
+        Changes not yet saved are kept. Should a lazy reload be
+        pending, there is nothing to bring up to date, the file
+        being read as it then is on first access
+
+        Return
+        ------
+        bool
+            whether changes on file were looked for and applied
+        """
+
+        if self.__pending:
+            return False
 
         path = Path(self.__file_path)
 
-        if not path.is_file():
+        if not self.__is_stale__(path) or not path.is_file():
+            return False
+
+        with self.__lock.shared():
+            self.__merge__(path)
+
+        self.__metrics.increment("refreshes_total")
+        return True
+
+    def reload(self, lazy=False):
+        """
+        Reload cache with models stored on file, under a shared
+        lock such that no write is observed partway. Changes not
+        yet saved are discarded
+
+        Parameter
+        ---------
+        lazy : bool
+            whether to defer reading the file until models are
+            first accessed, changed or saved, such that processes
+            which never access them never read the store
+
+        Example
+        -------
+            storage.reload(lazy=True)
+            storage.all()  # the file is read here
+        """
+
+        if lazy:
+            self.__pending = True
             return
 
-        if not path.stat().st_size:
-            self.__objects = {}
+        path = Path(self.__file_path)
+
+        if not path.is_file():
+            self.__signature = ()
+            self.__pending = False
             return
 
-        with open(self.__file_path, "r") as file:
-            self.__objects = json.load(file)
+        with self.__lock.shared():
+            objects = self.__read__(path, path.stat())
+
+        with self.__mutex:
+            self.__objects = objects
+            self.__pending = False
+            self.__shared = False
+            self.__changed.clear()
+            self.__deleted.clear()
+            self.__tombstones.clear()
+
+            for index in self.__indexes.values():
+                index.clear()
+
+        self.__metrics.increment("reloads_total")
+
+    def restore(self, *paths):
+        """
+        Replaces all models by those of a full backup, or of a
+        store, onto which incremental backups are merged in the
+        order given, their models being added or replaced and
+        their tombstones deleted. The result is saved to file
+
+        Parameter
+        ---------
+        paths : str
+            locations of the full backup and of the incremental
+            backups, oldest first
+
+        Return
+        ------
+        int
+            number of models restored
+
+        Example
+        -------
+            storage.restore("base.json.gz", "monday.json.gz")
+        """
+
+        objects = {}
+        interner = Interner()
+
+        for path in paths:
+            with open_store(path, "r") as file:
+                backup = json.load(file, object_hook=interner)
+
+            if "objects" not in backup:
+                backup = {"objects": backup, "deleted": {}}
+
+            objects.update(backup.get("objects", {}))
+
+            for key in backup.get("deleted", {}):
+                objects.pop(key, None)
+
+        deleted_at = datetime.now().isoformat()
+        self.__load__()
+
+        with self.__mutex:
+            removed = set(self.__objects) - set(objects)
+
+            self.__objects = objects
+            self.__shared = False
+            self.__changed.clear()
+            self.__changed.update(objects)
+            self.__deleted.clear()
+            self.__deleted.update(removed)
+            self.__tombstones.update(dict.fromkeys(removed, deleted_at))
+
+            for index in self.__indexes.values():
+                index.clear()
+
+        self.__metrics.increment("restores_total")
+        self.save()
+
+        return len(objects)
 
     def save(self):
         """
         Writes to file cached models as JSON
-        Serialised values
+        Serialised values. Within a batch the write is
+        deferred until the batch is exited, and in write-behind
+        mode it is left to the background flusher.
+
+        Writers are serialised by an exclusive lock, under
+        which changes made to file by other processes since
+        last read are merged in, such that they are not lost
+        """
+
+        if self.__batch_depth__():
+            self.__dirty = True
+            return
+
+        if self.__flusher:
+            with self.__flush_condition:
+                self.__dirty = True
+                self.__unflushed += 1
+                self.__flush_condition.notify()
+            return
+
+        self.__write__()
+
+    def search(self, model_name, terms, limit=10):
+        """
+        Ranks the models of a class by relevance to the terms of
+        a query, through the `search` index
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        terms : str
+            text of the query
+
+        limit : int | None
+            maximum number of results, None being all
+
+        Return
+        ------
+        list[tuple[str, float]]
+            keys of <model class name>.id paired with their
+            BM25 score, most relevant first
+
+        Example
+        -------
+            storage.search("Review", "quiet garden", 5)
+        """
+
+        with self.index("search") as index:
+            ranked = index.search(model_name, terms, limit)
+
+        return [
+            (f"{model_name}.{instance_id}", score)
+            for instance_id, score in ranked
+        ]
+
+    def snapshot(self):
+        """
+        Provides a read-only view of all models as they are at the
+        time of the call, which may be iterated at length while
+        models are changed, without error and without blocking
+        writers. Taking a snapshot costs O(1), the cache being
+        copied once by the next change rather than by each reader
+
+        Return
+        ------
+        Mapping[str, dict]
+            serialised models keyed by <model class name>.id,
+            neither the mapping nor the models to be changed
+
+        Example
+        -------
+            for key, dict_ in storage.snapshot().items():
+                export(key, dict_)
+        """
+
+        self.__load__()
+
+        with self.__mutex:
+            self.__shared = True
+            view = MappingProxyType(self.all())
+
+        self.__metrics.increment("snapshots_total")
+        return view
+
+    def where(self, model_name, conditions):
+        """
+        Provides the keys of the models of a class whose attributes
+        equal the given values, in one pass over the models of the
+        class or, where attributes are indexed by the `values`
+        index, over only the models holding the indexed values
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        conditions : dict
+            attribute-to-value pairings to be matched
+
+        Return
+        ------
+        list[str]
+            keys of <model class name>.id, in ascending order of id
+
+        Example
+        -------
+            storage.where("Review", {"user_id": "5b0d..."})
+        """
+
+        candidates = None
+
+        if "values" in self.__indexes:
+            with self.index("values") as values:
+                for field, value in conditions.items():
+                    ids = values.lookup(model_name, field, value)
+
+                    if ids is None:
+                        continue
+
+                    if candidates is None:
+                        candidates = ids
+                    else:
+                        candidates &= ids
+
+        if candidates is None:
+            with self.index("ids") as ids:
+                candidates = ids.page(model_name)
+
+        objects = self.all()
+        keys = []
+
+        for instance_id in sorted(candidates):
+            key = f"{model_name}.{instance_id}"
+            dict_ = objects.get(key)
+
+            if dict_ is None:
+                continue
+
+            if all(
+                field in dict_ and dict_[field] == value
+                for field, value in conditions.items()
+            ):
+                keys.append(key)
+
+        return keys
+
+    def write_behind(self, interval=0.1, threshold=1000):
+        """
+        Toggles write-behind mode, whereby `save` returns once the
+        store is marked as changed and a background thread writes
+        to file at most every interval, or sooner once threshold
+        saves have been made. Pending changes are written by
+        `flush`, when write-behind is stopped and at exit
+
+        Parameters
+        ----------
+        interval : float | None
+            seconds a change may wait before being written, None
+            stopping write-behind mode
+
+        threshold : int
+            number of saves after which a write is made at once
+
+        Example
+        -------
+            storage.write_behind(interval=0.05, threshold=500)
+            User().save()
+            storage.flush()
+        """
+
+        if self.__flusher:
+            flusher, self.__flusher = self.__flusher, None
+
+            with self.__flush_condition:
+                self.__flush_condition.notify()
+
+            flusher.join()
+
+        self.flush()
+
+        if not interval:
+            return
+
+        self.__flush_interval = interval
+        self.__flush_threshold = threshold
+        self.__flusher = threading.Thread(
+            target=self.__flush_behind__, name="storage-flusher", daemon=True
+        )
+        self.__flusher.start()
+
+        if not self.__flush_at_exit:
+            atexit.register(self.flush)
+            self.__flush_at_exit = True
+
+    async def __asave__(self):
+        """
+        Awaits the write underway, then writes on behalf of every
+        request coalesced into this one, forgetting the write on
+        every exit such that later requests are never left waiting
+        """
+
+        asyncio = import_module("asyncio")
+        current = asyncio.current_task()
+
+        try:
+            while self.__running_save:
+                try:
+                    await asyncio.shield(self.__running_save)
+                except Exception:
+                    pass
+
+            self.__queued_save, self.__running_save = None, current
+
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.save)
+        finally:
+            if self.__queued_save is current:
+                self.__queued_save = None
+
+            if self.__running_save is current:
+                self.__running_save = None
+
+        self.__metrics.increment("async_saves_total")
+
+    def __batch_depth__(self):
+        """Number of batches entered by the calling thread"""
+
+        return getattr(self.__batches, "depth", 0)
+
+    def __build_index__(self, name, index, persisted):
+        """
+        Builds an index from the cache, unless persisted alongside
+        the store as presently read, to be called under the mutex
+
+        Parameters
+        ----------
+        name : str
+            name of the index
+
+        index : Any
+            as described by `models.engine.indexes`
+
+        persisted : dict | None
+            as read by `__read_index__`
+        """
+
+        is_current = (
+            persisted is not None
+            and self.__signature
+            and tuple(persisted.get("signature", ())) == self.__signature
+            and not self.__changed
+            and not self.__deleted
+        )
+
+        if is_current:
+            with self.__metrics.timer(f"index_{name}_load"):
+                index.load(persisted.get("index", {}))
+
+            generation = persisted.get("generation")
+            self.__persisted_indexes[name] = (index.version, generation)
+            return
+
+        with self.__metrics.timer(f"index_{name}_build"):
+            index.build(self.__objects)
+
+    def __dump__(self, path, objects):
+        """
+        Writes models to a temporary file beside the store, then
+        replaces the store by it, such that a failed write, e.g.
+        of a full disk, leaves the store as it was
+
+        Parameters
+        ----------
+        path : Path
+            location of the JSON store
+
+        objects : dict
+            serialised models keyed by <model class name>.id
+        """
+
+        temporary = path.with_name(
+            f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+            f"{path.suffix}"
+        )
+
+        try:
+            with open_store(str(temporary), "w", self.__level) as file:
+                with self.__metrics.timer("json_dump"):
+                    json.dump(objects, file)
+
+            os.replace(temporary, path)
+        except BaseException:
+            temporary.unlink(missing_ok=True)
+            raise
+
+    def __dump_indexes__(self):
         """
+        Provides the built persistent indexes and their versions,
+        to be called under the mutex alongside the snapshot of the
+        cache, the indexes being serialised later without it
+
+        Return
+        ------
+        dict[str, tuple[Any, int]]
+            each index and its version, keyed by name
+        """
+
+        return {
+            name: (index, index.version)
+            for name, index in self.__indexes.items()
+            if index.persistent and index.built
+        }
 
+    def __flush_behind__(self):
+        """
+        Background loop of write-behind mode, writing changes
+        once they have waited an interval or reached the
+        threshold, until write-behind mode is stopped
+        """
+
+        flusher = threading.current_thread()
+
+        while self.__flusher is flusher:
+            with self.__flush_condition:
+                self.__flush_condition.wait_for(
+                    lambda: self.__dirty or self.__flusher is not flusher
+                )
+
+                deadline = monotonic() + self.__flush_interval
+
+                while self.__unflushed < self.__flush_threshold:
+                    remaining = deadline - monotonic()
+
+                    if remaining <= 0 or self.__flusher is not flusher:
+                        break
+
+                    self.__flush_condition.wait(remaining)
+
+            try:
+                self.flush()
+            except OSError:
+                self.__metrics.increment("flush_errors_total")
+
+    def __is_stale__(self, path):
+        """
+        Determines whether the file has changed since last read
+        or written, at the cost of a single `stat`
+
+        Parameter
+        ---------
+        path : Path
+            location of the JSON store
+        """
+
+        return self.__signature_of__(path) != self.__signature
+
+    def __load__(self):
+        """
+        Reads the file should a lazy reload be pending, not to be
+        called under the mutex, the file lock being taken after it.
+        Threads finding it pending read the file one at a time, such
+        that those after the first find it read rather than reading
+        it again over models added since
+        """
+
+        if not self.__pending:
+            return
+
+        with self.__load_lock:
+            if self.__pending:
+                self.reload()
+
+    def __merge__(self, path):
+        """
+        Brings into the cache models added, changed or deleted
+        on file since it was last read or written, while keeping
+        the models changed or deleted by this process
+
+        Parameter
+        ---------
+        path : Path
+            location of the JSON store
+
+        Return
+        ------
+        int
+            number of models added, changed or deleted
+        """
+
+        on_file = self.__read__(path, path.stat())
+        applied = 0
+
+        with self.__mutex:
+            objects = self.__writable__()
+            ours = self.__changed | self.__deleted
+
+            for key in [key for key in objects if key not in on_file]:
+                if key not in ours:
+                    self.__reindex__(key, objects.pop(key), None)
+                    applied += 1
+
+            for key, dict_ in on_file.items():
+                if key not in ours and objects.get(key) != dict_:
+                    self.__reindex__(key, objects.get(key), dict_)
+                    objects[key] = dict_
+                    applied += 1
+
+        self.__metrics.increment("merged_objects_total", applied)
+        return applied
+
+    def __read__(self, path, stat):
+        """
+        Deserialises the file, sharing values repeated between
+        models, and records its signature
+
+        Parameters
+        ----------
+        path : Path
+            location of the JSON store
+
+        stat : os.stat_result
+            status of the file, as read under lock
+
+        Return
+        ------
+        dict
+            serialised models keyed by <model class name>.id
+        """
+
+        self.__signature = self.__signature_of__(path, stat)
+
+        if not stat.st_size:
+            return {}
+
+        interner = Interner()
+
+        with open_store(self.__file_path, "r") as file:
+            with self.__metrics.timer("json_load"):
+                objects = json.load(file, object_hook=interner)
+
+        self.__metrics.increment("bytes_read_total", stat.st_size)
+        self.__metrics.increment("interned_values_total", len(interner))
+        return objects
+
+    def __read_index__(self, name):
+        """
+        Deserialises an index persisted alongside the store, should
+        it be current with the store as last read
+
+        Parameter
+        ---------
+        name : str
+            name of the index, read from `<file path>.<name>` and
+            `<file path>.<name>.signature`
+
+        Return
+        ------
+        dict | None
+            the index, its generation and the signature of the
+            store it is current with, else None if unreadable or
+            not current
+        """
+
+        path = f"{self.__file_path}.{name}"
+
+        try:
+            with open(f"{path}.signature", "r") as file:
+                current = json.load(file)
+
+            if tuple(current.get("signature", ())) != self.__signature:
+                return None
+
+            with open(path, "r") as file:
+                persisted = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if persisted.get("generation") != current.get("generation"):
+            return None
+
+        return {**persisted, "signature": current.get("signature")}
+
+    def __read_tombstones__(self):
+        """
+        Deserialises the tombstones written alongside the store,
+        under a shared lock
+
+        Return
+        ------
+        dict
+            time of each deletion keyed by <model class name>.id
+        """
+
+        try:
+            with self.__lock.shared():
+                with open(f"{self.__file_path}.tombstones", "r") as file:
+                    return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def __reindex__(self, key, previous, dict_):
+        """
+        Brings built indexes up to date with a model added,
+        changed or deleted, to be called under the mutex
+
+        Parameters
+        ----------
+        key : str
+            retrieval key of <model class name>.id
+
+        previous : dict | None
+            serialised model before the change, None if added
+
+        dict_ : dict | None
+            serialised model after the change, None if deleted
+        """
+
+        for index in self.__indexes.values():
+            if not index.built:
+                continue
+
+            if previous is not None:
+                index.discard(key, previous)
+
+            if dict_ is not None:
+                index.add(key, dict_)
+
+    def __requeue__(self, unflushed, changed, deleted, tombstones):
+        """
+        Marks the changes of a failed write as pending once more,
+        such that the next write, or flush, retries them
+
+        Parameters
+        ----------
+        unflushed : int
+            number of saves the write was made on behalf of
+
+        changed : set
+            keys of the models changed before the write
+
+        deleted : set
+            keys of the models deleted before the write
+
+        tombstones : dict
+            time of each deletion keyed by <model class name>.id
+        """
+
+        with self.__mutex:
+            self.__dirty = True
+            self.__unflushed += unflushed
+            self.__changed |= changed - self.__deleted
+            self.__deleted |= deleted - self.__changed
+            self.__tombstones = {
+                **{
+                    key: deleted_at
+                    for key, deleted_at in tombstones.items()
+                    if key not in self.__objects
+                },
+                **self.__tombstones,
+            }
+
+        self.__metrics.increment("failed_writes_total")
+
+    @staticmethod
+    def __signature_of__(path, stat=None):
+        """
+        Identifies the version of a file by its inode, size and
+        modification time, such that changes can be detected
+        without reading it
+
+        Parameters
+        ----------
+        path : Path
+            location of the file
+
+        stat : os.stat_result | None
+            status of the file, read anew if not provided
+
+        Return
+        ------
+        tuple
+            signature of the file, empty should it not exist
+        """
+
+        try:
+            stat = stat or path.stat()
+        except OSError:
+            return ()
+
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def __writable__(self):
+        """
+        Provides the cache to be changed, copied first should it
+        be shared with a snapshot, to be called under the mutex
+
+        Return
+        ------
+        dict
+            serialised models keyed by <model class name>.id
+        """
+
+        if self.__shared:
+            with self.__metrics.timer("snapshot_copy"):
+                self.__objects = dict(self.__objects)
+
+            self.__shared = False
+
+        return self.__objects
+
+    def __write__(self):
+        """Writes the cache to file, under an exclusive lock"""
+
+        self.__load__()
         path = Path(self.__file_path)
 
         if not path.is_file():
             path.touch()
 
-        with open(self.__file_path, "w") as file:
-            json.dump(self.__objects, file)
+        with self.__lock.exclusive():
+            if self.__is_stale__(path) and self.__signature is not None:
+                self.__merge__(path)
+                self.__metrics.increment("merges_total")
+
+            with self.__mutex:
+                objects = self.__objects
+                self.__shared = True
+                indexes = self.__dump_indexes__()
+                tombstones, self.__tombstones = self.__tombstones, {}
+                pending = (
+                    self.__unflushed, set(self.__changed),
+                    set(self.__deleted), tombstones,
+                )
+                self.__dirty = False
+                self.__unflushed = 0
+                self.__changed.clear()
+                self.__deleted.clear()
+
+            try:
+                self.__dump__(path, objects)
+
+                self.__signature = self.__signature_of__(path)
+                written = self.__signature[1] if self.__signature else 0
+
+                self.__write_indexes__(indexes)
+
+                if tombstones:
+                    self.__write_tombstones__(tombstones)
+            except BaseException:
+                self.__requeue__(*pending)
+                raise
+
+        self.__metrics.increment("saves_total")
+        self.__metrics.increment("bytes_written_total", written)
+        self.__metrics.increment("objects_serialised_total", len(objects))
+
+    def __write_index__(self, name, index, version):
+        """
+        Serialises an index without the mutex, writing it should it
+        not have changed since its version was taken, to be called
+        under the exclusive lock
+
+        Parameters
+        ----------
+        name : str
+            name of the index, written to `<file path>.<name>`
+
+        index : Any
+            as described by `models.engine.indexes`
+
+        version : int
+            version of the index as the cache was snapshot
+
+        Return
+        ------
+        str | None
+            generation of the index written, else None should it
+            have changed since
+        """
+
+        try:
+            with self.__metrics.timer(f"index_{name}_dump"):
+                text = json.dumps(index.to_dict())
+        except RuntimeError:
+            return None
+
+        with self.__mutex:
+            if index.version != version:
+                return None
+
+        generation = uuid.uuid4().hex
+        write_atomically(
+            f"{self.__file_path}.{name}",
+            f'{{"generation": "{generation}", "index": {text}}}',
+        )
+        self.__persisted_indexes[name] = (version, generation)
+
+        return generation
+
+    def __write_indexes__(self, indexes):
+        """
+        Persists built indexes alongside the store as written, to
+        be called under the exclusive lock. An index is serialised
+        only should it have changed since last persisted, whereas
+        the signature of the store it is current with is written
+        every time
+
+        Parameter
+        ---------
+        indexes : dict[str, tuple[Any, int]]
+            as provided by `__dump_indexes__`
+        """
+
+        signature = list(self.__signature)
+
+        for name, (index, version) in indexes.items():
+            persisted, generation = self.__persisted_indexes.get(
+                name, (None, None)
+            )
+
+            if persisted != version:
+                generation = self.__write_index__(name, index, version)
+
+            if generation is None:
+                continue
+
+            write_atomically(
+                f"{self.__file_path}.{name}.signature",
+                json.dumps({"generation": generation, "signature": signature}),
+            )
+
+    def __write_tombstones__(self, tombstones):
+        """
+        Adds tombstones to those written alongside the store, to be
+        called under the exclusive lock
+
+        Parameter
+        ---------
+        tombstones : dict
+            time of each deletion keyed by <model class name>.id
+        """
+
+        path = f"{self.__file_path}.tombstones"
+
+        try:
+            with open(path, "r") as file:
+                tombstones = {**json.load(file), **tombstones}
+        except (OSError, ValueError):
+            pass
+
+        write_atomically(path, json.dumps(tombstones))
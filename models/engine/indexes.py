@@ -0,0 +1,744 @@
+#!/usr/bin/python3
+"""
+Indexes: Definition, documentation and encapsulation of the
+secondary structures kept by storage alongside its models
+
+An index is built from all serialised models on first use and
+kept up to date by storage thereafter, through:
+    - build(objects): indexes every model
+    - add(key, dict_): indexes a model added or changed
+    - discard(key, dict_): forgets a model changed or deleted
+    - clear(): forgets all models, to be built anew on next use
+
+An index whose `persistent` attribute is true is furthermore
+written alongside the store, so as not to be built anew by the
+next process to use it, through:
+    - to_dict(): serialises the index
+    - load(dict_): restores the index as serialised
+    - version: number changed whenever the index is, such that
+      it is only written once changed
+"""
+from bisect import bisect_left, bisect_right
+from math import log
+import heapq
+import re
+
+
+class SortedList:
+    """
+    Set of values kept in ascending order within buckets of
+    bounded size, such that adding, removing and locating a
+    value costs O(log N) comparisons and moves within a single
+    bucket rather than the whole list
+
+    Example
+    -------
+        values = SortedList(["b", "a"])
+        values.add("c")
+        list(values.irange("a", inclusive=False))
+        ['b', 'c']
+    """
+
+    LOAD = 1000
+
+    def __init__(self, values=()):
+        """
+        Parameter
+        ---------
+        values : Iterable
+            initial values, duplicates being ignored
+        """
+
+        values = sorted(set(values))
+
+        self.__buckets = [
+            values[start:start + self.LOAD]
+            for start in range(0, len(values), self.LOAD)
+        ]
+        self.__maxes = [bucket[-1] for bucket in self.__buckets]
+        self.__length = len(values)
+
+    def add(self, value):
+        """Adds a value, unless already present"""
+
+        if not self.__buckets:
+            self.__buckets.append([value])
+            self.__maxes.append(value)
+            self.__length = 1
+            return
+
+        index = min(bisect_left(self.__maxes, value), len(self.__maxes) - 1)
+        bucket = self.__buckets[index]
+        position = bisect_left(bucket, value)
+
+        if position < len(bucket) and bucket[position] == value:
+            return
+
+        bucket.insert(position, value)
+        self.__maxes[index] = bucket[-1]
+        self.__length += 1
+
+        if len(bucket) > 2 * self.LOAD:
+            self.__buckets[index:index + 1] = [
+                bucket[:self.LOAD], bucket[self.LOAD:]
+            ]
+            self.__maxes[index:index + 1] = [bucket[self.LOAD - 1], bucket[-1]]
+
+    def discard(self, value):
+        """Removes a value, if present"""
+
+        index = bisect_left(self.__maxes, value)
+
+        if index == len(self.__maxes):
+            return
+
+        bucket = self.__buckets[index]
+        position = bisect_left(bucket, value)
+
+        if bucket[position] != value:
+            return
+
+        del bucket[position]
+        self.__length -= 1
+
+        if bucket:
+            self.__maxes[index] = bucket[-1]
+        else:
+            del self.__buckets[index]
+            del self.__maxes[index]
+
+    def irange(self, start=None, inclusive=True):
+        """
+        Iterates in ascending order over the values from a start
+
+        Parameters
+        ----------
+        start : Any | None
+            value from which to iterate, None being the first
+
+        inclusive : bool
+            whether a value equal to the start is included
+        """
+
+        if start is None:
+            index, position = 0, 0
+        else:
+            find = bisect_left if inclusive else bisect_right
+            index = find(self.__maxes, start)
+            position = None
+
+        for bucket in self.__buckets[index:]:
+            if position is None:
+                position = find(bucket, start)
+
+            yield from bucket[position:]
+            position = 0
+
+    def __contains__(self, value):
+        """Determines whether the value is present"""
+
+        index = bisect_left(self.__maxes, value)
+
+        if index == len(self.__maxes):
+            return False
+
+        bucket = self.__buckets[index]
+        return bucket[bisect_left(bucket, value)] == value
+
+    def __iter__(self):
+        """Iterates over all values in ascending order"""
+
+        return self.irange()
+
+    def __len__(self):
+        """Number of values"""
+
+        return self.__length
+
+
+class IdIndex:
+    """
+    Ids of the models of each class in ascending order, allowing
+    for keyset pagination in O(log N + page size)
+    """
+
+    persistent = False
+
+    def __init__(self):
+        """Prepares an index which is yet to be built"""
+
+        self.built = False
+        self.__ids = {}
+
+    def add(self, key, dict_):
+        """Indexes the model of the given key"""
+
+        model_name, _, instance_id = key.partition(".")
+        ids = self.__ids.setdefault(model_name, SortedList())
+        ids.add(instance_id)
+
+    def build(self, objects):
+        """
+        Indexes every model
+
+        Parameter
+        ---------
+        objects : dict
+            serialised models keyed by <model class name>.id
+        """
+
+        grouped = {}
+
+        for key in objects:
+            model_name, _, instance_id = key.partition(".")
+            grouped.setdefault(model_name, []).append(instance_id)
+
+        self.__ids = {name: SortedList(ids) for name, ids in grouped.items()}
+        self.built = True
+
+    def clear(self):
+        """Forgets all models, to be built anew on next use"""
+
+        self.__ids = {}
+        self.built = False
+
+    def complete(self, model_name, prefix, limit=None):
+        """
+        Provides, in ascending order, the ids of a class which
+        start with a given prefix, in O(log N + limit)
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        prefix : str
+            leading characters of the ids
+
+        limit : int | None
+            maximum number of ids, None being all
+
+        Return
+        ------
+        list[str]
+            ids starting with the prefix
+        """
+
+        ids = self.__ids.get(model_name)
+        matches = []
+
+        for instance_id in ids.irange(prefix) if ids else ():
+            if not instance_id.startswith(prefix):
+                break
+
+            if limit is not None and len(matches) >= limit:
+                break
+
+            matches.append(instance_id)
+
+        return matches
+
+    def count(self, model_name):
+        """Number of models of the given class"""
+
+        return len(self.__ids.get(model_name, ()))
+
+    def discard(self, key, dict_):
+        """Forgets the model of the given key"""
+
+        model_name, _, instance_id = key.partition(".")
+        ids = self.__ids.get(model_name)
+
+        if ids is not None:
+            ids.discard(instance_id)
+
+    def page(self, model_name, after=None, limit=None):
+        """
+        Provides, in ascending order, the ids of a class which
+        follow a given id
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        after : str | None
+            id after which the page starts, None being the start
+
+        limit : int | None
+            maximum number of ids, None being all
+
+        Return
+        ------
+        list[str]
+            ids of the page
+        """
+
+        ids = self.__ids.get(model_name)
+
+        if not ids:
+            return []
+
+        page = []
+
+        for instance_id in ids.irange(after, inclusive=after is None):
+            if limit is not None and len(page) >= limit:
+                break
+
+            page.append(instance_id)
+
+        return page
+
+
+class UpdatedIndex:
+    """
+    Keys of all models in ascending order of `updated_at`, such
+    that the models changed since a point in time are found in
+    O(log N + changes) rather than by visiting every model
+
+    Example
+    -------
+        index = UpdatedIndex()
+        index.build(storage.all())
+        index.since("2024-05-27T03:39:12")
+    """
+
+    persistent = False
+
+    def __init__(self):
+        """Prepares an index which is yet to be built"""
+
+        self.built = False
+        self.__updates = SortedList()
+
+    def add(self, key, dict_):
+        """Indexes the time the model of the given key was updated"""
+
+        updated_at = dict_.get("updated_at")
+
+        if isinstance(updated_at, str):
+            self.__updates.add((updated_at, key))
+
+    def build(self, objects):
+        """
+        Indexes the time every model was updated
+
+        Parameter
+        ---------
+        objects : dict
+            serialised models keyed by <model class name>.id
+        """
+
+        self.__updates = SortedList(
+            (dict_.get("updated_at"), key)
+            for key, dict_ in objects.items()
+            if isinstance(dict_.get("updated_at"), str)
+        )
+        self.built = True
+
+    def clear(self):
+        """Forgets all models, to be built anew on next use"""
+
+        self.__updates = SortedList()
+        self.built = False
+
+    def discard(self, key, dict_):
+        """Forgets the time the model of the given key was updated"""
+
+        updated_at = dict_.get("updated_at")
+
+        if isinstance(updated_at, str):
+            self.__updates.discard((updated_at, key))
+
+    def since(self, timestamp=None):
+        """
+        Provides the keys of the models updated after a point in
+        time, in ascending order of `updated_at`
+
+        Parameter
+        ---------
+        timestamp : str | None
+            ISO formatted time after which models were updated,
+            None being all models
+
+        Return
+        ------
+        list[str]
+            keys of <model class name>.id
+        """
+
+        start = None if timestamp is None else (timestamp,)
+
+        return [
+            key
+            for updated_at, key in self.__updates.irange(start)
+            if timestamp is None or updated_at > timestamp
+        ]
+
+
+class ValueIndex:
+    """
+    Ids of the models of each class keyed by the values of chosen
+    attributes, such that the models whose attribute equals a
+    value, e.g. the places of a city, are found in O(1) rather
+    than by visiting every model
+
+    Example
+    -------
+        index = ValueIndex({"Place": ("city_id",)})
+        index.build(storage.all())
+        index.lookup("Place", "city_id", "0c1f...")
+    """
+
+    persistent = False
+
+    def __init__(self, fields):
+        """
+        Parameter
+        ---------
+        fields : dict[str, Iterable[str]]
+            names of the attributes indexed, keyed by class name
+        """
+
+        self.fields = {name: tuple(attrs) for name, attrs in fields.items()}
+        self.built = False
+
+        self.__ids = {}
+
+    def add(self, key, dict_):
+        """Indexes the attribute values of the model of the given key"""
+
+        model_name, _, instance_id = key.partition(".")
+        values = self.__ids.setdefault(model_name, {})
+
+        for field, value in self.__values__(model_name, dict_):
+            ids = values.setdefault(field, {}).setdefault(value, set())
+            ids.add(instance_id)
+
+    def build(self, objects):
+        """
+        Indexes the attribute values of every model
+
+        Parameter
+        ---------
+        objects : dict
+            serialised models keyed by <model class name>.id
+        """
+
+        self.__ids = {}
+
+        for key, dict_ in objects.items():
+            self.add(key, dict_)
+
+        self.built = True
+
+    def clear(self):
+        """Forgets all models, to be built anew on next use"""
+
+        self.__ids = {}
+        self.built = False
+
+    def discard(self, key, dict_):
+        """Forgets the attribute values of the model of the given key"""
+
+        model_name, _, instance_id = key.partition(".")
+        values = self.__ids.get(model_name, {})
+
+        for field, value in self.__values__(model_name, dict_):
+            ids = values.get(field, {}).get(value)
+
+            if ids is None:
+                continue
+
+            ids.discard(instance_id)
+
+            if not ids:
+                del values[field][value]
+
+    def lookup(self, model_name, field, value):
+        """
+        Provides the ids of the models of a class whose attribute
+        equals the given value
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        field : str
+            name of the attribute
+
+        value : Any
+            value of the attribute
+
+        Return
+        ------
+        set[str] | None
+            ids of the matching models, else None should the
+            attribute or the value not be indexed
+        """
+
+        is_indexed = field in self.fields.get(model_name, ())
+
+        if not is_indexed or not self.__is_indexable__(value):
+            return None
+
+        ids = self.__ids.get(model_name, {}).get(field, {}).get(value)
+        return set(ids or ())
+
+    @staticmethod
+    def __is_indexable__(value):
+        """Whether a value is indexed, it being neither None nor mutable"""
+
+        hashable = getattr(value, "__hash__", None) is not None
+        return value is not None and hashable
+
+    def __values__(self, model_name, dict_):
+        """
+        Pairs of indexed attribute and value of a serialised
+        model, values which are not indexable being left out
+        """
+
+        for field in self.fields.get(model_name, ()):
+            value = dict_.get(field)
+
+            if self.__is_indexable__(value):
+                yield field, value
+
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenise(text):
+    """
+    Splits text into lowercase terms of word characters
+
+    Example
+    -------
+        tokenise("Cosy loft, near the Tate!")
+        ['cosy', 'loft', 'near', 'the', 'tate']
+    """
+
+    return TOKEN_PATTERN.findall(str(text).lower())
+
+
+class TextIndex:
+    """
+    Inverted index of the terms of chosen text attributes, per
+    class, whereby each term maps the ids of the models in which
+    it occurs to its frequency therein, such that a search only
+    visits the models sharing a term with the query. Results are
+    ranked by Okapi BM25
+
+    Example
+    -------
+        index = TextIndex({"Review": ("text",)})
+        index.build(storage.all())
+        index.search("Review", "quiet garden", 10)
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    persistent = True
+
+    def __init__(self, fields):
+        """
+        Parameter
+        ---------
+        fields : dict[str, Iterable[str]]
+            names of the attributes indexed, keyed by class name
+        """
+
+        self.fields = {name: tuple(attrs) for name, attrs in fields.items()}
+        self.built = False
+        self.version = 0
+
+        self.__postings = {}
+        self.__lengths = {}
+        self.__totals = {}
+
+    def add(self, key, dict_):
+        """Indexes the text of the model of the given key"""
+
+        model_name, _, instance_id = key.partition(".")
+        terms = self.__terms__(model_name, dict_)
+
+        if terms is None:
+            return
+
+        self.version += 1
+        postings = self.__postings.setdefault(model_name, {})
+
+        for term in terms:
+            occurrences = postings.setdefault(term, {})
+            occurrences[instance_id] = occurrences.get(instance_id, 0) + 1
+
+        total = self.__totals.get(model_name, 0)
+
+        self.__lengths.setdefault(model_name, {})[instance_id] = len(terms)
+        self.__totals[model_name] = total + len(terms)
+
+    def build(self, objects):
+        """
+        Indexes the text of every model
+
+        Parameter
+        ---------
+        objects : dict
+            serialised models keyed by <model class name>.id
+        """
+
+        self.__postings, self.__lengths, self.__totals = {}, {}, {}
+        self.version += 1
+
+        for key, dict_ in objects.items():
+            self.add(key, dict_)
+
+        self.built = True
+
+    def clear(self):
+        """Forgets all models, to be built anew on next use"""
+
+        self.__postings, self.__lengths, self.__totals = {}, {}, {}
+        self.version += 1
+        self.built = False
+
+    def discard(self, key, dict_):
+        """Forgets the text of the model of the given key"""
+
+        model_name, _, instance_id = key.partition(".")
+        lengths = self.__lengths.get(model_name, {})
+
+        if instance_id not in lengths:
+            return
+
+        self.version += 1
+        postings = self.__postings.get(model_name)
+
+        for term in set(self.__terms__(model_name, dict_) or ()):
+            occurrences = postings.get(term, {})
+            occurrences.pop(instance_id, None)
+
+            if not occurrences:
+                postings.pop(term, None)
+
+        self.__totals[model_name] -= lengths.pop(instance_id)
+
+    def load(self, dict_):
+        """
+        Restores the index as serialised by `to_dict`
+
+        Parameter
+        ---------
+        dict_ : dict
+            postings and lengths keyed by class name
+        """
+
+        self.__postings = {
+            name: serialised.get("postings", {})
+            for name, serialised in dict_.items()
+        }
+        self.__lengths = {
+            name: serialised.get("lengths", {})
+            for name, serialised in dict_.items()
+        }
+        self.__totals = {
+            name: sum(lengths.values())
+            for name, lengths in self.__lengths.items()
+        }
+
+        self.version += 1
+        self.built = True
+
+    def search(self, model_name, terms, limit=10):
+        """
+        Ranks the models of a class by relevance to the terms
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model's class
+
+        terms : str
+            text of the query
+
+        limit : int | None
+            maximum number of results, None being all
+
+        Return
+        ------
+        list[tuple[str, float]]
+            ids paired with their score, most relevant first
+        """
+
+        lengths = self.__lengths.get(model_name)
+
+        if not lengths:
+            return []
+
+        postings = self.__postings.get(model_name, {})
+        count = len(lengths)
+        average = self.__totals.get(model_name, 0) / count or 1
+
+        """length normalisation K1 * (1 - B + B * length / average)"""
+        constant = self.K1 * (1 - self.B)
+        slope = self.K1 * self.B / average
+
+        scores = {}
+        score_of = scores.get
+
+        for term in set(tokenise(terms)):
+            occurrences = postings.get(term)
+
+            if not occurrences:
+                continue
+
+            frequency = len(occurrences)
+            idf = log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            weight = idf * (self.K1 + 1)
+
+            for instance_id, occurrence in occurrences.items():
+                norm = occurrence + constant + slope * lengths[instance_id]
+                scores[instance_id] = (
+                    score_of(instance_id, 0) + weight * occurrence / norm
+                )
+
+        ranked = (
+            (score, instance_id) for instance_id, score in scores.items()
+        )
+
+        if limit is None:
+            ranked = sorted(ranked, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, ranked)
+
+        return [(instance_id, score) for score, instance_id in ranked]
+
+    def to_dict(self):
+        """Returns serialised representation of the index"""
+
+        return {
+            name: {
+                "postings": self.__postings.get(name, {}),
+                "lengths": lengths,
+            }
+            for name, lengths in self.__lengths.items()
+        }
+
+    def __terms__(self, model_name, dict_):
+        """
+        Terms of the indexed attributes of a serialised model,
+        None if its class is not indexed
+        """
+
+        fields = self.fields.get(model_name)
+
+        if not fields:
+            return None
+
+        return [
+            term
+            for field in fields
+            for term in tokenise(dict_.get(field) or "")
+        ]
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Interning Module: Definition, documentation and encapsulation of
+the dictionary encoding of models as they are deserialised, such
+that the strings and small lists repeated across a store, e.g.
+`__class__` names, foreign keys and `amenity_ids`, are held once
+in memory rather than once per model
+"""
+
+
+class Interner:
+    """
+    Hook by which JSON objects are deserialised, replacing each
+    short string value, and each small list of short strings, by
+    the first equal one met while reading, e.g. the `city_id` of
+    every place in a city then being one string
+
+    Lists are shared between models, such that models copy those
+    they are spawned with rather than changing them in place
+
+    Example
+    -------
+        objects = json.load(file, object_hook=Interner())
+    """
+
+    """longest string shared, ids and timestamps being shorter"""
+    LENGTH = 64
+
+    """longest list shared"""
+    SIZE = 16
+
+    def __init__(self):
+        """Prepares empty tables of strings and lists met"""
+
+        self.__strings = {}
+        self.__lists = {}
+
+    def __call__(self, dict_):
+        """
+        Interns the values of a deserialised JSON object in place
+
+        Parameters
+        ----------
+        dict_ : dict
+            JSON object as decoded
+
+        Return
+        ------
+        dict
+            the same object, its repeated values shared
+        """
+
+        strings = self.__strings
+
+        for key, value in dict_.items():
+            if type(value) is str:
+                if len(value) <= self.LENGTH:
+                    dict_[key] = strings.setdefault(value, value)
+            elif type(value) is list and len(value) <= self.SIZE:
+                dict_[key] = self.__list__(value)
+
+        return dict_
+
+    def __len__(self):
+        """Number of distinct strings and lists met"""
+
+        return len(self.__strings) + len(self.__lists)
+
+    def __list__(self, value):
+        """
+        Provides the first list equal to the one given, should it
+        be only of short strings, else the list given
+
+        Parameters
+        ----------
+        value : list
+            list as decoded
+
+        Return
+        ------
+        list
+            shared list, or the one given
+        """
+
+        strings = self.__strings
+
+        for item in value:
+            if type(item) is not str or len(item) > self.LENGTH:
+                return value
+
+        items = tuple(strings.setdefault(item, item) for item in value)
+        return self.__lists.setdefault(items, list(items))
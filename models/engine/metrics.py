@@ -0,0 +1,330 @@
+#!/usr/bin/python3
+"""
+Metrics Module: Definition, documentation and encapsulation
+of the instruments used to measure the system's performance
+"""
+from contextlib import contextmanager
+from time import perf_counter
+from pathlib import Path
+import threading
+import os
+
+
+class Histogram:
+    """
+    Log-linear histogram in the manner of HdrHistogram, whereby
+    values are counted into buckets whose width grows with the
+    magnitude of the value, bounding the relative error of any
+    reported percentile while using little memory
+
+    Example
+    -------
+        histogram = Histogram()
+        histogram.record(125)
+        histogram.percentile(99)
+    """
+
+    def __init__(self, precision=7):
+        """
+        Prepares an empty histogram
+
+        Parameter
+        ---------
+        precision : int
+            number of significant bits kept per value, whereby
+            the relative error is at most 1 / 2 ** (precision - 1)
+        """
+
+        self.precision = precision
+        self.buckets = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value):
+        """
+        Counts a non-negative integer value into its bucket
+
+        Parameter
+        ---------
+        value : int
+            measurement, e.g. latency in microseconds
+        """
+
+        value = max(int(value), 0)
+        lowest = self.__lowest_equivalent__(value)
+
+        self.buckets[lowest] = self.buckets.get(lowest, 0) + 1
+        self.min = value if not self.count else min(self.min, value)
+        self.max = max(self.max, value)
+        self.total += value
+        self.count += 1
+
+    def percentile(self, percent):
+        """
+        Provides the value below which the given percentage of
+        recorded values fall
+
+        Parameter
+        ---------
+        percent : float
+            percentage within the range [0, 100]
+
+        Return
+        ------
+        int
+            highest value equivalent to the bucket in which the
+            percentile falls, capped at the maximum recorded
+        """
+
+        if not self.count:
+            return 0
+
+        target = max(self.count * percent / 100, 1)
+        seen = 0
+
+        for lowest in sorted(self.buckets):
+            seen += self.buckets[lowest]
+
+            if seen >= target:
+                return min(self.__highest_equivalent__(lowest), self.max)
+
+        return self.max
+
+    def mean(self):
+        """Provides the mean of recorded values"""
+
+        return self.total / self.count if self.count else 0
+
+    def to_dict(self):
+        """Returns serialised representation of the histogram"""
+
+        return {
+            "precision": self.precision,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, dict_):
+        """
+        Spawns a histogram from its serialised representation
+
+        Parameter
+        ---------
+        dict_ : dict
+            as provided by `to_dict`
+        """
+
+        histogram = cls(dict_.get("precision", 7))
+        histogram.count = dict_.get("count", 0)
+        histogram.total = dict_.get("total", 0)
+        histogram.min = dict_.get("min", 0)
+        histogram.max = dict_.get("max", 0)
+        histogram.buckets = {
+            int(key): value for key, value in dict_.get("buckets", {}).items()
+        }
+
+        return histogram
+
+    def __shift__(self, value):
+        """Number of insignificant bits of the value"""
+
+        return max(value.bit_length() - self.precision, 0)
+
+    def __lowest_equivalent__(self, value):
+        """Lower bound of the bucket in which the value falls"""
+
+        shift = self.__shift__(value)
+        return (value >> shift) << shift
+
+    def __highest_equivalent__(self, lowest):
+        """Upper bound of the bucket starting at the given value"""
+
+        return lowest + (1 << self.__shift__(lowest)) - 1
+
+
+class Metrics:
+    """
+    Registry of named counters and timers, whereby timers
+    accumulate seconds under `<name>_seconds` alongside a count
+    of their measurements under `<name>_count`
+
+    Example
+    -------
+        metrics = Metrics()
+        metrics.increment("saves")
+
+        with metrics.timer("json_dump"):
+            json.dump(objects, file)
+    """
+
+    def __init__(self):
+        """Prepares an empty registry"""
+
+        self.counters = {}
+        self.__lock = threading.Lock()
+
+    def increment(self, name, amount=1):
+        """
+        Adds to a counter, creating it should it not exist
+
+        Parameters
+        ----------
+        name : str
+            name of the counter
+
+        amount : int | float
+            value added to the counter
+        """
+
+        with self.__lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Measures the wall time of the enclosed block
+
+        Parameter
+        ---------
+        name : str
+            name of the timer
+        """
+
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            self.increment(f"{name}_seconds", perf_counter() - start)
+            self.increment(f"{name}_count")
+
+    def get(self, name):
+        """Provides the value of a counter, zero if not present"""
+
+        return self.counters.get(name, 0)
+
+    def snapshot(self):
+        """Provides a copy of all counters"""
+
+        with self.__lock:
+            return dict(self.counters)
+
+    def reset(self):
+        """Clears all counters"""
+
+        with self.__lock:
+            self.counters.clear()
+
+
+def to_prometheus(values, prefix):
+    """
+    Renders values in the Prometheus text exposition format,
+    whereby names ending in `_total`, `_seconds` or `_count`
+    are typed as counters and all others as gauges
+
+    Parameters
+    ----------
+    values : dict
+        name-to-value pairings
+
+    prefix : str
+        prepended to each metric name, e.g. `airbnb_storage`
+
+    Return
+    ------
+    str
+        text ready to be scraped
+    """
+
+    lines = []
+    counter_suffixes = ("_total", "_seconds", "_count")
+
+    for name, value in sorted(values.items()):
+        metric = f"{prefix}_{name}"
+        kind = "counter" if name.endswith(counter_suffixes) else "gauge"
+
+        lines.append(f"# TYPE {metric} {kind}")
+        lines.append(f"{metric} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def write_atomically(path, text):
+    """
+    Writes text to a file such that readers never observe a
+    partial write, as expected of e.g. Prometheus textfiles
+
+    Parameters
+    ----------
+    path : str
+        file to be written
+
+    text : str
+        contents of the file
+    """
+
+    temporary = Path(f"{path}.{os.getpid()}.tmp")
+    temporary.write_text(text)
+    os.replace(temporary, path)
+
+
+class Exporter(threading.Thread):
+    """
+    Daemon thread periodically writing rendered metrics to file,
+    stopping once `stop` is called or the interpreter exits. A
+    write which fails, e.g. as the directory was removed, is
+    counted under `metrics_export_failures_total` and retried
+    the next interval rather than ending the thread
+    """
+
+    def __init__(self, render, path, interval, metrics=None):
+        """
+        Parameters
+        ----------
+        render : Callable[[], str]
+            provides the text to be written
+
+        path : str
+            file to be written
+
+        interval : float
+            seconds between writes
+
+        metrics : Metrics | None
+            registry into which failed writes are counted
+        """
+
+        super().__init__(name="metrics-exporter", daemon=True)
+
+        self.render = render
+        self.path = path
+        self.interval = interval
+        self.metrics = metrics
+        self.__stopped = threading.Event()
+
+    def run(self):
+        """Writes metrics every interval until stopped"""
+
+        while not self.__stopped.wait(self.interval):
+            self.__write__()
+
+    def stop(self):
+        """Stops the exporter, writing metrics one last time"""
+
+        self.__stopped.set()
+        self.__write__()
+
+    def __write__(self):
+        """Writes metrics, counting rather than raising a failure"""
+
+        try:
+            write_atomically(self.path, self.render())
+        except OSError:
+            if self.metrics:
+                self.metrics.increment("metrics_export_failures_total")
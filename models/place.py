@@ -15,28 +15,19 @@ class Place(models.BaseModel):
     attributes and methods for the Place class
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initialises attributes to empty strings if not kwargs
-        provided, else passes initialisation on to the the
-        parent
-        """
-
-        self.city_id = ""
-        self.user_id = ""
-
-        self.name = ""
-        self.description = ""
-
-        self.number_rooms = 0
-        self.number_bathrooms = 0
-
-        self.max_guest = 0
-        self.price_by_night = 0
-
-        self.latitude = 0.0
-        self.longitude = 0.0
-
-        self.amenity_ids = []
-
-        super().__init__(*args, **kwargs)
+    __INDEXED__ = ("city_id", "user_id")
+    __SEARCHABLE__ = ("name", "description")
+
+    __FIELDS__ = (
+        models.Field("city_id", str),
+        models.Field("user_id", str),
+        models.Field("name", str),
+        models.Field("description", str),
+        models.Field("number_rooms", int),
+        models.Field("number_bathrooms", int),
+        models.Field("max_guest", int),
+        models.Field("price_by_night", int),
+        models.Field("latitude", float),
+        models.Field("longitude", float),
+        models.Field("amenity_ids", list),
+    )
@@ -15,14 +15,11 @@ class Review(models.BaseModel):
     attributes and methods for the Review class
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initialises attributes to empty strings if not kwargs
-        provided, else passes initialisation on to the the
-        parent
-        """
+    __INDEXED__ = ("place_id", "user_id")
+    __SEARCHABLE__ = ("text",)
 
-        self.place_id = ""
-        self.user_id = ""
-        self.text = ""
-        super().__init__(*args, **kwargs)
+    __FIELDS__ = (
+        models.Field("place_id", str),
+        models.Field("user_id", str),
+        models.Field("text", str),
+    )
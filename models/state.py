@@ -15,12 +15,4 @@ class State(models.BaseModel):
     attributes and methods for the State class
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initialises attributes to empty strings if not kwargs
-        provided, else passes initialisation on to the the
-        parent
-        """
-
-        self.name = ""
-        super().__init__(*args, **kwargs)
+    __FIELDS__ = (models.Field("name", str),)
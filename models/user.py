@@ -15,13 +15,9 @@ class User(models.BaseModel):
     attributes and methods for the User class
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Initialises attributes to empty strings if not kwargs
-        provided, else passes initialisation on to the the
-        parent
-        """
-
-        self.first_name = self.last_name = ""
-        self.email = self.password = ""
-        super().__init__(*args, **kwargs)
+    __FIELDS__ = (
+        models.Field("first_name", str),
+        models.Field("last_name", str),
+        models.Field("email", str),
+        models.Field("password", str),
+    )
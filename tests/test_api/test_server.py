@@ -0,0 +1,237 @@
+#!/usr/bin/python3
+"""Test suite regarding the HTTP JSON API over storage"""
+from unittest.mock import patch
+from importlib import import_module
+from email.utils import formatdate
+import http.client
+import threading
+import tempfile
+import unittest
+import socket
+import json
+import time
+
+
+models = import_module("models")
+server = import_module("api.server")
+
+
+class TestServer(unittest.TestCase):
+    """Serves a temporary store for the duration of each test"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = models.FileStorage(f"{self.directory.name}/file.json")
+
+        patcher = patch.object(models, "storage", self.storage)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.place = models.Place()
+        self.place.name = "Den of Dreams"
+        self.place.save()
+
+        self.server = server.APIServer(("127.0.0.1", 0), workers=2)
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,)
+        )
+        self.thread.start()
+
+        host, port = self.server.server_address
+        self.connection = http.client.HTTPConnection(host, port, timeout=5)
+
+    def tearDown(self):
+        """Stops the server and removes the temporary store"""
+
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join(5)
+        self.directory.cleanup()
+
+    def get(self, path, **headers):
+        """Requests a path, providing the response and its body"""
+
+        self.connection.request("GET", path, headers=headers)
+        response = self.connection.getresponse()
+
+        return response, response.read()
+
+
+class TestRoutes(TestServer):
+    """Ensure models are served as JSON"""
+
+    def test_get_instance(self):
+        """Ensure an instance is served by its id"""
+
+        response, body = self.get(f"/api/Place/{self.place.id}")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(
+            response.getheader("Content-Type"), "application/json"
+        )
+        self.assertEqual(json.loads(body), self.place.to_dict())
+
+    def test_get_instances(self):
+        """Ensure all instances of a model are served"""
+
+        models.City().save()
+        response, body = self.get("/api/Place")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(json.loads(body), [self.place.to_dict()])
+
+    def test_not_found(self):
+        """Ensure unknown routes, models and ids are not found"""
+
+        for path in ["/", "/api/Unknown", "/api/BaseModel", "/api/Place/x"]:
+            response, body = self.get(path)
+            self.assertEqual(response.status, 404)
+            self.assertIn("error", json.loads(body))
+
+    def test_connection_kept_alive(self):
+        """Ensure many requests are served over one connection"""
+
+        for _ in range(3):
+            response, _ = self.get(f"/api/Place/{self.place.id}")
+            self.assertEqual(response.status, 200)
+
+        self.assertEqual(response.version, 11)
+        self.assertIsNone(response.getheader("Connection"))
+
+
+class TestConnections(TestServer):
+    """Ensure idle kept-alive connections hold no worker"""
+
+    def connect(self):
+        """Provides a new connection to the server"""
+
+        host, port = self.server.server_address
+        connection = http.client.HTTPConnection(host, port, timeout=5)
+        self.addCleanup(connection.close)
+
+        return connection
+
+    def test_more_clients_than_workers(self):
+        """Ensure idle clients do not keep others waiting"""
+
+        idle = [self.connect() for _ in range(4)]
+        path = f"/api/Place/{self.place.id}"
+
+        for connection in idle:
+            connection.request("GET", path)
+            connection.getresponse().read()
+
+        start = time.monotonic()
+        response, _ = self.get(path)
+
+        self.assertEqual(response.status, 200)
+        self.assertLess(time.monotonic() - start, 1)
+
+        for connection in idle:
+            connection.request("GET", path)
+            self.assertEqual(connection.getresponse().status, 200)
+
+    def test_pipelined_requests(self):
+        """Ensure requests sent at once are all answered"""
+
+        request = f"GET /api/Place/{self.place.id} HTTP/1.1\r\n\r\n"
+
+        with socket.create_connection(self.server.server_address, 5) as sock:
+            sock.sendall(request.encode() * 2)
+            received = b""
+
+            while received.count(b"HTTP/1.1 200") < 2:
+                chunk = sock.recv(4096)
+                self.assertTrue(chunk)
+                received += chunk
+
+    def test_idle_connection_closed(self):
+        """Ensure connections idle past the timeout are closed"""
+
+        request = f"GET /api/Place/{self.place.id} HTTP/1.1\r\n\r\n"
+
+        with patch.object(server.APIHandler, "timeout", 0.1):
+            with socket.create_connection(
+                self.server.server_address, 5
+            ) as sock:
+                sock.sendall(request.encode())
+                response = http.client.HTTPResponse(sock)
+                response.begin()
+                response.read()
+
+                time.sleep(self.server.POLL + 0.3)
+                self.assertEqual(sock.recv(1), b"")
+
+
+class TestConditionalGet(TestServer):
+    """Ensure unchanged resources are revalidated cheaply"""
+
+    def test_validators_sent(self):
+        """Ensure responses carry an ETag and Last-Modified"""
+
+        response, _ = self.get(f"/api/Place/{self.place.id}")
+
+        self.assertTrue(response.getheader("ETag").startswith('"'))
+        self.assertTrue(response.getheader("Last-Modified").endswith("GMT"))
+
+    def test_if_none_match(self):
+        """Ensure a matching ETag is answered without a body"""
+
+        for path in ["/api/Place", f"/api/Place/{self.place.id}"]:
+            response, _ = self.get(path)
+            etag = response.getheader("ETag")
+
+            response, body = self.get(path, **{"If-None-Match": etag})
+
+            self.assertEqual(response.status, 304)
+            self.assertEqual(body, b"")
+            self.assertEqual(response.getheader("ETag"), etag)
+
+    def test_if_none_match_after_change(self):
+        """Ensure changed listings are served anew"""
+
+        response, _ = self.get("/api/Place")
+        etag = response.getheader("ETag")
+
+        models.Place().save()
+        response, body = self.get("/api/Place", **{"If-None-Match": etag})
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(json.loads(body)), 2)
+        self.assertNotEqual(response.getheader("ETag"), etag)
+
+    def test_if_modified_since(self):
+        """Ensure instances unmodified since a time are not sent"""
+
+        path = f"/api/Place/{self.place.id}"
+        response, _ = self.get(path)
+        last_modified = response.getheader("Last-Modified")
+
+        response, _ = self.get(path, **{"If-Modified-Since": last_modified})
+        self.assertEqual(response.status, 304)
+
+        epoch = formatdate(0, usegmt=True)
+        response, _ = self.get(path, **{"If-Modified-Since": epoch})
+        self.assertEqual(response.status, 200)
+
+    def test_listing_ignores_if_modified_since(self):
+        """Ensure a listing shortened by a deletion is served anew"""
+
+        models.Place().save()
+        response, _ = self.get("/api/Place")
+
+        self.assertIsNone(response.getheader("Last-Modified"))
+
+        self.place.destroy(self.place.id)
+        since = formatdate(usegmt=True)
+        response, body = self.get("/api/Place", **{"If-Modified-Since": since})
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(json.loads(body)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
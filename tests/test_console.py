@@ -1,9 +1,14 @@
 #!/usr/bin/python3
 """Tests for the products console"""
 from unittest.mock import MagicMock, patch
+from contextlib import redirect_stdout
 from datetime import datetime, timedelta
 from importlib import import_module
+from io import StringIO
+import tempfile
 import unittest
+import pstats
+import json
 import uuid
 
 
@@ -30,6 +35,14 @@ class TestConsole(unittest.TestCase):
             return_value={self.user.super_id: self.user.to_dict()}
         )
 
+    def store_new_models(self):
+        """Has the mocked `storage.new` track models in `storage.all`"""
+
+        stored = models.storage.all()
+        models.storage.new.side_effect = lambda model: stored.update(
+            {model.super_id: model.to_dict()}
+        )
+
     def test_quit(self):
         """Ensures that the user can exit the console"""
 
@@ -37,6 +50,21 @@ class TestConsole(unittest.TestCase):
         self.assertTrue(console.Console().onecmd("quit"))
 
 
+class TestPrecmd(TestConsole):
+    """Tests cases for the `precmd` method"""
+
+    def test_commands_refresh_storage(self):
+        """Ensures that storage is refreshed before each command"""
+
+        shell = console.Console()
+
+        with patch.object(models.storage, "refresh") as mock_refresh:
+            shell.precmd("all User")
+            shell.precmd("")
+
+        mock_refresh.assert_called_once_with()
+
+
 class TestDefault(TestConsole):
     """Tests cases for the `default` method"""
 
@@ -45,7 +73,9 @@ class TestDefault(TestConsole):
         """Ensure that BaseModel is inaccessible via repl"""
 
         console.Console().default("BaseModel.all()")
-        mock_print.assert_called_once_with("** unknown syntax: BaseModel.all() **")
+        mock_print.assert_called_once_with(
+            "** unknown syntax: BaseModel.all() **"
+        )
 
     @patch("builtins.print")
     def test_default_with_valid_model(self, mock_print):
@@ -61,6 +91,64 @@ class TestDefault(TestConsole):
         console.Console().default("Jibberish")
         mock_print.assert_called_once_with("** unknown syntax: Jibberish **")
 
+    @patch("builtins.print")
+    def test_default_does_not_execute_code(self, mock_print):
+        """Ensures that only model methods with literals are called"""
+
+        lines = [
+            "__import__('os').getcwd()",
+            "User.all(); print('executed')",
+            "User.show(__import__('os').getcwd())",
+            "User.show(*['id'])",
+            "User.save()",
+        ]
+
+        for line in lines:
+            console.Console().default(line)
+            mock_print.assert_called_with(f"** unknown syntax: {line} **")
+
+        self.assertEqual(mock_print.call_count, len(lines))
+
+    @patch("builtins.print")
+    def test_default_with_bare_name_argument(self, mock_print):
+        """Ensures that bare names are read as strings"""
+
+        self.store_new_models()
+
+        line = f'User.update("{self.user.id}", first_name, "Anna")'
+        console.Console().default(line)
+
+        stored = models.storage.all().get(self.user.super_id)
+        self.assertEqual(stored.get("first_name"), "Anna")
+        mock_print.assert_not_called()
+
+    @patch("builtins.print")
+    def test_default_with_dict_update(self, mock_print):
+        """Ensures that dictionary updates are saved in one write"""
+
+        self.store_new_models()
+
+        line = (
+            f'User.update("{self.user.id}", '
+            '{"first_name": "Anna", "age": 33})'
+        )
+        console.Console().default(line)
+
+        stored = models.storage.all().get(self.user.super_id)
+
+        self.assertEqual(stored.get("first_name"), "Anna")
+        self.assertEqual(stored.get("age"), 33)
+        self.user.save.assert_called_once()
+        mock_print.assert_not_called()
+
+    @patch("builtins.print")
+    def test_default_caches_resolved_commands(self, mock_print):
+        """Ensures that model methods are resolved once"""
+
+        console.Console().default("User.count()")
+        self.assertIn(("User", "count"), console.Console.__commands__)
+        self.assertNotIn(("User", "save"), console.Console.__commands__)
+
 
 class TestAll(TestConsole):
     """Tests cases for the `do_all` method"""
@@ -106,6 +194,56 @@ class TestAll(TestConsole):
         console.Console().do_all("invalid")
         mock_print.assert_called_once_with("** model doesn't exist **")
 
+    @patch("builtins.print")
+    def test_all_paged(self, mock_print):
+        """Ensures that pages follow one another in order of id"""
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        storage = models.FileStorage(f"{directory.name}/file.json")
+
+        for instance_id in ["c", "a", "d", "b"]:
+            storage.new(models.User(id=instance_id))
+
+        with patch.object(models, "storage", storage):
+            console.Console().onecmd("all User --limit 3")
+            console.Console().onecmd("all User --after c --limit 3")
+            console.Console().onecmd("User.page('b', 1)")
+
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        expect = ["User.a\nUser.b\nUser.c", "User.d", "User.c"]
+
+        self.assertEqual(printed, expect)
+
+    @patch("builtins.print")
+    def test_all_paged_defaults(self, mock_print):
+        """Ensures that a page starts at the first id by default"""
+
+        with patch.object(models.storage, "page", return_value=[]) as page:
+            console.Console().do_all("Place --after 1234")
+            console.Console().do_all("Place --limit 5")
+
+        page.assert_any_call("Place", "1234", 100)
+        page.assert_any_call("Place", None, 5)
+        mock_print.assert_not_called()
+
+    @patch("builtins.print")
+    def test_all_paged_with_invalid_options(self, mock_print):
+        """Ensures that user is informed of invalid paging"""
+
+        usage = "** usage: all <model> [--limit <count>] [--after <id>] **"
+
+        for line in [
+            "User --limit",
+            "User --limit many",
+            "User --limit 0",
+            "User --offset 5",
+        ]:
+            mock_print.reset_mock()
+            console.Console().do_all(line)
+            mock_print.assert_called_once_with(usage)
+
 
 class TestCreate(TestConsole):
     """Tests cases for the `do_create` method"""
@@ -218,6 +356,145 @@ class TestDestroy(TestConsole):
         models.storage.save.assert_not_called()
 
 
+class TestSearch(TestConsole):
+    """Tests cases for the `do_search` method"""
+
+    def setUp(self):
+        """Test instance factory, with reviews stored on file"""
+
+        super().setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.storage = models.FileStorage(f"{directory.name}/file.json")
+        self.storage.add_index("search", models.TextIndex(models.SEARCHABLE))
+
+        with patch.object(models, "storage", self.storage):
+            self.quiet = models.Review(id="quiet", text="Quiet garden")
+            self.noisy = models.Review(id="noisy", text="Noisy street")
+
+    @patch("builtins.print")
+    def test_search_ranks_results(self, mock_print):
+        """Ensures that matching reviews are printed by relevance"""
+
+        with patch.object(models, "storage", self.storage):
+            console.Console().onecmd('search Review "quiet street"')
+            console.Console().onecmd("Review.search('garden')")
+
+        ranked, matched = [call.args[0] for call in mock_print.call_args_list]
+        ranked = [line.split()[0] for line in ranked.splitlines()]
+
+        self.assertEqual(ranked, ["Review.quiet", "Review.noisy"])
+        self.assertTrue(matched.startswith("Review.quiet "))
+
+    @patch("builtins.print")
+    def test_search_with_limit(self, mock_print):
+        """Ensures that no more results than the limit are printed"""
+
+        with patch.object(models, "storage", self.storage):
+            console.Console().onecmd("search Review quiet street --limit 1")
+
+        mock_print.assert_called_once()
+        self.assertEqual(len(mock_print.call_args[0][0].splitlines()), 1)
+
+    @patch("builtins.print")
+    def test_search_informs_user(self, mock_print):
+        """Ensures that the user is informed of invalid searches"""
+
+        usage = "** usage: search <model> <terms> [--limit <count>] **"
+
+        for line, message in [
+            ("", "** model name missing **"),
+            ("BaseModel garden", "** model doesn't exist **"),
+            ("User anna", "** model not searchable **"),
+            ("Review", "** search terms missing **"),
+            ("Review garden --limit none", usage),
+        ]:
+            mock_print.reset_mock()
+            console.Console().do_search(line)
+            mock_print.assert_called_once_with(message)
+
+
+class TestShortIds(TestConsole):
+    """Tests cases for the resolution and completion of ids"""
+
+    def setUp(self):
+        """Test instance factory, with places stored on file"""
+
+        super().setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.storage = models.FileStorage(f"{directory.name}/file.json")
+
+        with patch.object(models, "storage", self.storage):
+            for instance_id in ["3f2a-01", "3f2b-02", "3f2b-03", "77"]:
+                models.Place(id=instance_id, name=instance_id)
+
+    @patch("builtins.print")
+    def test_unique_prefix_is_resolved(self, mock_print):
+        """Ensures that a unique prefix stands for the whole id"""
+
+        with patch.object(models, "storage", self.storage):
+            console.Console().onecmd("show Place 3f2a")
+            console.Console().onecmd('Place.show("7")')
+
+        first, second = [call.args[0] for call in mock_print.call_args_list]
+
+        self.assertTrue(first.startswith("[Place] (3f2a-01)"))
+        self.assertTrue(second.startswith("[Place] (77)"))
+
+    @patch("builtins.print")
+    def test_prefix_resolved_for_update_and_destroy(self, mock_print):
+        """Ensures that changes can be made by prefix"""
+
+        with patch.object(models, "storage", self.storage):
+            console.Console().onecmd("update Place 3f2a name Loft")
+            console.Console().onecmd("destroy Place 77")
+
+        self.assertEqual(self.storage.get("Place.3f2a-01").get("name"), "Loft")
+        self.assertIsNone(self.storage.get("Place.77"))
+        mock_print.assert_not_called()
+
+    @patch("builtins.print")
+    def test_ambiguous_prefix(self, mock_print):
+        """Ensures that the user is informed of ambiguous prefixes"""
+
+        with patch.object(models, "storage", self.storage):
+            console.Console().onecmd("show Place 3f2b")
+            console.Console().onecmd("Place.destroy('3f')")
+
+        self.assertEqual(mock_print.call_count, 2)
+        mock_print.assert_called_with("** instance id ambiguous **")
+        self.assertIsNotNone(self.storage.get("Place.3f2b-02"))
+
+    def test_complete_model_names(self):
+        """Ensures that model names are completed, BaseModel aside"""
+
+        shell = console.Console()
+
+        self.assertEqual(shell.complete_show("", "show ", 5, 5), [
+            "Amenity", "City", "Place", "Review", "State", "User"
+        ])
+        self.assertEqual(shell.complete_all("P", "all P", 4, 5), ["Place"])
+        self.assertEqual(shell.complete_create("B", "create B", 7, 8), [])
+
+    def test_complete_ids(self):
+        """Ensures that ids are completed for commands taking them"""
+
+        shell = console.Console()
+        line = "show Place 3f2"
+
+        with patch.object(models, "storage", self.storage):
+            completions = shell.complete_show("3f2", line, 11, 14)
+            none = shell.complete_all("3f2", "all Place 3f2", 10, 13)
+
+        self.assertEqual(completions, ["3f2a-01", "3f2b-02", "3f2b-03"])
+        self.assertEqual(none, [])
+
+
 class TestShow(TestConsole):
     """Tests cases for the `do_show` method"""
 
@@ -240,8 +517,7 @@ class TestShow(TestConsole):
         console.Console().do_show(f"User {self.user.id}")
         call_arg = mock_print.call_args[0][0]
 
-        self.assertEqual(call_arg, self.user)
-        self.assertEqual(type(call_arg), type(self.user))
+        self.assertTrue(call_arg.startswith(f"[User] ({self.user.id})"))
 
         """a secondary call is made when parsing id"""
         self.assertEqual(models.storage.all.call_count, 2)
@@ -397,6 +673,686 @@ class TestUpdate(TestConsole):
         """a call is made when parsing id"""
         self.assertEqual(models.storage.all.call_count, 1)
 
+    @patch("builtins.print")
+    def test_update_with_dictionary(self, mock_print):
+        """Ensures that all attributes are applied in one write"""
+
+        self.store_new_models()
+
+        place = models.Place()
+        models.storage.all()[place.super_id] = place.to_dict()
+
+        attributes = '{"name": "Loft", "number_rooms": "3", "latitude": 1}'
+        console.Console().do_update(f"Place {place.id} {attributes}")
+
+        stored = models.storage.all().get(place.super_id)
+
+        self.assertEqual(stored.get("name"), "Loft")
+        self.assertEqual(stored.get("number_rooms"), 3)
+        self.assertEqual(stored.get("latitude"), 1.0)
+        self.assertIsInstance(stored.get("latitude"), float)
+        models.storage.save.assert_called_once()
+        mock_print.assert_not_called()
+
+    @patch("builtins.print")
+    def test_update_with_invalid_dictionary(self, mock_print):
+        """Ensures that user is informed if the dictionary is invalid"""
+
+        for attributes in ('{"name": ', '{"name", "Loft"}'):
+            console.Console().do_update(f"User {self.user.id} {attributes}")
+            mock_print.assert_called_with("** dictionary invalid **")
+
+        self.assertEqual(mock_print.call_count, 2)
+        models.storage.save.assert_not_called()
+
+    @patch("builtins.print")
+    def test_update_with_dotted_text(self, mock_print):
+        """Ensures that text containing a dot is kept as text"""
+
+        self.store_new_models()
+
+        place = models.Place()
+        models.storage.all()[place.super_id] = place.to_dict()
+
+        console.Console().do_update(f'Place {place.id} name "Mr. Smith"')
+        console.Console().do_update(f"Place {place.id} rating 4.5")
+
+        stored = models.storage.all().get(place.super_id)
+
+        self.assertEqual(stored.get("name"), "Mr. Smith")
+        self.assertEqual(stored.get("rating"), 4.5)
+        mock_print.assert_not_called()
+
+    @patch("builtins.print")
+    def test_update_keeps_declared_text_as_typed(self, mock_print):
+        """Ensures that text fields keep leading and trailing zeros"""
+
+        self.store_new_models()
+
+        for attribute, value in (("password", "007"), ("first_name", "1.50")):
+            console.Console().do_update(
+                f"User {self.user.id} {attribute} {value}"
+            )
+
+        place = models.Place()
+        models.storage.all()[place.super_id] = place.to_dict()
+        console.Console().do_update(f"Place {place.id} max_guest 4.0")
+
+        stored = models.storage.all().get(self.user.super_id)
+
+        self.assertEqual(stored.get("password"), "007")
+        self.assertEqual(stored.get("first_name"), "1.50")
+        self.assertEqual(
+            models.storage.all().get(place.super_id).get("max_guest"), 4
+        )
+        mock_print.assert_not_called()
+
+    @patch("builtins.print")
+    def test_update_with_invalid_attribute_name(self, mock_print):
+        """Ensures that dictionary keys must be attribute names"""
+
+        for attributes in ("{1: 2}", '{"first name": "Anna"}'):
+            console.Console().do_update(f"User {self.user.id} {attributes}")
+            mock_print.assert_called_with("** attribute missing **")
+
+        self.assertEqual(mock_print.call_count, 2)
+        models.storage.save.assert_not_called()
+
+    @patch("builtins.print")
+    def test_update_with_immutable_attribute_in_dictionary(self, mock_print):
+        """Ensures that no attribute is updated if one is immutable"""
+
+        console.Console().do_update(
+            f'User {self.user.id} {{"first_name": "Anna", "id": "1"}}'
+        )
+
+        mock_print.assert_called_once_with("** immutable attribute **")
+        models.storage.save.assert_not_called()
+
+
+class TestWhere(TestConsole):
+    """Tests cases for updates and deletions by attribute values"""
+
+    def setUp(self):
+        """Test instance factory, with places and reviews on file"""
+
+        super().setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.storage = models.FileStorage(f"{directory.name}/file.json")
+        self.storage.add_index("values", models.ValueIndex(models.INDEXED))
+
+        with patch.object(models, "storage", self.storage):
+            for id_, city_id in (("a", "x"), ("b", "x"), ("c", "y")):
+                models.Place(id=id_, city_id=city_id)
+
+            for id_, user_id in (("d", "banned"), ("e", "welcome")):
+                models.Review(id=id_, user_id=user_id)
+
+    @patch("builtins.print")
+    def test_update_where(self, mock_print):
+        """Ensures that matching instances are updated in one write"""
+
+        line = (
+            "update Place where city_id=x "
+            'set price_by_night=120 name="Big Loft"'
+        )
+
+        with patch.object(models, "storage", self.storage), patch.object(
+            self.storage, "save", wraps=self.storage.save
+        ) as mock_save:
+            console.Console().onecmd(line)
+
+        mock_print.assert_called_once_with("** 2 instances updated **")
+        mock_save.assert_called_once()
+
+        for key, price in (("a", 120), ("b", 120), ("c", 0)):
+            stored = self.storage.get(f"Place.{key}")
+            self.assertEqual(stored["price_by_night"], price)
+
+        self.assertEqual(self.storage.get("Place.a")["name"], "Big Loft")
+
+    @patch("builtins.print")
+    def test_destroy_where(self, mock_print):
+        """Ensures that matching instances are deleted in one write"""
+
+        with patch.object(models, "storage", self.storage), patch.object(
+            self.storage, "save", wraps=self.storage.save
+        ) as mock_save:
+            console.Console().onecmd("destroy Review where user_id=banned")
+            console.Console().onecmd(
+                'Place.destroy_where({"city_id": "y"})'
+            )
+
+        mock_print.assert_any_call("** 1 instances destroyed **")
+        mock_print.assert_called_with("** 1 instances destroyed **")
+        self.assertEqual(mock_save.call_count, 2)
+
+        self.assertIsNone(self.storage.get("Review.d"))
+        self.assertIsNone(self.storage.get("Place.c"))
+        self.assertIsNotNone(self.storage.get("Review.e"))
+
+    @patch("builtins.print")
+    def test_where_keeps_declared_text_as_typed(self, mock_print):
+        """Ensures that declared fields are matched on the raw token"""
+
+        with patch.object(models, "storage", self.storage):
+            models.User(id="f", password="0042")
+            models.User(id="g", password="42")
+
+            console.Console().onecmd(
+                "update User where password=0042 set first_name=007"
+            )
+
+        mock_print.assert_called_once_with("** 1 instances updated **")
+        self.assertEqual(self.storage.get("User.f")["first_name"], "007")
+        self.assertEqual(self.storage.get("User.g")["first_name"], "")
+
+    @patch("builtins.print", return_value=None)
+    def test_where_informs_user(self, mock_print):
+        """Ensures that the user is informed of invalid input"""
+
+        destroy = "** usage: destroy <model> where <attribute>=<value> ... **"
+        update = (
+            "** usage: update <model> where <attribute>=<value> ... "
+            "set <attribute>=<value> ... **"
+        )
+
+        cases = [
+            ("destroy Review where user_id", destroy),
+            ("destroy Review where user_id=x set text=y", destroy),
+            ("destroy BaseModel where id=x", "** model doesn't exist **"),
+            ("destroy Review where", "** conditions missing **"),
+            ("update Place where city_id=x set =4", update),
+            ("update Place where city_id=x", "** attribute missing **"),
+            (
+                "update Place where city_id=x set id=4",
+                "** immutable attribute **",
+            ),
+        ]
+
+        with patch.object(models, "storage", self.storage):
+            for line, message in cases:
+                mock_print.reset_mock()
+                console.Console().onecmd(line)
+                mock_print.assert_called_once_with(message)
+
+        self.assertEqual(len(self.storage.all()), 5)
+
+
+class TestBackup(TestConsole):
+    """Tests cases for the `backup`, `compact` and `restore` commands"""
+
+    def setUp(self):
+        """Test instance factory, with users stored on file"""
+
+        super().setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        self.directory = directory.name
+        self.storage = models.FileStorage(f"{directory.name}/file.json")
+
+        with patch.object(models, "storage", self.storage):
+            models.User(id="a", updated_at="2024-05-27T09:00:00")
+            models.User(id="b", updated_at="2024-05-28T09:00:00")
+
+    @patch("builtins.print")
+    def test_backup_and_restore(self, mock_print):
+        """Ensures that backups are written and restored"""
+
+        base = f"{self.directory}/base.json"
+        monday = f"{self.directory}/monday.json"
+
+        with patch.object(models, "storage", self.storage):
+            console.Console().onecmd(f"backup {base}")
+            self.storage.delete("User.a")
+            console.Console().onecmd(f"backup --since 2024-05-28 {monday}")
+            self.storage.delete("User.b")
+            console.Console().onecmd(f"restore {base} {monday}")
+
+        self.assertEqual(
+            [call.args[0] for call in mock_print.call_args_list],
+            [
+                "** 2 objects, 0 deletions backed up **",
+                "** 1 objects, 1 deletions backed up **",
+                "** 1 objects restored **",
+            ],
+        )
+        self.assertEqual(list(self.storage.all()), ["User.b"])
+
+    @patch("builtins.print")
+    def test_compact(self, mock_print):
+        """Ensures that deletions up to the time given are dropped"""
+
+        with patch.object(models, "storage", self.storage):
+            self.storage.delete("User.a")
+            self.storage.save()
+            console.Console().onecmd("compact 9999-01-01")
+
+        _, deleted = self.storage.changes()
+
+        mock_print.assert_called_once_with("** 1 deletions dropped **")
+        self.assertEqual(deleted, {})
+
+    @patch("builtins.print")
+    def test_backup_and_restore_inform_user(self, mock_print):
+        """Ensures that the user is informed of invalid input"""
+
+        backup = "** usage: backup [--since <iso timestamp>] <path> **"
+        compact = "** usage: compact <iso timestamp> **"
+        restore = (
+            "** usage: restore <full backup> [<incremental backup> ...] **"
+        )
+
+        cases = [
+            ("backup", backup),
+            ("backup --since yesterday b.json", backup),
+            ("backup --since 2024-05-28", backup),
+            ("backup a.json b.json", backup),
+            ("compact", compact),
+            ("compact yesterday", compact),
+            ("restore", restore),
+            (
+                f"restore {self.directory}/missing.json",
+                "** restore failed: No such file or directory **",
+            ),
+        ]
+
+        with patch.object(models, "storage", self.storage):
+            for line, message in cases:
+                mock_print.reset_mock()
+                console.Console().onecmd(line)
+                mock_print.assert_called_once_with(message)
+
+        self.assertEqual(len(self.storage.all()), 2)
+
+
+class TestScript(TestConsole):
+    """Tests cases for non-interactive execution of commands"""
+
+    @patch("sys.stderr", new_callable=StringIO)
+    @patch("builtins.print")
+    def test_script_executes_each_command(self, mock_print, mock_stderr):
+        """Ensures that every command is executed in turn"""
+
+        executed = console.run_script(["create User", "create Place"])
+
+        self.assertEqual(executed, 2)
+        self.assertEqual(mock_print.call_count, 3)
+        self.assertEqual(models.storage.save.call_count, 2)
+
+    @patch("builtins.print")
+    def test_script_skips_blanks_and_comments(self, mock_print):
+        """Ensures that blank lines and comments are not executed"""
+
+        lines = ["# a comment", "", "   ", "create User"]
+        executed = console.run_script(lines, quiet=True)
+
+        self.assertEqual(executed, 1)
+
+    @patch("builtins.print")
+    def test_script_halts_on_quit(self, mock_print):
+        """Ensures that commands following `quit` are not executed"""
+
+        lines = ["create User", "quit", "create User"]
+        executed = console.run_script(lines, quiet=True)
+
+        self.assertEqual(executed, 2)
+        models.storage.save.assert_called_once()
+
+    @patch("builtins.print")
+    def test_script_continues_past_failed_command(self, mock_print):
+        """Ensures that a failed command is reported and passed over"""
+
+        lines = ["create User", 'show State "abc', "create Place"]
+        executed = console.run_script(lines)
+
+        self.assertEqual(executed, 3)
+        mock_print.assert_any_call('** unknown syntax: show State "abc **')
+        self.assertEqual(models.storage.save.call_count, 2)
+        self.assertRegex(
+            mock_print.call_args.args[0], r"\*\* 3 commands in "
+        )
+
+    @patch("sys.stderr", new_callable=StringIO)
+    def test_script_reports_throughput(self, mock_stderr):
+        """Ensures that throughput is reported away from stdout"""
+
+        console.run_script(["quit"])
+        self.assertRegex(mock_stderr.getvalue(), r"\*\* 1 commands in ")
+
+    @patch("sys.stderr", new_callable=StringIO)
+    def test_script_quiet_suppresses_report(self, mock_stderr):
+        """Ensures that throughput is not reported when quiet"""
+
+        console.run_script(["quit"], quiet=True)
+        self.assertEqual(mock_stderr.getvalue(), "")
+
+    @patch("builtins.print")
+    def test_main_with_commands(self, mock_print):
+        """Ensures that one-shot commands are run from the cli"""
+
+        executed = console.main(["-q", "-c", "create User", "-c", "quit"])
+        self.assertEqual(executed, 2)
+
+
+class TestRenderer(TestConsole):
+    """Tests cases for the buffered rendering of results"""
+
+    @patch("builtins.print")
+    def test_results_are_written_at_once(self, mock_print):
+        """Ensures that many results are written in a single write"""
+
+        super_ids = [f"User.{number}" for number in range(1_000)]
+
+        with console.Renderer() as render:
+            render.ids(super_ids)
+            mock_print.assert_not_called()
+
+        mock_print.assert_called_once_with("\n".join(super_ids))
+
+    @patch("builtins.print")
+    def test_results_are_written_in_chunks(self, mock_print):
+        """Ensures that the buffer is written once over its limit"""
+
+        renderer = console.Renderer()
+        renderer.LIMIT = 20
+
+        with renderer as render:
+            render.ids(["User.1234", "User.5678", "User.9012"])
+
+        self.assertEqual(mock_print.call_count, 2)
+        mock_print.assert_called_with("User.9012")
+
+    @patch("builtins.print")
+    def test_results_rendered_as_json(self, mock_print):
+        """Ensures that each result is a line of JSON"""
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        storage = models.FileStorage(f"{directory.name}/file.json")
+
+        with patch.object(models, "storage", storage):
+            user = models.User()
+            lines = ["all User", "User.count()", f"show User {user.id}"]
+            console.run_script(lines, quiet=True, as_json=True)
+
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        records = [json.loads(line) for line in printed]
+
+        self.assertEqual(records[0], user.to_dict())
+        self.assertEqual(records[1], {"__class__": "User", "count": 1})
+        self.assertEqual(records[2].get("id"), user.id)
+        self.assertEqual(len(records), 3)
+
+    @patch("builtins.print")
+    def test_bulk_changes_rendered_as_json(self, mock_print):
+        """Ensures that bulk changes are told apart from counts"""
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        storage = models.FileStorage(f"{directory.name}/file.json")
+
+        with patch.object(models, "storage", storage):
+            models.Place(id="a", city_id="x")
+            models.Place(id="b", city_id="x")
+            lines = [
+                "update Place where city_id=x set max_guest=4",
+                "destroy Place where city_id=x",
+            ]
+            console.run_script(lines, quiet=True, as_json=True)
+
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        records = [json.loads(line) for line in printed]
+
+        self.assertEqual(records[0], {"__class__": "Place", "updated": 2})
+        self.assertEqual(records[1], {"__class__": "Place", "destroyed": 2})
+        self.assertEqual(len(records), 2)
+
+    def test_printed_text_rendered_as_json(self):
+        """Ensures that created ids and messages are lines of JSON"""
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        storage = models.FileStorage(f"{directory.name}/file.json")
+        commands = ["create User", "show User nope", "User.count()"]
+        stdout = StringIO()
+
+        with patch.object(models, "storage", storage):
+            with redirect_stdout(stdout):
+                console.run_script(commands, quiet=True, as_json=True)
+
+        lines = stdout.getvalue().splitlines()
+        records = [json.loads(line) for line in lines]
+
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]["__class__"], "User")
+        self.assertIn(f"User.{records[0]['id']}", storage.all())
+        self.assertEqual(records[1], {"message": "no instance found"})
+        self.assertEqual(records[2], {"__class__": "User", "count": 1})
+
+    def test_printed_text_kept_as_text(self):
+        """Ensures that printed text is untouched unless rendering JSON"""
+
+        renderer = console.Renderer()
+        stdout = StringIO()
+
+        with redirect_stdout(stdout):
+            with renderer as render:
+                render.printed("** no instance found **\n1234\n", "User")
+
+        self.assertEqual(
+            stdout.getvalue(), "** no instance found **\n1234\n"
+        )
+
+    @patch("builtins.print")
+    def test_main_with_json(self, mock_print):
+        """Ensures that results are rendered as JSON when requested"""
+
+        console.main(["-q", "--json", "-c", "User.count()"])
+
+        printed = json.loads(mock_print.call_args[0][0])
+        self.assertEqual(printed, {"__class__": "User", "count": 1})
+
+
+class TestStats(TestConsole):
+    """Tests cases for the `do_stats` method"""
+
+    @patch("builtins.print")
+    def test_stats_prints_storage_metrics(self, mock_print):
+        """Ensures that each metric is printed"""
+
+        console.Console().onecmd("stats")
+        printed = [call[0][0] for call in mock_print.call_args_list]
+
+        self.assertIn("objects: 1", printed)
+        self.assertTrue(printed[-1].startswith("write_amplification: "))
+
+    def test_stats_exports_to_file(self):
+        """Ensures that metrics are exported when a path is given"""
+
+        with patch.object(models.storage, "export_metrics") as mock_export:
+            console.Console().onecmd("stats storage.prom")
+            mock_export.assert_called_once_with("storage.prom", None)
+
+            console.Console().onecmd("stats storage.prom 15")
+            mock_export.assert_called_with("storage.prom", 15.0)
+
+    @patch("builtins.print")
+    def test_stats_with_invalid_interval(self, mock_print):
+        """Ensures that the user is informed of the usage"""
+
+        console.Console().onecmd("stats storage.prom often")
+        mock_print.assert_called_once_with(
+            "** usage: stats [<path> [<interval>]] **"
+        )
+
+    @patch("builtins.print")
+    def test_stats_to_unwritable_path(self, mock_print):
+        """Ensures that the user is informed the file was not written"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            console.Console().onecmd(f"stats {directory}/missing/m.prom")
+
+        mock_print.assert_called_once_with(
+            "** stats failed: No such file or directory **"
+        )
+
+
+class TestTiming(TestConsole):
+    """Tests cases for the `do_timing` method"""
+
+    def run_command(self, shell, line):
+        """Runs a command as the command loop would"""
+
+        line = shell.precmd(line)
+        return shell.postcmd(shell.onecmd(line), line)
+
+    @patch("builtins.print")
+    def test_timing_disabled_by_default(self, mock_print):
+        """Ensures that nothing is recorded unless enabled"""
+
+        shell = console.Console()
+        self.run_command(shell, f"show User {self.user.id}")
+
+        self.assertEqual(shell.timings, {})
+
+    @patch("builtins.print")
+    def test_timing_records_per_verb_and_model(self, mock_print):
+        """Ensures that commands are grouped by verb and model"""
+
+        shell = console.Console()
+        self.run_command(shell, "timing on")
+        self.run_command(shell, f"show User {self.user.id}")
+        self.run_command(shell, f'User.show("{self.user.id}")')
+        self.run_command(shell, "all")
+        self.run_command(shell, "timing off")
+        self.run_command(shell, "all")
+
+        self.assertEqual(sorted(shell.timings), ["all", "show User"])
+        self.assertEqual(shell.timings.get("show User").count, 2)
+        self.assertEqual(shell.timings.get("all").count, 1)
+
+    @patch("builtins.print")
+    def test_timing_report(self, mock_print):
+        """Ensures that the report tabulates each command"""
+
+        shell = console.Console()
+        self.run_command(shell, "timing on")
+        self.run_command(shell, "all User")
+        self.run_command(shell, "timing report")
+
+        report = mock_print.call_args[0][0].splitlines()
+
+        self.assertTrue(report[0].startswith("command"))
+        self.assertIn("p99(us)", report[0])
+        self.assertTrue(report[1].startswith("all User"))
+
+    @patch("atexit.register")
+    def test_timing_dump_registered_once(self, mock_register):
+        """Ensures that the dump at exit is registered once"""
+
+        shell = console.Console()
+        shell.onecmd("timing on first.json")
+        shell.onecmd("timing on second.json")
+
+        mock_register.assert_called_once()
+
+    @patch("atexit.register")
+    def test_timing_dump_writes_histograms(self, mock_register):
+        """Ensures that histograms are dumped as JSON"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/timings.json"
+
+            shell = console.Console()
+            self.run_command(shell, f"timing on {path}")
+            self.run_command(shell, "all User")
+
+            dump = mock_register.call_args[0][0]
+            dump()
+
+            with open(path, "r") as file:
+                timings = json.load(file)
+
+        self.assertEqual(list(timings), ["all User"])
+        self.assertEqual(timings.get("all User").get("count"), 1)
+
+    @patch("builtins.print")
+    def test_timing_with_unknown_option(self, mock_print):
+        """Ensures that the user is informed of the usage"""
+
+        console.Console().onecmd("timing sideways")
+        mock_print.assert_called_once_with(
+            "** usage: timing on [<path>] | off | report **"
+        )
+
+
+class TestProfile(TestConsole):
+    """Tests cases for the `do_profile` method"""
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_profile_prints_cumulative_statistics(self, mock_stdout):
+        """Ensures that the command is run and profiled"""
+
+        console.Console().onecmd(f"profile show User {self.user.id}")
+        output = mock_stdout.getvalue()
+
+        self.assertTrue(output.startswith(f"[User] ({self.user.id})"))
+        self.assertIn("Ordered by: cumulative time", output)
+        self.assertIn("(show)", output)
+
+    @patch("builtins.print")
+    def test_profile_writes_pstats_file(self, mock_print):
+        """Ensures that statistics can be kept for later analysis"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/show.pstats"
+            console.Console().onecmd(f"profile -o {path} all User")
+
+            stats = pstats.Stats(path)
+
+        self.assertGreater(stats.total_calls, 0)
+
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_profile_to_unwritable_path(self, mock_stdout):
+        """Ensures that the user is informed the file was not written"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = f"{directory}/missing/all.pstats"
+            console.Console().onecmd(f"profile -o {path} all User")
+
+        output = mock_stdout.getvalue()
+        failed = "** profile failed: No such file or directory **"
+
+        self.assertIn(failed, output)
+        self.assertIn("Ordered by: cumulative time", output)
+
+    @patch("builtins.print")
+    def test_profile_without_command(self, mock_print):
+        """Ensures that the user is informed of the usage"""
+
+        usage = "** usage: profile [-n <limit>] [-o <path>] <command> **"
+
+        console.Console().onecmd("profile")
+        mock_print.assert_called_once_with(usage)
+
+        console.Console().onecmd("profile -n many all")
+        mock_print.assert_called_with(usage)
+
+    def test_profile_propagates_stop(self):
+        """Ensures that a profiled `quit` still exits"""
+
+        with patch("builtins.print"):
+            self.assertTrue(console.Console().onecmd("profile quit"))
+
 
 if __name__ == "__main__":
     unittest.main()
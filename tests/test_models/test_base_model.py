@@ -3,6 +3,7 @@
 from unittest.mock import MagicMock, patch
 from importlib import import_module
 from datetime import datetime
+import tempfile
 import unittest
 import uuid
 
@@ -80,15 +81,12 @@ class TestAll(TestModels):
             }
         )
 
-        expected = f"{self.model_01.super_id}"
+        expected = [self.model_00.super_id, self.model_01.super_id]
 
-        self.model_00.all()
-
-        """mock_print only captures the last printout"""
-        last_printout = mock_print.call_args[0][0]
+        super_ids = self.model_00.all()
 
-        self.assertEqual(last_printout, expected)
-        self.assertEqual(mock_print.call_count, 2)
+        self.assertEqual(super_ids, expected)
+        mock_print.assert_not_called()
         self.assertEqual(models.storage.all.call_count, 1)
 
 
@@ -124,13 +122,14 @@ class TestCount(unittest.TestCase):
 
     @patch("builtins.print")
     def test_count_prints_none_when_storage_empty(self, mock_print):
-        """Ensure printout is zero storage is empty"""
+        """Ensure count is zero when storage is empty"""
 
         models.storage.all = MagicMock(return_value={})
-        self.model.count()
+        count = self.model.count()
 
         models.storage.all.assert_called_once()
-        mock_print.assert_called_once_with("BaseModel count: 0")
+        mock_print.assert_not_called()
+        self.assertEqual(count, 0)
 
     @patch("builtins.print")
     def test_count_prints_none_when_instances_not_in_storage(self, mock_print):
@@ -156,10 +155,11 @@ class TestCount(unittest.TestCase):
             }
         )
 
-        self.model.count()
+        count = self.model.count()
 
         models.storage.all.assert_called_once()
-        mock_print.assert_called_once_with("BaseModel count: 0")
+        mock_print.assert_not_called()
+        self.assertEqual(count, 0)
 
     @patch("builtins.print")
     def test_count_when_instances_in_storage(self, mock_print):
@@ -169,10 +169,11 @@ class TestCount(unittest.TestCase):
             return_value={self.model.super_id: self.model.to_dict()}
         )
 
-        self.model.count()
+        count = self.model.count()
 
         models.storage.all.assert_called_once()
-        mock_print.assert_called_once_with("BaseModel count: 1")
+        mock_print.assert_not_called()
+        self.assertEqual(count, 1)
 
 
 class TestDestroy(TestModels):
@@ -556,6 +557,201 @@ class TestUpdate(TestModels):
         models.storage.all.assert_not_called()
 
 
+class TestUpdateMany(unittest.TestCase):
+    """Tests cases for updating several attributes at once"""
+
+    def setUp(self):
+        """Places a model within a temporary store"""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = models.FileStorage(f"{self.directory.name}/file.json")
+        self.patcher = patch.object(models, "storage", self.storage)
+        self.patcher.start()
+
+        self.place = models.Place()
+        self.storage.save()
+
+    def tearDown(self):
+        """Restores storage and removes the temporary store"""
+
+        self.patcher.stop()
+        self.directory.cleanup()
+
+    def test_update_with_dictionary(self):
+        """Ensures that all attributes are applied in a single save"""
+
+        attributes = {"name": "Loft", "number_rooms": 3, "description": "Big"}
+
+        with patch.object(
+            self.storage, "save", wraps=self.storage.save
+        ) as mock_save:
+            place = models.Place.update(self.place.id, attributes)
+
+        stored = self.storage.get(self.place.super_id)
+
+        for name, value in attributes.items():
+            self.assertEqual(getattr(place, name), value)
+            self.assertEqual(stored.get(name), value)
+
+        mock_save.assert_called_once()
+
+    def test_update_coerces_field_types(self):
+        """Ensures that values are cast into the types of their fields"""
+
+        place = models.Place.update(
+            self.place.id,
+            {"number_rooms": "3", "latitude": 2, "name": 42, "extra": "7"},
+        )
+
+        self.assertEqual(place.number_rooms, 3)
+        self.assertIsInstance(place.latitude, float)
+        self.assertEqual(place.name, "42")
+        self.assertEqual(place.extra, "7")
+
+        place = models.Place.update(self.place.id, "max_guest", "4")
+        self.assertEqual(place.max_guest, 4)
+
+    @patch("builtins.print")
+    def test_update_with_invalid_value(self, mock_print):
+        """Ensures that no attribute is updated if one is invalid"""
+
+        for attributes in (
+            {"name": "Loft", "number_rooms": "many"},
+            {"number_rooms": 2.5},
+            {"amenity_ids": "wifi"},
+        ):
+            models.Place.update(self.place.id, attributes)
+            mock_print.assert_called_with("** invalid value **")
+
+        self.assertEqual(self.storage.get(self.place.super_id)["name"], "")
+
+    @patch("builtins.print")
+    def test_update_with_immutable_attribute(self, mock_print):
+        """Ensures that no attribute is updated if one is immutable"""
+
+        models.Place.update(self.place.id, {"name": "Loft", "id": "1"})
+
+        mock_print.assert_called_once_with("** immutable attribute **")
+        self.assertEqual(self.storage.get(self.place.super_id)["name"], "")
+
+    @patch("builtins.print")
+    def test_update_with_empty_dictionary(self, mock_print):
+        """Ensures that user is informed if no attribute provided"""
+
+        models.Place.update(self.place.id, {})
+        mock_print.assert_called_once_with("** attribute missing **")
+
+    @patch("builtins.print")
+    def test_update_with_missing_value(self, mock_print):
+        """Ensures that user is informed if a value is missing"""
+
+        models.Place.update(self.place.id, {"name": "Loft", "city_id": ""})
+        mock_print.assert_called_once_with("** value missing **")
+
+
+class TestWhere(unittest.TestCase):
+    """Tests cases for updating and deleting by attribute values"""
+
+    def setUp(self):
+        """Places models within a temporary store"""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.storage = models.FileStorage(f"{self.directory.name}/file.json")
+        self.storage.add_index("values", models.ValueIndex(models.INDEXED))
+        self.patcher = patch.object(models, "storage", self.storage)
+        self.patcher.start()
+
+        self.places = [models.Place() for _ in range(3)]
+
+        for place, city_id in zip(self.places, ("x", "x", "y")):
+            place.city_id = city_id
+            self.storage.new(place)
+
+        self.storage.save()
+
+    def tearDown(self):
+        """Restores storage and removes the temporary store"""
+
+        self.patcher.stop()
+        self.directory.cleanup()
+
+    def stored(self, place):
+        """Provides the stored form of a place"""
+
+        return self.storage.get(place.super_id)
+
+    def test_update_where(self):
+        """Ensures that all matching instances are updated in one save"""
+
+        with patch.object(
+            self.storage, "save", wraps=self.storage.save
+        ) as mock_save:
+            count = models.Place.update_where(
+                {"city_id": "x"}, {"price_by_night": "120", "name": "Loft"}
+            )
+
+        self.assertEqual(count, 2)
+        mock_save.assert_called_once()
+
+        for place in self.places[:2]:
+            self.assertEqual(self.stored(place)["price_by_night"], 120)
+            self.assertEqual(self.stored(place)["name"], "Loft")
+
+        self.assertEqual(self.stored(self.places[2])["price_by_night"], 0)
+
+    def test_update_where_without_matches(self):
+        """Ensures that storage is not written when nothing matches"""
+
+        with patch.object(self.storage, "save") as mock_save:
+            count = models.Place.update_where({"city_id": "z"}, {"name": "L"})
+
+        self.assertEqual(count, 0)
+        mock_save.assert_not_called()
+
+    @patch("builtins.print")
+    def test_update_where_with_invalid_input(self, mock_print):
+        """Ensures that user is informed of invalid input"""
+
+        cases = [
+            (({}, {"name": "Loft"}), "** conditions missing **"),
+            (({"city_id": "x"}, {}), "** attribute missing **"),
+            (({"city_id": "x"}, {"id": "1"}), "** immutable attribute **"),
+            (({"max_guest": "two"}, {"name": "L"}), "** invalid value **"),
+            (({"city_id": "x"}, {"name": ""}), "** value missing **"),
+        ]
+
+        for args, message in cases:
+            models.Place.update_where(*args)
+            mock_print.assert_called_with(message)
+
+        self.assertEqual(mock_print.call_count, len(cases))
+        self.assertEqual(self.stored(self.places[0])["name"], "")
+
+    def test_destroy_where(self):
+        """Ensures that all matching instances are deleted in one save"""
+
+        with patch.object(
+            self.storage, "save", wraps=self.storage.save
+        ) as mock_save:
+            count = models.Place.destroy_where({"city_id": "x"})
+
+        self.assertEqual(count, 2)
+        mock_save.assert_called_once()
+
+        self.assertIsNone(self.stored(self.places[0]))
+        self.assertIsNone(self.stored(self.places[1]))
+        self.assertIsNotNone(self.stored(self.places[2]))
+
+    @patch("builtins.print")
+    def test_destroy_where_without_conditions(self, mock_print):
+        """Ensures that instances are not all deleted by omission"""
+
+        models.Place.destroy_where({})
+
+        mock_print.assert_called_once_with("** conditions missing **")
+        self.assertEqual(models.Place.count(), 3)
+
+
 class TestUpdatedAt(TestModels):
     """
     Collective and specified testing of the `updated_at`
@@ -744,5 +940,95 @@ class TestDunderStr(TestInitMocking):
         self.assertEqual(actual, expect)
 
 
+class TestSerialisationCache(TestInitMocking):
+    """Collective testing of the caching of serialised forms"""
+
+    def test_unchanged_model_reuses_serialised_forms(self):
+        """Ensure forms are built once while the model is unchanged"""
+
+        self.assertIs(self.model.to_dict(), self.model.to_dict())
+        self.assertIs(str(self.model), str(self.model))
+
+    def test_assignment_clears_serialised_forms(self):
+        """Ensure forms reflect attributes assigned since built"""
+
+        dict_ = self.model.to_dict()
+        string = str(self.model)
+
+        self.model.name = "Anna"
+
+        self.assertIsNot(self.model.to_dict(), dict_)
+        self.assertEqual(self.model.to_dict().get("name"), "Anna")
+        self.assertIn("'name': 'Anna'", str(self.model))
+        self.assertNotEqual(str(self.model), string)
+
+    def test_id_assignment_clears_super_id(self):
+        """Ensure the super id follows the id"""
+
+        self.assertEqual(self.model.super_id, "BaseModel.unique id")
+
+        self.model.id = "another id"
+
+        self.assertEqual(self.model.super_id, "BaseModel.another id")
+
+    def test_deletion_clears_serialised_forms(self):
+        """Ensure forms reflect attributes deleted since built"""
+
+        self.model.name = "Anna"
+        self.model.to_dict()
+
+        del self.model.name
+
+        self.assertNotIn("name", self.model.to_dict())
+
+    def test_in_place_change_clears_serialised_forms(self):
+        """Ensure forms reflect mutable values changed in place"""
+
+        place = models.Place()
+        str(place)
+        place.to_dict()
+
+        place.amenity_ids.append("a1")
+
+        self.assertIn("'amenity_ids': ['a1']", str(place))
+        self.assertEqual(place.to_dict().get("amenity_ids"), ["a1"])
+
+        self.model.tags = {"view": ["sea"]}
+        self.model.to_dict()
+
+        self.model.tags["view"].append("hills")
+
+        self.assertEqual(
+            self.model.to_dict().get("tags"), {"view": ["sea", "hills"]}
+        )
+
+    def test_serialised_form_does_not_share_mutable_values(self):
+        """Ensure stored forms and snapshots do not follow the model"""
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        storage = models.FileStorage(f"{directory.name}/file.json")
+
+        with patch.object(models, "storage", storage):
+            place = models.Place()
+            snapshot = storage.snapshot()
+
+            place.amenity_ids.append("a1")
+
+        stored = snapshot.get(place.super_id)
+
+        self.assertEqual(stored.get("amenity_ids"), [])
+        self.assertIsNot(stored.get("amenity_ids"), place.amenity_ids)
+
+    def test_cache_is_not_an_attribute(self):
+        """Ensure the cache is not serialised with the model"""
+
+        self.model.to_dict()
+
+        self.assertEqual(
+            sorted(self.model.__dict__), ["created_at", "id", "updated_at"]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,6 +3,7 @@
 from unittest.mock import MagicMock, patch
 from importlib import import_module
 import unittest
+import uuid
 
 
 models = import_module("models")
@@ -62,10 +63,11 @@ class TestAll(unittest.TestCase):
             return_value={self.amenity.super_id: self.amenity.to_dict()}
         )
 
-        self.amenity.all()
+        super_ids = self.amenity.all()
 
         models.storage.all.assert_called_once()
-        mock_print.assert_called_once_with(self.amenity.super_id)
+        mock_print.assert_not_called()
+        self.assertEqual(super_ids, [self.amenity.super_id])
 
 
 class TestCount(unittest.TestCase):
@@ -77,13 +79,14 @@ class TestCount(unittest.TestCase):
 
     @patch("builtins.print")
     def test_count_prints_none_when_storage_empty(self, mock_print):
-        """Ensure printout is zero storage is empty"""
+        """Ensure count is zero when storage is empty"""
 
         models.storage.all = MagicMock(return_value={})
-        self.user.count()
+        count = self.user.count()
 
         models.storage.all.assert_called_once()
-        mock_print.assert_called_once_with("User count: 0")
+        mock_print.assert_not_called()
+        self.assertEqual(count, 0)
 
     @patch("builtins.print")
     def test_count_prints_none_when_instances_not_in_storage(self, mock_print):
@@ -109,10 +112,11 @@ class TestCount(unittest.TestCase):
             }
         )
 
-        self.user.count()
+        count = self.user.count()
 
         models.storage.all.assert_called_once()
-        mock_print.assert_called_once_with("User count: 0")
+        mock_print.assert_not_called()
+        self.assertEqual(count, 0)
 
     @patch("builtins.print")
     def test_count_when_instances_in_storage(self, mock_print):
@@ -122,10 +126,11 @@ class TestCount(unittest.TestCase):
             return_value={self.city.super_id: self.city.to_dict()}
         )
 
-        self.city.count()
+        count = self.city.count()
 
         models.storage.all.assert_called_once()
-        mock_print.assert_called_once_with("City count: 1")
+        mock_print.assert_not_called()
+        self.assertEqual(count, 1)
 
 
 class TestShow(unittest.TestCase):
@@ -185,14 +190,13 @@ class TestShow(unittest.TestCase):
             return_value={self.review.super_id: self.review.to_dict()}
         )
 
-        self.review.show(self.review.id)
-
-        print_call_arg = mock_print.call_args[0][0]
+        model = self.review.show(self.review.id)
 
-        self.assertEqual(print_call_arg, self.review)
+        self.assertEqual(model, self.review)
+        self.assertEqual(type(model), type(self.review))
 
         self.assertEqual(models.storage.all.call_count, 2)
-        mock_print.assert_called_once()
+        mock_print.assert_not_called()
 
 
 class TestUser(unittest.TestCase):
@@ -354,6 +358,107 @@ class TestPlace(unittest.TestCase):
         place = models.Place(**kwargs)
         self.assertEqual(place.to_dict(), kwargs)
 
+    def test_mutable_defaults_are_not_shared(self):
+        """Ensure each place has a list of amenities of its own"""
+
+        other = models.Place()
+        other.amenity_ids.append("wifi")
+
+        self.assertEqual(self.place.amenity_ids, [])
+
+    def test_init_with_partial_kwargs(self):
+        """Ensure fields missing from kwargs hold their defaults"""
+
+        place = models.Place(id="1234", name="Den of Dreams")
+
+        self.assertEqual(place.name, "Den of Dreams")
+        self.assertEqual(place.price_by_night, 0)
+        self.assertEqual(place.amenity_ids, [])
+
+    def test_init_does_not_assign_through_setattr(self):
+        """Ensure constructors fill `__dict__` directly"""
+
+        with patch.object(
+            models.BaseModel, "__setattr__", side_effect=AssertionError
+        ):
+            models.Place()
+            models.Place(**self.place.to_dict())
+
+
+class TestFields(unittest.TestCase):
+    """Collective testing of the declaration of fields"""
+
+    def test_field_defaults(self):
+        """Ensure defaults are the empty value of the type"""
+
+        self.assertEqual(models.Field("name").type, str)
+        self.assertEqual(models.Field("name").default, None)
+        self.assertEqual(models.Field("rooms", int, 1).default, 1)
+
+        self.assertTrue(models.Field("name").is_shared)
+        self.assertTrue(models.Field("rooms", int).is_shared)
+        self.assertFalse(models.Field("amenity_ids", list).is_shared)
+
+    def test_defaults_prepared_per_class(self):
+        """Ensure each class prepares the defaults of its fields"""
+
+        self.assertEqual(models.State.__defaults__, {"name": ""})
+        self.assertEqual(models.Place.__defaults__.get("latitude"), 0.0)
+        self.assertEqual(models.Place.__factories__, (("amenity_ids", list),))
+        self.assertEqual(models.BaseModel.__defaults__, {})
+
+    def test_lists_copied_from_kwargs(self):
+        """Ensure lists shared between stored models are not changed"""
+
+        shared = ["wifi"]
+        first = models.Place(amenity_ids=shared)
+        second = models.Place(amenity_ids=shared)
+
+        first.amenity_ids.append("kitchen")
+
+        self.assertEqual(shared, ["wifi"])
+        self.assertEqual(second.amenity_ids, ["wifi"])
+
+    def test_subclass_declaring_fields(self):
+        """Ensure a new model is initialised from its fields"""
+
+        class Listing(models.BaseModel):
+            __FIELDS__ = (
+                models.Field("title"),
+                models.Field("guests", int, 2),
+                models.Field("tags", list),
+            )
+
+        with patch.object(models.storage, "new"):
+            listing = Listing()
+
+        self.assertEqual(listing.title, "")
+        self.assertEqual(listing.guests, 2)
+        self.assertEqual(listing.tags, [])
+        self.assertTrue(listing.id)
+
+    def test_time_ordered_ids(self):
+        """Ensure a model of the `uuid7` scheme is given ordered ids"""
+
+        class Booking(models.BaseModel):
+            __ID_SCHEME__ = "uuid7"
+
+        with patch.object(models.storage, "new"):
+            bookings = [Booking() for _ in range(100)]
+
+        ids = [booking.id for booking in bookings]
+
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(uuid.UUID(ids[0]).version, 7)
+        self.assertEqual(uuid.UUID(models.Place().id).version, 4)
+
+    def test_unknown_id_scheme(self):
+        """Ensure an unknown id scheme is refused"""
+
+        with self.assertRaises(ValueError):
+            class Booking(models.BaseModel):
+                __ID_SCHEME__ = "sequential"
+
 
 class TestReview(unittest.TestCase):
     """Collective testing of base model attributes"""
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""Test suite regarding the compression of stores on file"""
+from importlib import import_module
+from pathlib import Path
+import tempfile
+import unittest
+import gzip
+import lzma
+import zlib
+
+
+compression = import_module("models.engine.compression")
+
+
+class TestOpenStore(unittest.TestCase):
+    """Collective testing of the codecs chosen by suffix"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.text = '{"Place.1": {"name": "Loft"}}' * 5000
+
+    def tearDown(self):
+        """Removes the temporary files"""
+
+        self.directory.cleanup()
+
+    def round_trip(self, name, level=None):
+        """Writes and reads back the text, providing the file's bytes"""
+
+        path = f"{self.directory.name}/{name}"
+
+        with compression.open_store(path, "w", level) as file:
+            file.write(self.text)
+
+        with compression.open_store(path, "r") as file:
+            self.assertEqual(file.read(), self.text)
+
+        return Path(path).read_bytes()
+
+    def test_uncompressed(self):
+        """Ensure stores of other suffixes are written as text"""
+
+        self.assertEqual(self.round_trip("file.json"), self.text.encode())
+
+    def test_gzip(self):
+        """Ensure `.gz` stores are gzip compressed"""
+
+        data = self.round_trip("file.json.gz")
+        self.assertEqual(gzip.decompress(data).decode(), self.text)
+
+    def test_xz(self):
+        """Ensure `.xz` stores are xz compressed"""
+
+        data = self.round_trip("file.json.xz")
+        self.assertEqual(lzma.decompress(data).decode(), self.text)
+
+    def test_zlib(self):
+        """Ensure `.zz` stores are zlib compressed"""
+
+        data = self.round_trip("file.json.zz")
+        self.assertEqual(zlib.decompress(data).decode(), self.text)
+
+    def test_level(self):
+        """Ensure the level chosen is used and validated"""
+
+        fast = self.round_trip("fast.json.zz", 0)
+        small = self.round_trip("small.json.zz", 9)
+
+        self.assertGreater(len(fast), len(self.text))
+        self.assertLess(len(small), len(self.text) // 10)
+
+        with self.assertRaises(ValueError):
+            compression.level_of("file.json.gz", 10)
+
+        self.assertEqual(compression.level_of("file.json.xz"), 6)
+        self.assertIsNone(compression.level_of("file.json", 9))
+
+
+class TestZlibFile(unittest.TestCase):
+    """Collective testing of the zlib stream file"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = f"{self.directory.name}/file.zz"
+
+    def tearDown(self):
+        """Removes the temporary files"""
+
+        self.directory.cleanup()
+
+    def test_streams_in_chunks(self):
+        """Ensure data larger than a chunk is read back whole"""
+
+        data = bytes(range(256)) * 2048
+
+        with compression.ZlibFile(self.path, "w", 1) as file:
+            for start in range(0, len(data), 1000):
+                file.write(data[start:start + 1000])
+
+        with compression.ZlibFile(self.path, "r") as file:
+            self.assertEqual(file.readall(), data)
+
+    def test_empty_stream(self):
+        """Ensure an empty stream is read back as empty"""
+
+        with compression.ZlibFile(self.path, "w"):
+            pass
+
+        with compression.ZlibFile(self.path, "r") as file:
+            self.assertEqual(file.readall(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Test suite regarding locks shared between processes"""
+from importlib import import_module
+import threading
+import tempfile
+import unittest
+
+
+file_lock = import_module("models.engine.file_lock")
+metrics = import_module("models.engine.metrics")
+
+
+@unittest.skipUnless(file_lock.fcntl, "requires fcntl")
+class TestFileLock(unittest.TestCase):
+    """Collective testing of reader/writer locking"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.metrics = metrics.Metrics()
+        self.lock = file_lock.FileLock(
+            f"{self.directory.name}/file.json", self.metrics
+        )
+
+    def tearDown(self):
+        """Removes the temporary files"""
+
+        self.directory.cleanup()
+
+    def acquire_exclusive_in_thread(self):
+        """Starts a thread which holds the exclusive lock briefly"""
+
+        acquired = threading.Event()
+
+        def hold():
+            with self.lock.exclusive():
+                acquired.set()
+
+        thread = threading.Thread(target=hold, daemon=True)
+        thread.start()
+
+        return thread, acquired
+
+    def test_shared_holders_coexist(self):
+        """Ensure many readers may hold the lock at once"""
+
+        with self.lock.shared():
+            with self.lock.shared():
+                pass
+
+        self.assertEqual(self.metrics.get("lock_shared_wait_count"), 2)
+
+    def test_exclusive_waits_on_shared(self):
+        """Ensure a writer waits until readers are done"""
+
+        with self.lock.shared():
+            thread, acquired = self.acquire_exclusive_in_thread()
+            self.assertFalse(acquired.wait(0.05))
+
+        self.assertTrue(acquired.wait(1))
+        thread.join(1)
+
+        self.assertEqual(self.metrics.get("lock_exclusive_wait_count"), 1)
+        self.assertGreater(self.metrics.get("lock_exclusive_wait_seconds"), 0)
+
+    def test_exclusive_waits_on_exclusive(self):
+        """Ensure writers are serialised"""
+
+        with self.lock.exclusive():
+            thread, acquired = self.acquire_exclusive_in_thread()
+            self.assertFalse(acquired.wait(0.05))
+
+        self.assertTrue(acquired.wait(1))
+        thread.join(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,11 +5,40 @@ to file storage and thereby the file system
 """
 from unittest.mock import MagicMock, patch
 from importlib import import_module
+from types import SimpleNamespace
+from datetime import datetime
 from pathlib import Path
+import multiprocessing
+import threading
+import asyncio
+import tempfile
 import unittest
+import json
+import time
 
 
 models = import_module("models")
+file_lock = import_module("models.engine.file_lock")
+
+
+def mock_model(super_id):
+    """Provides a mock model of the given super id"""
+
+    model = MagicMock(super_id=super_id)
+    model.to_dict.return_value = {"id": super_id.split(".")[-1]}
+
+    return model
+
+
+def write_models(file_path, prefix, count):
+    """Saves models one at a time, as a separate process would"""
+
+    storage = models.FileStorage(file_path)
+    storage.reload()
+
+    for number in range(count):
+        storage.new(mock_model(f"BaseModel.{prefix}-{number}"))
+        storage.save()
 
 
 class TestFileStorage(unittest.TestCase):
@@ -102,12 +131,26 @@ class TestNew(TestFileStorage):
 class TestSave(TestFileStorage):
     """Ensure serialisation to JSON file"""
 
+    def assert_replaced(self, mock_open, mock_replace):
+        """Ensure the store is written to a file which replaces it"""
+
+        mock_open.assert_called_once()
+        temporary, mode = mock_open.call_args.args
+
+        self.assertEqual(mode, "w")
+        self.assertTrue(temporary.endswith(".tmp.json"))
+
+        mock_replace.assert_called_once_with(
+            Path(temporary), Path(self.file_path)
+        )
+
+    @patch("os.replace")
     @patch("json.dump")
     @patch("builtins.open")
     @patch("pathlib.Path.touch")
     @patch("pathlib.Path.is_file", return_value=False)
     def test_save_with_no_file_on_system(
-        self, mock_is_file, mock_touch, mock_open, mock_dump
+        self, mock_is_file, mock_touch, mock_open, mock_dump, mock_replace
     ):
         """Ensure creates a new file if none present"""
 
@@ -116,13 +159,16 @@ class TestSave(TestFileStorage):
         mock_is_file.assert_called_once_with()
         mock_touch.assert_called_once()
 
-        mock_open.assert_called_once_with(self.file_path, "w")
+        self.assert_replaced(mock_open, mock_replace)
         mock_dump.assert_called_once_with({}, mock_open().__enter__())
 
+    @patch("os.replace")
     @patch("json.dump")
     @patch("builtins.open")
     @patch("pathlib.Path.is_file", return_value=True)
-    def test_save_with_cached_models(self, mock_if_file, mock_open, mock_dump):
+    def test_save_with_cached_models(
+        self, mock_if_file, mock_open, mock_dump, mock_replace
+    ):
         """Ensures writes to file when cached models present"""
 
         cache = {self.model_00.super_id: self.model_00.to_dict()}
@@ -130,10 +176,61 @@ class TestSave(TestFileStorage):
         self.storage.new(self.model_00)
         self.storage.save()
 
-        mock_open.assert_called_once_with(self.file_path, "w")
+        self.assert_replaced(mock_open, mock_replace)
         mock_dump.assert_called_once_with(cache, mock_open().__enter__())
 
 
+class TestBatch(TestFileStorage):
+    """Ensure writes are deferred until a batch is exited"""
+
+    @patch("os.replace")
+    @patch("json.dump")
+    @patch("builtins.open")
+    @patch("pathlib.Path.is_file", return_value=True)
+    def test_batch_defers_saves_into_single_write(
+        self, mock_is_file, mock_open, mock_dump, mock_replace
+    ):
+        """Ensure many saves within a batch result in one write"""
+
+        with self.storage.batch():
+            self.storage.new(self.model_00)
+            self.storage.save()
+            self.storage.new(self.model_01)
+            self.storage.save()
+
+            mock_dump.assert_not_called()
+
+        mock_dump.assert_called_once()
+
+    @patch("os.replace")
+    @patch("json.dump")
+    @patch("builtins.open")
+    @patch("pathlib.Path.is_file", return_value=True)
+    def test_nested_batch_writes_on_outermost_exit(
+        self, mock_is_file, mock_open, mock_dump, mock_replace
+    ):
+        """Ensure only the outermost batch triggers the write"""
+
+        with self.storage.batch():
+            with self.storage.batch():
+                self.storage.save()
+
+            mock_dump.assert_not_called()
+
+        mock_dump.assert_called_once()
+
+    @patch("json.dump")
+    @patch("builtins.open")
+    def test_batch_without_saves_does_not_write(self, mock_open, mock_dump):
+        """Ensure a batch with no saves leaves the file untouched"""
+
+        with self.storage.batch():
+            self.storage.new(self.model_00)
+
+        mock_open.assert_not_called()
+        mock_dump.assert_not_called()
+
+
 class TestReload(TestFileStorage):
     """Assert deserialisation to json file"""
 
@@ -214,5 +311,1362 @@ class TestReload(TestFileStorage):
         mock_load.assert_called_once()
 
 
+class TestOnDisk(TestFileStorage):
+    """Setup storage bound to a temporary file"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_path = f"{self.directory.name}/file.json"
+        self.storage = models.FileStorage(self.file_path)
+
+    def tearDown(self):
+        """Removes the temporary file"""
+
+        self.directory.cleanup()
+
+
+class TestLazyReload(TestOnDisk):
+    """Ensure a lazy reload reads the file on first access alone"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+        write_models(self.file_path, "saved", 3)
+
+        self.lazy = models.FileStorage(self.file_path)
+        self.lazy.reload(lazy=True)
+
+    def reloads(self):
+        """Number of times the file was read"""
+
+        return self.lazy.metrics().get("reloads_total", 0)
+
+    def test_file_unread_until_accessed(self):
+        """Ensure the file is read once, on first access"""
+
+        self.assertNotIn("reloads_total", self.lazy.metrics())
+
+        self.assertEqual(len(self.lazy.all()), 3)
+        self.assertEqual(len(self.lazy.snapshot()), 3)
+        self.assertEqual(self.reloads(), 1)
+
+    def test_refresh_leaves_file_unread(self):
+        """Ensure a refresh defers to the first access"""
+
+        write_models(self.file_path, "other", 1)
+
+        self.assertFalse(self.lazy.refresh())
+        self.assertEqual(self.reloads(), 0)
+        self.assertEqual(len(self.lazy.all()), 4)
+
+    def test_changes_keep_stored_models(self):
+        """Ensure changes before any read are applied to stored models"""
+
+        self.lazy.new(mock_model("BaseModel.new"))
+        self.lazy.save()
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+
+        self.assertEqual(len(other.all()), 4)
+        self.assertEqual(self.reloads(), 1)
+
+    def test_delete_before_read(self):
+        """Ensure a stored model may be deleted before any read"""
+
+        self.assertIsNotNone(self.lazy.delete("BaseModel.saved-0"))
+        self.assertEqual(len(self.lazy.all()), 2)
+
+    def test_index_before_read(self):
+        """Ensure indexes are built over the stored models"""
+
+        self.assertEqual(self.lazy.page("BaseModel"), [
+            "BaseModel.saved-0", "BaseModel.saved-1", "BaseModel.saved-2"
+        ])
+
+    def test_file_read_once_by_racing_threads(self):
+        """Ensure threads first accessing at once read the file once"""
+
+        read = self.lazy.__read__
+
+        def slow_read(*args):
+            time.sleep(0.05)
+            return read(*args)
+
+        def add(number):
+            self.lazy.new(mock_model(f"BaseModel.new-{number}"))
+
+        threads = [
+            threading.Thread(target=add, args=(number,))
+            for number in range(4)
+        ]
+
+        with patch.object(self.lazy, "__read__", slow_read):
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(self.reloads(), 1)
+        self.assertEqual(len(self.lazy.all()), 7)
+
+    def test_missing_file(self):
+        """Ensure a lazy reload of no file leaves storage empty"""
+
+        storage = models.FileStorage(f"{self.file_path}.missing")
+        storage.reload(lazy=True)
+
+        self.assertEqual(dict(storage.all()), {})
+        self.assertFalse(storage.refresh())
+
+
+class TestMetrics(TestOnDisk):
+    """Ensure storage operations are measured"""
+
+    def test_metrics_of_fresh_storage(self):
+        """Ensure a new instance has measured nothing"""
+
+        metrics = self.storage.metrics()
+
+        self.assertEqual(metrics.get("objects"), 0)
+        self.assertEqual(metrics.get("write_amplification"), 0)
+        self.assertNotIn("saves_total", metrics)
+
+    def test_metrics_of_save_and_reload(self):
+        """Ensure saves and reloads are counted and timed"""
+
+        self.storage.new(self.model_00)
+        self.storage.new(self.model_01)
+        self.storage.save()
+        self.storage.reload()
+
+        metrics = self.storage.metrics()
+        size = Path(self.file_path).stat().st_size
+
+        self.assertEqual(metrics.get("saves_total"), 1)
+        self.assertEqual(metrics.get("reloads_total"), 1)
+        self.assertEqual(metrics.get("bytes_written_total"), size)
+        self.assertEqual(metrics.get("bytes_read_total"), size)
+        self.assertEqual(metrics.get("objects_serialised_total"), 2)
+        self.assertEqual(metrics.get("json_dump_count"), 1)
+        self.assertEqual(metrics.get("json_load_count"), 1)
+        self.assertGreater(metrics.get("json_dump_seconds"), 0)
+        self.assertEqual(metrics.get("write_amplification"), size / 2)
+
+    def test_metrics_of_cache_lookups(self):
+        """Ensure lookups are counted as hits or misses"""
+
+        self.storage.new(self.model_00)
+
+        self.assertEqual(
+            self.storage.get(self.model_00.super_id),
+            self.model_00.to_dict(),
+        )
+        self.assertIsNone(self.storage.get(self.model_01.super_id))
+
+        metrics = self.storage.metrics()
+
+        self.assertEqual(metrics.get("cache_hits_total"), 1)
+        self.assertEqual(metrics.get("cache_misses_total"), 1)
+
+    def test_delete_counts_only_tracked_models(self):
+        """Ensure deleting an untracked key is not a change"""
+
+        self.storage.new(self.model_00)
+
+        self.assertIsNotNone(self.storage.delete(self.model_00.super_id))
+        self.assertIsNone(self.storage.delete(self.model_00.super_id))
+        self.assertEqual(self.storage.metrics().get("changes_total"), 2)
+
+    def test_prometheus_export(self):
+        """Ensure metrics are written in the Prometheus text format"""
+
+        path = f"{self.directory.name}/storage.prom"
+
+        self.storage.save()
+        self.storage.export_metrics(path)
+
+        text = Path(path).read_text()
+
+        self.assertIn("# TYPE airbnb_storage_saves_total counter", text)
+        self.assertIn("airbnb_storage_saves_total 1", text)
+        self.assertIn("# TYPE airbnb_storage_objects gauge", text)
+
+    def test_periodic_prometheus_export(self):
+        """Ensure metrics are written periodically until stopped"""
+
+        path = Path(f"{self.directory.name}/storage.prom")
+
+        self.storage.export_metrics(str(path), interval=0.01)
+        time.sleep(0.05)
+        self.storage.save()
+        self.storage.export_metrics(str(path), interval=None)
+
+        self.assertIn("airbnb_storage_saves_total 1", path.read_text())
+
+
+class TestPage(TestOnDisk):
+    """Ensure models can be paged through in order of id"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        for number in [3, 1, 4, 0, 2]:
+            self.storage.new(mock_model(f"User.{number}"))
+
+        self.storage.new(mock_model("Place.9"))
+
+    def test_pages_follow_one_another(self):
+        """Ensure each page starts after the last of the previous"""
+
+        self.assertEqual(
+            self.storage.page("User", limit=2), ["User.0", "User.1"]
+        )
+        self.assertEqual(
+            self.storage.page("User", "1", 2), ["User.2", "User.3"]
+        )
+        self.assertEqual(self.storage.page("User", "3", 2), ["User.4"])
+        self.assertEqual(self.storage.page("Place", limit=None), ["Place.9"])
+        self.assertEqual(self.storage.page("Review"), [])
+
+    def test_complete(self):
+        """Ensure ids are completed from the same index as pages"""
+
+        self.storage.new(mock_model("User.30"))
+
+        self.assertEqual(self.storage.complete("User", "3"), ["3", "30"])
+        self.assertEqual(self.storage.complete("User", "3", 1), ["3"])
+        self.assertEqual(self.storage.complete("Place", "3"), [])
+
+    def test_index_is_built_once(self):
+        """Ensure the index is built on first use alone"""
+
+        self.storage.page("User")
+        self.storage.page("User")
+
+        self.assertEqual(
+            self.storage.metrics().get("index_ids_build_count"), 1
+        )
+
+    def test_index_follows_changes(self):
+        """Ensure models added and deleted after building are paged"""
+
+        self.storage.page("User")
+        self.storage.new(mock_model("User.25"))
+        self.storage.delete("User.3")
+
+        self.assertEqual(
+            self.storage.page("User", "2"), ["User.25", "User.4"]
+        )
+        self.assertEqual(
+            self.storage.metrics().get("index_ids_build_count"), 1
+        )
+
+    def test_index_follows_reload(self):
+        """Ensure the index is built anew from a reloaded store"""
+
+        self.storage.save()
+        self.storage.page("User")
+        self.storage.delete("User.0")
+        self.storage.reload()
+
+        self.assertEqual(self.storage.page("User", limit=1), ["User.0"])
+        self.assertEqual(
+            self.storage.metrics().get("index_ids_build_count"), 2
+        )
+
+    def test_index_follows_changes_made_by_others(self):
+        """Ensure models merged from file are paged"""
+
+        self.storage.save()
+        self.storage.page("User")
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+        other.delete("User.1")
+        other.new(mock_model("User.5"))
+        other.save()
+
+        self.storage.refresh()
+
+        self.assertEqual(
+            self.storage.page("User"),
+            ["User.0", "User.2", "User.3", "User.4", "User.5"],
+        )
+
+
+class TestSearch(TestOnDisk):
+    """Ensure models can be searched by their text"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        self.storage.add_index("search", self.text_index())
+        self.review("a", "Quiet garden, quiet street")
+        self.review("b", "A noisy street near the station")
+
+    @staticmethod
+    def text_index():
+        """Provides an index of the text of reviews"""
+
+        return models.TextIndex({"Review": ("text",)})
+
+    def review(self, instance_id, text, storage=None):
+        """Adds a review of the given text to storage"""
+
+        model = mock_model(f"Review.{instance_id}")
+        model.to_dict.return_value = {"id": instance_id, "text": text}
+
+        (storage or self.storage).new(model)
+
+    def test_search(self):
+        """Ensure reviews are ranked by relevance"""
+
+        results = self.storage.search("Review", "quiet street")
+
+        self.assertEqual([key for key, _ in results], ["Review.a", "Review.b"])
+        self.assertGreater(results[0][1], results[1][1])
+
+    def test_search_follows_changes(self):
+        """Ensure reviews changed and deleted after building are found"""
+
+        self.storage.search("Review", "street")
+        self.review("b", "Lovely garden")
+        self.storage.delete("Review.a")
+
+        results = self.storage.search("Review", "garden street")
+
+        self.assertEqual([key for key, _ in results], ["Review.b"])
+
+    def test_index_persisted_alongside_store(self):
+        """Ensure a saved index is loaded rather than built"""
+
+        self.storage.search("Review", "street")
+        self.storage.save()
+
+        other = models.FileStorage(self.file_path)
+        other.add_index("search", self.text_index())
+        other.reload()
+
+        results = other.search("Review", "quiet street")
+        metrics = other.metrics()
+
+        self.assertEqual(
+            results, self.storage.search("Review", "quiet street")
+        )
+        self.assertEqual(metrics.get("index_search_load_count"), 1)
+        self.assertNotIn("index_search_build_count", metrics)
+
+    def test_unchanged_index_not_rewritten(self):
+        """Ensure an index is serialised only once changed"""
+
+        self.storage.search("Review", "street")
+        self.storage.save()
+
+        for _ in range(3):
+            self.storage.new(mock_model("User.unindexed"))
+            self.storage.save()
+
+        self.assertEqual(
+            self.storage.metrics().get("index_search_dump_count"), 1
+        )
+
+        other = models.FileStorage(self.file_path)
+        other.add_index("search", self.text_index())
+        other.reload()
+        other.search("Review", "street")
+
+        self.assertEqual(other.metrics().get("index_search_load_count"), 1)
+
+        self.review("c", "Quiet castle")
+        self.storage.save()
+
+        self.assertEqual(
+            self.storage.metrics().get("index_search_dump_count"), 2
+        )
+
+    def test_index_serialised_without_mutex(self):
+        """Ensure models may be changed while an index is serialised"""
+
+        index = self.text_index()
+        self.storage.add_index("search", index)
+        self.storage.search("Review", "street")
+
+        to_dict = index.to_dict
+
+        def slow_to_dict():
+            time.sleep(0.3)
+            return to_dict()
+
+        with patch.object(index, "to_dict", side_effect=slow_to_dict):
+            saving = threading.Thread(target=self.storage.save)
+            saving.start()
+            time.sleep(0.1)
+
+            start = time.monotonic()
+            self.review("c", "Quiet castle")
+            changing = time.monotonic() - start
+
+            saving.join()
+
+        self.assertLess(changing, 0.2)
+        self.storage.save()
+
+        other = models.FileStorage(self.file_path)
+        other.add_index("search", self.text_index())
+        other.reload()
+
+        results = other.search("Review", "castle")
+
+        self.assertEqual([key for key, _ in results], ["Review.c"])
+        self.assertEqual(other.metrics().get("index_search_load_count"), 1)
+
+    def test_stale_persisted_index_is_rebuilt(self):
+        """Ensure an index older than the store is not loaded"""
+
+        self.storage.search("Review", "street")
+        self.storage.save()
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+        self.review("c", "Quiet castle", other)
+        other.save()
+
+        latest = models.FileStorage(self.file_path)
+        latest.add_index("search", self.text_index())
+        latest.reload()
+
+        results = latest.search("Review", "castle")
+
+        self.assertEqual([key for key, _ in results], ["Review.c"])
+        self.assertEqual(latest.metrics().get("index_search_build_count"), 1)
+
+
+class TestWhere(TestOnDisk):
+    """Ensure models can be selected by their attribute values"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        self.place("a", city_id="x", max_guest=2)
+        self.place("b", city_id="x", max_guest=4)
+        self.place("c", city_id="y", max_guest=2)
+
+    def place(self, instance_id, **attributes):
+        """Adds a place of the given attributes to storage"""
+
+        model = mock_model(f"Place.{instance_id}")
+        model.to_dict.return_value = {"id": instance_id, **attributes}
+
+        self.storage.new(model)
+
+    def test_where(self):
+        """Ensure the models matching all conditions are provided"""
+
+        where = self.storage.where
+
+        self.assertEqual(
+            where("Place", {"city_id": "x"}), ["Place.a", "Place.b"]
+        )
+        self.assertEqual(
+            where("Place", {"city_id": "x", "max_guest": 2}), ["Place.a"]
+        )
+        self.assertEqual(where("Place", {"name": "x"}), [])
+        self.assertEqual(where("City", {"city_id": "x"}), [])
+
+    def test_where_through_index(self):
+        """Ensure indexed attributes are looked up and kept current"""
+
+        self.storage.add_index(
+            "values", models.ValueIndex({"Place": ("city_id",)})
+        )
+
+        self.assertEqual(
+            self.storage.where("Place", {"city_id": "x", "max_guest": 4}),
+            ["Place.b"],
+        )
+
+        self.place("b", city_id="y", max_guest=4)
+        self.storage.delete("Place.a")
+
+        self.assertEqual(self.storage.where("Place", {"city_id": "x"}), [])
+        self.assertEqual(
+            self.storage.where("Place", {"city_id": "y"}),
+            ["Place.b", "Place.c"],
+        )
+        self.assertEqual(
+            self.storage.metrics().get("index_values_build_count"), 1
+        )
+
+
+class TestSnapshot(TestOnDisk):
+    """Ensure snapshots are unaffected by later changes"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        for instance_id in ("a", "b"):
+            self.storage.new(mock_model(f"BaseModel.{instance_id}"))
+
+    def test_snapshot_is_unaffected_by_changes(self):
+        """Ensure models added, changed and deleted are not seen"""
+
+        snapshot = self.storage.snapshot()
+
+        changed = mock_model("BaseModel.a")
+        changed.to_dict.return_value = {"id": "a", "name": "changed"}
+
+        self.storage.new(mock_model("BaseModel.c"))
+        self.storage.new(changed)
+        self.storage.delete("BaseModel.b")
+
+        self.assertEqual(list(snapshot), ["BaseModel.a", "BaseModel.b"])
+        self.assertEqual(snapshot["BaseModel.a"], {"id": "a"})
+        self.assertEqual(
+            set(self.storage.snapshot()), {"BaseModel.a", "BaseModel.c"}
+        )
+
+    def test_snapshot_is_unaffected_by_merges(self):
+        """Ensure models merged in from file are not seen"""
+
+        self.storage.save()
+        snapshot = self.storage.snapshot()
+
+        write_models(self.file_path, "other", 2)
+        self.storage.refresh()
+
+        self.assertEqual(len(snapshot), 2)
+        self.assertEqual(len(self.storage.snapshot()), 4)
+
+    def test_snapshot_is_read_only(self):
+        """Ensure a snapshot cannot be changed"""
+
+        snapshot = self.storage.snapshot()
+
+        with self.assertRaises(TypeError):
+            snapshot["BaseModel.c"] = {"id": "c"}
+
+    def test_cache_is_copied_once_per_snapshot(self):
+        """Ensure snapshots are free and copied by the first change"""
+
+        for _ in range(3):
+            self.storage.snapshot()
+
+        self.assertNotIn("snapshot_copy_count", self.storage.metrics())
+
+        for instance_id in ("c", "d"):
+            self.storage.new(mock_model(f"BaseModel.{instance_id}"))
+
+        metrics = self.storage.metrics()
+
+        self.assertEqual(metrics.get("snapshots_total"), 3)
+        self.assertEqual(metrics.get("snapshot_copy_count"), 1)
+
+
+class TestCompressedStore(TestOnDisk):
+    """Ensure stores are compressed according to their suffix"""
+
+    SUFFIXES = (".gz", ".xz", ".zz")
+
+    def store(self, suffix, level=None):
+        """Provides a storage of compressed models saved to file"""
+
+        storage = models.FileStorage(f"{self.file_path}{suffix}", level)
+
+        for number in range(100):
+            model = mock_model(f"BaseModel.{number}")
+            model.to_dict.return_value = {"id": number, "name": "Loft"}
+            storage.new(model)
+
+        storage.save()
+        return storage
+
+    def test_save_and_reload(self):
+        """Ensure compressed stores are read back as saved"""
+
+        for suffix in self.SUFFIXES:
+            storage = self.store(suffix)
+
+            other = models.FileStorage(f"{self.file_path}{suffix}")
+            other.reload()
+
+            self.assertEqual(dict(other.all()), dict(storage.all()))
+
+    def test_store_is_smaller(self):
+        """Ensure compressed stores are smaller than uncompressed"""
+
+        plain = self.store("").metrics().get("bytes_written_total")
+
+        for suffix in self.SUFFIXES:
+            written = self.store(suffix).metrics().get("bytes_written_total")
+            path = Path(f"{self.file_path}{suffix}")
+
+            self.assertEqual(written, path.stat().st_size)
+            self.assertLess(written, plain / 4)
+
+    def test_refresh_merges_compressed_store(self):
+        """Ensure changes by other processes are merged when compressed"""
+
+        storage = self.store(".gz", level=1)
+        write_models(f"{self.file_path}.gz", "other", 2)
+
+        self.assertTrue(storage.refresh())
+        self.assertEqual(len(storage.all()), 102)
+
+    def test_invalid_level(self):
+        """Ensure an invalid compression level is refused"""
+
+        with self.assertRaises(ValueError):
+            models.FileStorage(f"{self.file_path}.xz", level=11)
+
+
+class TestInterning(TestOnDisk):
+    """Ensure values repeated between models are shared on reload"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        for number in range(3):
+            model = mock_model(f"Place.{number}")
+            model.to_dict.return_value = {
+                "__class__": "Place",
+                "amenity_ids": ["wifi", "kitchen"],
+                "city_id": "c6b4a0f2-3d1e-4f5a-9b8c-7d6e5f4a3b2c",
+                "id": str(number),
+            }
+            self.storage.new(model)
+
+        self.storage.save()
+
+    def test_reload_shares_values(self):
+        """Ensure equal strings and small lists are one object"""
+
+        storage = models.FileStorage(self.file_path)
+        storage.reload()
+
+        first, *others = storage.all().values()
+
+        for other in others:
+            for key in ["__class__", "amenity_ids", "city_id"]:
+                self.assertIs(other[key], first[key])
+
+        self.assertGreater(
+            storage.metrics().get("interned_values_total"), 0
+        )
+
+    def test_restore_shares_values(self):
+        """Ensure models restored share their repeated values"""
+
+        storage = models.FileStorage(f"{self.file_path}.copy")
+        storage.restore(self.file_path)
+
+        first, *others = storage.all().values()
+
+        for other in others:
+            self.assertIs(other["city_id"], first["city_id"])
+
+
+class TestBackup(TestOnDisk):
+    """Ensure changes can be backed up incrementally and restored"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        self.place("a", "2024-05-27T09:00:00")
+        self.place("b", "2024-05-27T10:00:00")
+        self.storage.save()
+
+    def place(self, instance_id, updated_at, storage=None):
+        """Adds a place updated at the given time to storage"""
+
+        model = mock_model(f"Place.{instance_id}")
+        model.to_dict.return_value = {
+            "id": instance_id, "updated_at": updated_at
+        }
+
+        (storage or self.storage).new(model)
+
+    def path(self, name):
+        """Provides the location of a backup"""
+
+        return f"{self.directory.name}/{name}"
+
+    def read(self, name):
+        """Deserialises a backup"""
+
+        return json.loads(Path(self.path(name)).read_text())
+
+    def test_full_backup(self):
+        """Ensure all models are backed up where no time is given"""
+
+        counts = self.storage.backup(self.path("base.json"))
+        backup = self.read("base.json")
+
+        self.assertEqual(counts, (2, 0))
+        self.assertIsNone(backup.get("since"))
+        self.assertEqual(backup.get("objects"), dict(self.storage.all()))
+
+    def test_incremental_backup(self):
+        """Ensure only models changed and deleted since are backed up"""
+
+        self.place("c", "2024-05-28T00:00:00")
+        self.storage.delete("Place.a")
+
+        counts = self.storage.backup(
+            self.path("monday.json"), "2024-05-27T09:30:00"
+        )
+        backup = self.read("monday.json")
+
+        self.assertEqual(counts, (2, 1))
+        self.assertEqual(set(backup.get("objects")), {"Place.b", "Place.c"})
+        self.assertEqual(list(backup.get("deleted")), ["Place.a"])
+
+    def test_tombstones_are_kept_on_file(self):
+        """Ensure deletions by other processes are backed up"""
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+        other.delete("Place.b")
+        other.save()
+
+        self.storage.refresh()
+        _, deleted = self.storage.changes("2024-01-01")
+
+        self.assertEqual(list(deleted), ["Place.b"])
+        self.assertTrue(Path(f"{self.file_path}.tombstones").is_file())
+
+    def test_compact(self):
+        """Ensure tombstones up to the time given are dropped"""
+
+        self.place("c", "2024-05-28T00:00:00")
+        self.storage.delete("Place.a")
+        self.storage.save()
+        self.storage.delete("Place.b")
+
+        before = datetime.now().isoformat()
+        self.storage.delete("Place.c")
+
+        self.assertEqual(self.storage.compact(before), 2)
+        self.storage.save()
+
+        _, deleted = self.storage.changes()
+        on_file = json.loads(Path(f"{self.file_path}.tombstones").read_text())
+
+        self.assertEqual(list(deleted), ["Place.c"])
+        self.assertEqual(list(on_file), ["Place.c"])
+        self.assertEqual(self.storage.compact(before), 0)
+
+    def test_recreated_models_are_not_tombstoned(self):
+        """Ensure a model deleted and added anew is not a deletion"""
+
+        self.storage.delete("Place.a")
+        self.storage.save()
+        self.place("a", "2024-05-29T00:00:00")
+
+        objects, deleted = self.storage.changes("2024-05-28")
+
+        self.assertEqual(list(objects), ["Place.a"])
+        self.assertEqual(deleted, {})
+
+    def test_restore(self):
+        """Ensure incremental backups are merged onto a full one"""
+
+        self.storage.backup(self.path("base.json.gz"))
+
+        self.place("c", "2024-05-28T00:00:00")
+        self.storage.delete("Place.a")
+        self.storage.backup(self.path("monday.json"), "2024-05-27T23:00")
+
+        self.place("b", "2024-05-29T00:00:00")
+        self.storage.backup(self.path("tuesday.json"), "2024-05-28T23:00")
+
+        expect = dict(self.storage.all())
+
+        self.storage.delete("Place.b")
+        self.place("d", "2024-05-30T00:00:00")
+
+        count = self.storage.restore(
+            self.path("base.json.gz"),
+            self.path("monday.json"),
+            self.path("tuesday.json"),
+        )
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+
+        self.assertEqual(count, 2)
+        self.assertEqual(dict(self.storage.all()), expect)
+        self.assertEqual(dict(other.all()), expect)
+        self.assertEqual(self.storage.page("Place"), ["Place.b", "Place.c"])
+
+    def test_restore_onto_store(self):
+        """Ensure a copy of a store serves as a full backup"""
+
+        expect = dict(self.storage.all())
+        copy = Path(self.path("copy.json"))
+        copy.write_bytes(Path(self.file_path).read_bytes())
+
+        self.storage.delete("Place.a")
+        self.place("c", "2024-05-28T00:00:00")
+        self.storage.save()
+
+        self.assertEqual(self.storage.restore(str(copy)), 2)
+        self.assertEqual(dict(self.storage.all()), expect)
+
+
+class TestSharedStore(TestOnDisk):
+    """Ensure many writers of one store do not lose changes"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        self.other = models.FileStorage(self.file_path)
+        self.storage.reload()
+        self.other.reload()
+
+    def stored_keys(self):
+        """Provides the keys presently on file"""
+
+        storage = models.FileStorage(self.file_path)
+        storage.reload()
+
+        return set(storage.all())
+
+    def test_save_keeps_models_saved_by_others(self):
+        """Ensure a stale writer merges in others' models"""
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+
+        self.other.new(self.model_01)
+        self.other.save()
+
+        expect = {self.model_00.super_id, self.model_01.super_id}
+
+        self.assertEqual(self.stored_keys(), expect)
+        self.assertEqual(set(self.other.all()), expect)
+        self.assertEqual(self.other.metrics().get("merges_total"), 1)
+
+    def test_save_keeps_deletions_made_by_others(self):
+        """Ensure a stale writer does not resurrect deleted models"""
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+        self.other.reload()
+
+        self.storage.delete(self.model_00.super_id)
+        self.storage.save()
+
+        self.other.new(self.model_01)
+        self.other.save()
+
+        self.assertEqual(self.stored_keys(), {self.model_01.super_id})
+
+    def test_save_without_changes_by_others_does_not_read(self):
+        """Ensure the file is only read when changed by others"""
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+        merges = self.storage.metrics().get("merges_total")
+
+        self.storage.new(self.model_01)
+        self.storage.save()
+
+        self.assertEqual(self.storage.metrics().get("merges_total"), merges)
+
+    def test_refresh_when_unchanged(self):
+        """Ensure refreshing an unchanged file does not read it"""
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+
+        with patch("json.load") as mock_load:
+            self.assertFalse(self.storage.refresh())
+            mock_load.assert_not_called()
+
+    def test_refresh_applies_changes_by_others(self):
+        """Ensure models added or deleted by others are applied"""
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+        self.other.refresh()
+
+        self.storage.delete(self.model_00.super_id)
+        self.storage.new(self.model_01)
+        self.storage.save()
+
+        self.assertTrue(self.other.refresh())
+        self.assertEqual(set(self.other.all()), {self.model_01.super_id})
+        self.assertFalse(self.other.refresh())
+
+        metrics = self.other.metrics()
+
+        self.assertEqual(metrics.get("refreshes_total"), 2)
+        self.assertEqual(metrics.get("merged_objects_total"), 3)
+
+    def test_refresh_only_applies_changed_models(self):
+        """Ensure unchanged models are left as they are in cache"""
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+        self.other.refresh()
+
+        cached = self.other.all().get(self.model_00.super_id)
+
+        self.storage.new(self.model_01)
+        self.storage.save()
+        self.other.refresh()
+
+        self.assertIs(self.other.all().get(self.model_00.super_id), cached)
+
+    def test_refresh_keeps_unsaved_changes(self):
+        """Ensure a refresh does not discard changes yet to be saved"""
+
+        self.other.new(self.model_01)
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+        self.other.refresh()
+
+        expect = {self.model_00.super_id, self.model_01.super_id}
+        self.assertEqual(set(self.other.all()), expect)
+
+    @unittest.skipUnless(file_lock.fcntl, "requires fcntl")
+    def test_concurrent_processes(self):
+        """Ensure processes writing at once lose no models"""
+
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(
+                target=write_models, args=(self.file_path, prefix, 25)
+            )
+            for prefix in range(4)
+        ]
+
+        for process in processes:
+            process.start()
+
+        for process in processes:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+
+        self.assertEqual(len(self.stored_keys()), 100)
+
+
+class TestAsync(TestOnDisk):
+    """Ensure storage is usable from an event loop"""
+
+    def test_asave_writes_to_file(self):
+        """Ensure asynchronous saves are written"""
+
+        self.storage.new(self.model_00)
+        asyncio.run(self.storage.asave())
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+
+        self.assertEqual(set(other.all()), {self.model_00.super_id})
+
+    def test_concurrent_asaves_are_coalesced(self):
+        """Ensure concurrent requests share writes"""
+
+        async def save_concurrently():
+            self.storage.new(self.model_00)
+            await asyncio.gather(*(self.storage.asave() for _ in range(10)))
+
+        asyncio.run(save_concurrently())
+        metrics = self.storage.metrics()
+
+        self.assertEqual(metrics.get("async_save_requests_total"), 10)
+        self.assertLessEqual(metrics.get("saves_total"), 2)
+
+    def test_asave_propagates_failure(self):
+        """Ensure a failed write is raised to every waiting caller"""
+
+        async def save_concurrently():
+            return await asyncio.gather(
+                *(self.storage.asave() for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        with patch.object(self.storage, "save", side_effect=OSError):
+            results = asyncio.run(save_concurrently())
+
+        self.assertTrue(all(isinstance(r, OSError) for r in results))
+
+    def test_cancelled_asave_leaves_later_asaves(self):
+        """Ensure a cancelled caller leaves no request waiting forever"""
+
+        def slow_save():
+            time.sleep(0.1)
+
+        async def cancel_then_save():
+            running = asyncio.ensure_future(self.storage.asave())
+            await asyncio.sleep(0.01)
+
+            queued = asyncio.ensure_future(self.storage.asave())
+            await asyncio.sleep(0.01)
+            queued.cancel()
+
+            await running
+            await asyncio.wait_for(self.storage.asave(), 2)
+
+            return queued.cancelled()
+
+        with patch.object(self.storage, "save", side_effect=slow_save):
+            self.assertTrue(asyncio.run(cancel_then_save()))
+
+        self.assertEqual(
+            self.storage.metrics().get("async_saves_total"), 3
+        )
+
+    def test_cancelled_write_leaves_later_asaves(self):
+        """Ensure a write cancelled, begun or not, blocks no request"""
+
+        def slow_save():
+            time.sleep(0.05)
+
+        async def cancel_write_then_save(delay):
+            waiter = asyncio.ensure_future(self.storage.asave())
+            await asyncio.sleep(delay)
+
+            for task in asyncio.all_tasks():
+                if task not in (asyncio.current_task(), waiter):
+                    task.cancel()
+
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+
+            await asyncio.wait_for(self.storage.asave(), 2)
+
+        with patch.object(self.storage, "save", side_effect=slow_save):
+            for delay in (0, 0.01):
+                asyncio.run(cancel_write_then_save(delay))
+
+        self.assertEqual(
+            self.storage.metrics().get("async_saves_total"), 2
+        )
+
+    def test_areload_and_aget(self):
+        """Ensure models written by others are read asynchronously"""
+
+        other = models.FileStorage(self.file_path)
+        other.new(self.model_00)
+        other.save()
+
+        asyncio.run(self.storage.areload())
+        self.assertIn(self.model_00.super_id, self.storage.all())
+
+        other.new(self.model_01)
+        other.save()
+
+        dict_ = asyncio.run(self.storage.aget(self.model_01.super_id))
+        self.assertEqual(dict_, self.model_01.to_dict())
+
+    def test_aiter_yields_models_of_class(self):
+        """Ensure iteration is scoped to the given class"""
+
+        async def collect():
+            return [
+                dict_ async for dict_ in self.storage.aiter("Place", 2)
+            ]
+
+        for number in range(5):
+            self.storage.new(mock_model(f"Place.{number}"))
+
+        self.storage.new(mock_model("City.elsewhere"))
+        ids = sorted(dict_.get("id") for dict_ in asyncio.run(collect()))
+
+        self.assertEqual(ids, ["0", "1", "2", "3", "4"])
+
+
+class TestWriteBehind(TestOnDisk):
+    """Ensure saves may be written by a background thread"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        super().setUp()
+
+        patcher = patch("atexit.register")
+        self.mock_register = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Stops the background thread before removing the file"""
+
+        self.storage.write_behind(None)
+        super().tearDown()
+
+    def saves(self):
+        """Provides the number of writes made to file"""
+
+        return self.storage.metrics().get("saves_total", 0)
+
+    def wait_for_saves(self, expect, timeout=2):
+        """Waits for the background thread to write"""
+
+        deadline = time.monotonic() + timeout
+
+        while self.saves() < expect and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+        return self.saves()
+
+    def test_save_returns_before_writing(self):
+        """Ensure saving only marks the store as changed"""
+
+        self.storage.write_behind(interval=60)
+        self.storage.new(self.model_00)
+        self.storage.save()
+
+        self.assertEqual(self.saves(), 0)
+        self.assertTrue(self.storage.flush())
+        self.assertFalse(self.storage.flush())
+        self.assertEqual(self.saves(), 1)
+
+    def test_write_after_interval(self):
+        """Ensure changes are written once the interval passes"""
+
+        self.storage.write_behind(interval=0.01)
+        self.storage.new(self.model_00)
+        self.storage.save()
+
+        self.assertEqual(self.wait_for_saves(1), 1)
+
+    def test_write_after_threshold(self):
+        """Ensure changes are written once enough saves are made"""
+
+        self.storage.write_behind(interval=60, threshold=3)
+
+        for _ in range(3):
+            self.storage.save()
+
+        self.assertEqual(self.wait_for_saves(1), 1)
+
+    def test_saves_are_coalesced(self):
+        """Ensure many saves amount to few writes"""
+
+        self.storage.write_behind(interval=0.05)
+
+        for _ in range(100):
+            self.storage.new(self.model_00)
+            self.storage.save()
+
+        self.storage.flush()
+
+        self.assertGreaterEqual(self.saves(), 1)
+        self.assertLessEqual(self.saves(), 3)
+
+    def test_failed_write_is_retried(self):
+        """Ensure a failed write keeps the store and its changes"""
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+
+        self.storage.write_behind(interval=60)
+        self.storage.new(self.model_01)
+        self.storage.save()
+
+        with patch("json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.storage.flush()
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+
+        self.assertEqual(set(other.all()), {self.model_00.super_id})
+        self.assertEqual(list(Path(self.directory.name).glob("*.tmp*")), [])
+
+        self.assertTrue(self.storage.flush())
+        other.reload()
+
+        self.assertEqual(len(other.all()), 2)
+        self.assertEqual(
+            self.storage.metrics().get("failed_writes_total"), 1
+        )
+
+    def test_failed_write_keeps_tombstones(self):
+        """Ensure deletions of a failed write are recorded once written"""
+
+        self.storage.new(self.model_00)
+        self.storage.save()
+        self.storage.delete(self.model_00.super_id)
+
+        with patch("json.dump", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self.storage.save()
+
+        self.storage.save()
+        _, deleted = self.storage.changes()
+
+        self.assertEqual(set(deleted), {self.model_00.super_id})
+
+    def test_stopping_writes_pending_changes(self):
+        """Ensure no change is lost when write-behind is stopped"""
+
+        self.storage.write_behind(interval=60)
+        self.storage.new(self.model_00)
+        self.storage.save()
+        self.storage.write_behind(None)
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+
+        self.assertIn(self.model_00.super_id, other.all())
+
+    def test_flush_registered_at_exit_once(self):
+        """Ensure pending changes are written at exit"""
+
+        self.storage.write_behind(interval=60)
+        self.storage.write_behind(interval=30)
+
+        self.mock_register.assert_called_once_with(self.storage.flush)
+
+
+class TestThreads(TestOnDisk):
+    """Ensure storage is usable from many threads at once"""
+
+    @staticmethod
+    def stub_model(super_id):
+        """Provides a lightweight model of the given super id"""
+
+        return SimpleNamespace(
+            super_id=super_id, to_dict=lambda: {"id": super_id}
+        )
+
+    def run_threads(self, *targets):
+        """Runs each target in its own thread, collecting failures"""
+
+        errors = []
+
+        def run(target):
+            try:
+                target()
+            except Exception as exception:
+                errors.append(exception)
+
+        threads = [
+            threading.Thread(target=run, args=(target,)) for target in targets
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join(30)
+
+        return errors
+
+    def test_concurrent_reads_and_writes(self):
+        """Ensure readers and writers neither fail nor lose models"""
+
+        writing = threading.Event()
+        writing.set()
+
+        def write(prefix):
+            for number in range(300):
+                model = self.stub_model(f"BaseModel.{prefix}-{number}")
+                self.storage.new(model)
+
+                if not number % 3:
+                    self.storage.delete(model.super_id)
+
+                if not number % 25:
+                    self.storage.save()
+
+        def read():
+            while writing.is_set():
+                for key in list(self.storage.all()):
+                    self.storage.get(key)
+
+                self.storage.refresh()
+                self.storage.metrics()
+
+        def writers():
+            errors = self.run_threads(
+                *(lambda prefix=prefix: write(prefix) for prefix in range(8))
+            )
+            writing.clear()
+
+            if errors:
+                raise errors[0]
+
+        errors = self.run_threads(writers, *(read for _ in range(8)))
+        self.storage.save()
+
+        expect = {
+            f"BaseModel.{prefix}-{number}"
+            for prefix in range(8)
+            for number in range(300)
+            if number % 3
+        }
+
+        other = models.FileStorage(self.file_path)
+        other.reload()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(set(self.storage.all()), expect)
+        self.assertEqual(set(other.all()), expect)
+
+    def test_snapshots_iterated_while_writing(self):
+        """Ensure snapshots are iterated whole while models change"""
+
+        writing = threading.Event()
+        writing.set()
+
+        def write():
+            for number in range(2000):
+                model = self.stub_model(f"BaseModel.{number}")
+                self.storage.new(model)
+
+                if not number % 2:
+                    self.storage.delete(model.super_id)
+
+            writing.clear()
+
+        def read():
+            while writing.is_set():
+                snapshot = self.storage.snapshot()
+                length = len(snapshot)
+
+                self.assertEqual(sum(1 for _ in snapshot.items()), length)
+
+        errors = self.run_threads(write, *(read for _ in range(4)))
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.storage.snapshot()), 1000)
+
+    def test_batch_is_scoped_to_thread(self):
+        """Ensure a batch in one thread does not defer another's save"""
+
+        with self.storage.batch():
+            self.storage.new(self.stub_model("BaseModel.batched"))
+            errors = self.run_threads(self.storage.save)
+
+            self.assertEqual(errors, [])
+            self.assertEqual(self.storage.metrics().get("saves_total"), 1)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""Test suite regarding the time-ordered ids of models"""
+from unittest.mock import patch
+from importlib import import_module
+import unittest
+import time
+import uuid
+import os
+
+
+ids = import_module("models.engine.ids")
+
+
+class TestUUID7(unittest.TestCase):
+    """Collective testing of the version seven UUID generator"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.uuid7 = ids.UUID7()
+
+    def test_is_version_seven_uuid(self):
+        """Ensure ids are hyphenated version seven RFC UUIDs"""
+
+        id_ = self.uuid7()
+        parsed = uuid.UUID(id_)
+
+        self.assertEqual(str(parsed), id_)
+        self.assertEqual(parsed.version, 7)
+        self.assertEqual(parsed.variant, uuid.RFC_4122)
+
+    def test_leads_with_milliseconds(self):
+        """Ensure ids lead with the time of their creation"""
+
+        before = time.time_ns() // 1_000_000
+        millis = uuid.UUID(self.uuid7()).int >> 80
+        after = time.time_ns() // 1_000_000
+
+        self.assertTrue(before <= millis <= after)
+
+    def test_ids_strictly_increase(self):
+        """Ensure ids sort in order of creation"""
+
+        generated = [self.uuid7() for _ in range(10_000)]
+
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(len(set(generated)), len(generated))
+
+    def test_counter_overflow_within_millisecond(self):
+        """Ensure ids keep increasing when a millisecond is exhausted"""
+
+        with patch.object(ids, "time_ns", return_value=1_700_000_000_000_000):
+            generated = [self.uuid7() for _ in range(5_000)]
+
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(len(set(generated)), len(generated))
+
+        millis = {uuid.UUID(id_).int >> 80 for id_ in generated}
+        self.assertGreater(len(millis), 1)
+
+    def test_clock_moving_backwards(self):
+        """Ensure ids keep increasing should the clock move back"""
+
+        first = self.uuid7()
+
+        with patch.object(ids, "time_ns", return_value=0):
+            second = self.uuid7()
+
+        self.assertGreater(second, first)
+
+    def test_random_bytes_drawn_in_batches(self):
+        """Ensure the operating system is asked once per batch"""
+
+        with patch.object(ids.os, "urandom", wraps=os.urandom) as urandom:
+            for _ in range(ids.UUID7.BATCH * 2):
+                self.uuid7()
+
+        self.assertEqual(urandom.call_count, 2)
+
+    def test_reset_discards_random_bytes(self):
+        """Ensure a forked process draws random bytes of its own"""
+
+        self.uuid7()
+        self.uuid7.__reset__()
+
+        with patch.object(ids.os, "urandom", wraps=os.urandom) as urandom:
+            self.uuid7()
+
+        urandom.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
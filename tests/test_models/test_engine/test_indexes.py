@@ -0,0 +1,313 @@
+#!/usr/bin/python3
+"""Test suite regarding the indexes kept alongside storage"""
+from importlib import import_module
+import unittest
+import random
+
+
+indexes = import_module("models.engine.indexes")
+
+
+class TestSortedList(unittest.TestCase):
+    """Collective testing of the bucketed sorted list"""
+
+    def setUp(self):
+        """Test instance factory, small buckets forcing splits"""
+
+        self.values = indexes.SortedList()
+        self.values.LOAD = 4
+
+    def test_empty_list(self):
+        """Ensure an empty list holds nothing"""
+
+        self.assertEqual(len(self.values), 0)
+        self.assertEqual(list(self.values), [])
+        self.assertNotIn("a", self.values)
+
+        self.values.discard("a")
+        self.assertEqual(list(self.values.irange("a")), [])
+
+    def test_initial_values_are_sorted_and_unique(self):
+        """Ensure initial values are sorted with duplicates ignored"""
+
+        values = indexes.SortedList(["c", "a", "b", "a"])
+
+        self.assertEqual(list(values), ["a", "b", "c"])
+        self.assertEqual(len(values), 3)
+
+    def test_matches_sorted_set_under_random_changes(self):
+        """Ensure order is kept across many adds and discards"""
+
+        rng = random.Random(0)
+        expect = set()
+
+        for _ in range(2_000):
+            value = rng.randrange(300)
+
+            if rng.random() < 0.6:
+                self.values.add(value)
+                expect.add(value)
+            else:
+                self.values.discard(value)
+                expect.discard(value)
+
+        self.assertEqual(list(self.values), sorted(expect))
+        self.assertEqual(len(self.values), len(expect))
+
+        for value in range(300):
+            self.assertEqual(value in self.values, value in expect)
+
+    def test_irange(self):
+        """Ensure iteration starts at, or after, the given value"""
+
+        for value in range(0, 40, 2):
+            self.values.add(value)
+
+        self.assertEqual(list(self.values.irange(30)), [30, 32, 34, 36, 38])
+        self.assertEqual(
+            list(self.values.irange(30, inclusive=False)), [32, 34, 36, 38]
+        )
+        self.assertEqual(list(self.values.irange(31)), [32, 34, 36, 38])
+        self.assertEqual(list(self.values.irange(39)), [])
+        self.assertEqual(list(self.values.irange(-1))[:2], [0, 2])
+
+
+class TestIdIndex(unittest.TestCase):
+    """Collective testing of the index of ids by class"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.index = indexes.IdIndex()
+        self.index.build({
+            "User.b": {},
+            "User.a": {},
+            "Place.z": {},
+            "User.c": {},
+        })
+
+    def test_build(self):
+        """Ensure ids are grouped by class"""
+
+        self.assertTrue(self.index.built)
+        self.assertEqual(self.index.count("User"), 3)
+        self.assertEqual(self.index.count("Place"), 1)
+        self.assertEqual(self.index.count("Review"), 0)
+
+    def test_page(self):
+        """Ensure pages follow one another in order of id"""
+
+        self.assertEqual(self.index.page("User", limit=2), ["a", "b"])
+        self.assertEqual(self.index.page("User", "b", 2), ["c"])
+        self.assertEqual(self.index.page("User", "c", 2), [])
+        self.assertEqual(self.index.page("User"), ["a", "b", "c"])
+        self.assertEqual(self.index.page("Review"), [])
+
+    def test_complete(self):
+        """Ensure ids are completed from their prefix"""
+
+        self.index.add("User.ba", {})
+
+        self.assertEqual(self.index.complete("User", "b"), ["b", "ba"])
+        self.assertEqual(self.index.complete("User", "b", 1), ["b"])
+        self.assertEqual(
+            self.index.complete("User", ""), ["a", "b", "ba", "c"]
+        )
+        self.assertEqual(self.index.complete("User", "d"), [])
+        self.assertEqual(self.index.complete("Review", "a"), [])
+
+    def test_page_after_deleted_id(self):
+        """Ensure a page may start after an id since deleted"""
+
+        self.index.discard("User.b", {})
+
+        self.assertEqual(self.index.page("User", "b"), ["c"])
+
+    def test_add_and_discard(self):
+        """Ensure changes are reflected in pages"""
+
+        self.index.add("User.ab", {})
+        self.index.discard("User.c", {})
+        self.index.discard("Review.x", {})
+
+        self.assertEqual(self.index.page("User"), ["a", "ab", "b"])
+
+    def test_clear(self):
+        """Ensure a cleared index awaits being built anew"""
+
+        self.index.clear()
+
+        self.assertFalse(self.index.built)
+        self.assertEqual(self.index.count("User"), 0)
+
+
+class TestTextIndex(unittest.TestCase):
+    """Collective testing of the inverted index of text"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.index = indexes.TextIndex({"Review": ("text",)})
+        self.index.build({
+            "Review.a": {"text": "Quiet garden, quiet street"},
+            "Review.b": {"text": "A noisy street near the station"},
+            "Review.c": {"text": "Lovely garden"},
+            "User.d": {"text": "garden"},
+        })
+
+    def test_tokenise(self):
+        """Ensure text is split into lowercase words"""
+
+        terms = indexes.tokenise("Cosy loft, near the Tate!")
+        self.assertEqual(terms, ["cosy", "loft", "near", "the", "tate"])
+
+    def test_version_follows_changes(self):
+        """Ensure the version changes with the index alone"""
+
+        version = self.index.version
+
+        self.index.add("User.e", {"text": "garden"})
+        self.index.discard("Review.z", {"text": "garden"})
+        self.assertEqual(self.index.version, version)
+
+        self.index.add("Review.e", {"text": "garden"})
+        self.assertGreater(self.index.version, version)
+
+    def test_search_ranks_by_relevance(self):
+        """Ensure frequent and rare terms rank models higher"""
+
+        ids = [instance_id for instance_id, _ in self.index.search(
+            "Review", "quiet garden"
+        )]
+
+        self.assertEqual(ids, ["a", "c"])
+
+    def test_search_is_limited(self):
+        """Ensure no more results than the limit are provided"""
+
+        results = self.index.search("Review", "garden street", 1)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][0], "a")
+
+    def test_search_without_matches(self):
+        """Ensure unmatched terms and classes provide nothing"""
+
+        self.assertEqual(self.index.search("Review", "castle"), [])
+        self.assertEqual(self.index.search("Review", ""), [])
+        self.assertEqual(self.index.search("User", "garden"), [])
+
+    def test_add_and_discard(self):
+        """Ensure changes to text are reflected in results"""
+
+        self.index.discard("Review.c", {"text": "Lovely garden"})
+        self.index.add("Review.c", {"text": "Lovely castle"})
+
+        self.assertEqual(self.index.search("Review", "garden")[0][0], "a")
+        self.assertEqual(len(self.index.search("Review", "garden")), 1)
+        self.assertEqual(self.index.search("Review", "castle")[0][0], "c")
+
+    def test_serialisation_round_trip(self):
+        """Ensure a loaded index ranks as the original"""
+
+        copy = indexes.TextIndex({"Review": ("text",)})
+        copy.load(self.index.to_dict())
+
+        self.assertTrue(copy.built)
+        self.assertEqual(
+            copy.search("Review", "quiet street garden"),
+            self.index.search("Review", "quiet street garden"),
+        )
+
+
+class TestValueIndex(unittest.TestCase):
+    """Collective testing of the index of attribute values"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.index = indexes.ValueIndex({"Place": ("city_id", "user_id")})
+        self.index.build({
+            "Place.a": {"city_id": "x", "user_id": "u"},
+            "Place.b": {"city_id": "x", "user_id": "v"},
+            "Place.c": {"city_id": "y", "user_id": "u"},
+            "Place.d": {"city_id": None, "user_id": ["u"]},
+            "City.x": {"city_id": "x"},
+        })
+
+    def test_lookup(self):
+        """Ensure the models holding a value are found"""
+
+        lookup = self.index.lookup
+
+        self.assertEqual(lookup("Place", "city_id", "x"), {"a", "b"})
+        self.assertEqual(lookup("Place", "user_id", "u"), {"a", "c"})
+        self.assertEqual(lookup("Place", "city_id", "z"), set())
+
+    def test_lookup_of_unindexed_attribute(self):
+        """Ensure attributes and values not indexed are told apart"""
+
+        self.assertIsNone(self.index.lookup("Place", "name", "x"))
+        self.assertIsNone(self.index.lookup("City", "city_id", "x"))
+        self.assertIsNone(self.index.lookup("Place", "city_id", None))
+        self.assertIsNone(self.index.lookup("Place", "user_id", ["u"]))
+
+    def test_lookup_follows_changes(self):
+        """Ensure changed and deleted models are reflected"""
+
+        self.index.discard("Place.a", {"city_id": "x", "user_id": "u"})
+        self.index.add("Place.a", {"city_id": "y", "user_id": "u"})
+        self.index.discard("Place.b", {"city_id": "x", "user_id": "v"})
+
+        lookup = self.index.lookup
+
+        self.assertEqual(lookup("Place", "city_id", "x"), set())
+        self.assertEqual(lookup("Place", "city_id", "y"), {"a", "c"})
+
+    def test_clear(self):
+        """Ensure a cleared index is to be built anew"""
+
+        self.index.clear()
+
+        self.assertFalse(self.index.built)
+        self.assertEqual(self.index.lookup("Place", "city_id", "x"), set())
+
+
+class TestUpdatedIndex(unittest.TestCase):
+    """Collective testing of the index of update times"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.index = indexes.UpdatedIndex()
+        self.index.build({
+            "Place.a": {"updated_at": "2024-05-27T10:00:00"},
+            "Place.b": {"updated_at": "2024-05-27T09:00:00"},
+            "User.c": {"updated_at": "2024-05-28T00:00:00.000001"},
+            "User.d": {},
+        })
+
+    def test_since(self):
+        """Ensure models updated after a time are provided in order"""
+
+        self.assertEqual(
+            self.index.since(), ["Place.b", "Place.a", "User.c"]
+        )
+        self.assertEqual(
+            self.index.since("2024-05-27T09:00:00"), ["Place.a", "User.c"]
+        )
+        self.assertEqual(self.index.since("2024-05-28"), ["User.c"])
+        self.assertEqual(self.index.since("2024-05-29"), [])
+
+    def test_since_follows_changes(self):
+        """Ensure updated and deleted models are reflected"""
+
+        self.index.discard("Place.b", {"updated_at": "2024-05-27T09:00:00"})
+        self.index.add("Place.b", {"updated_at": "2024-05-29T00:00:00"})
+        self.index.discard(
+            "User.c", {"updated_at": "2024-05-28T00:00:00.000001"}
+        )
+
+        self.assertEqual(
+            self.index.since("2024-05-27T09:30"), ["Place.a", "Place.b"]
+        )
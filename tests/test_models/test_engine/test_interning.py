@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""Test suite regarding the interning of values as stores are read"""
+from importlib import import_module
+import unittest
+import json
+
+
+interning = import_module("models.engine.interning")
+
+
+class TestInterner(unittest.TestCase):
+    """Collective testing of the JSON object hook sharing values"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.interner = interning.Interner()
+
+    def load(self, text):
+        """Deserialises JSON text through the interner"""
+
+        return json.loads(text, object_hook=self.interner)
+
+    def test_shares_strings(self):
+        """Ensure equal short strings are one object"""
+
+        city = '{"city_id": "' + "c" * 36 + '"}'
+        first, second = self.load(f"[{city}, {city}]")
+
+        self.assertIs(first["city_id"], second["city_id"])
+        self.assertEqual(len(self.interner), 1)
+
+    def test_long_strings_unshared(self):
+        """Ensure strings longer than the limit are left alone"""
+
+        text = "d" * (interning.Interner.LENGTH + 1)
+        first, second = self.load(
+            f'[{{"text": "{text}"}}, {{"text": "{text}"}}]'
+        )
+
+        self.assertEqual(first["text"], second["text"])
+        self.assertIsNot(first["text"], second["text"])
+        self.assertEqual(len(self.interner), 0)
+
+    def test_shares_small_lists(self):
+        """Ensure equal small lists of strings are one object"""
+
+        first, second, third = self.load(
+            '[{"ids": ["a", "b"]}, {"ids": ["a", "b"]}, {"ids": []}]'
+        )
+
+        self.assertIs(first["ids"], second["ids"])
+        self.assertEqual(first["ids"], ["a", "b"])
+        self.assertEqual(third["ids"], [])
+
+    def test_other_lists_unshared(self):
+        """Ensure lists of other values, or too long, are left alone"""
+
+        size = interning.Interner.SIZE + 1
+        numbers, long_ = self.load(
+            json.dumps([{"ids": [1, 2]}, {"ids": ["a"] * size}])
+        )
+
+        self.assertEqual(numbers["ids"], [1, 2])
+        self.assertEqual(long_["ids"], ["a"] * size)
+        self.assertEqual(len(self.interner), 0)
+
+    def test_other_values_kept(self):
+        """Ensure numbers, nested objects and keys are decoded as is"""
+
+        loaded = self.load('{"n": 1, "f": 1.5, "b": true, "o": {"k": null}}')
+
+        self.assertEqual(
+            loaded, {"n": 1, "f": 1.5, "b": True, "o": {"k": None}}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+"""Test suite regarding the instruments measuring performance"""
+from importlib import import_module
+from pathlib import Path
+import tempfile
+import unittest
+import time
+
+
+metrics = import_module("models.engine.metrics")
+
+
+class TestHistogram(unittest.TestCase):
+    """Collective testing of the log-linear histogram"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.histogram = metrics.Histogram()
+
+    def test_empty_histogram(self):
+        """Ensure an empty histogram reports zeroes"""
+
+        self.assertEqual(self.histogram.count, 0)
+        self.assertEqual(self.histogram.percentile(99), 0)
+        self.assertEqual(self.histogram.mean(), 0)
+
+    def test_small_values_are_exact(self):
+        """Ensure values within the precision are counted exactly"""
+
+        for value in range(1, 101):
+            self.histogram.record(value)
+
+        self.assertEqual(self.histogram.count, 100)
+        self.assertEqual(self.histogram.percentile(50), 50)
+        self.assertEqual(self.histogram.percentile(95), 95)
+        self.assertEqual(self.histogram.percentile(100), 100)
+        self.assertEqual(self.histogram.min, 1)
+        self.assertEqual(self.histogram.max, 100)
+
+    def test_large_values_within_relative_error(self):
+        """Ensure large values are reported within the precision"""
+
+        for value in range(1, 100_001):
+            self.histogram.record(value)
+
+        p99 = self.histogram.percentile(99)
+        error = 1 / 2 ** (self.histogram.precision - 1)
+
+        self.assertAlmostEqual(p99, 99_000, delta=99_000 * error)
+        self.assertLess(len(self.histogram.buckets), 2_000)
+        self.assertEqual(self.histogram.max, 100_000)
+
+    def test_serialisation_round_trip(self):
+        """Ensure a histogram survives serialisation"""
+
+        for value in [3, 300, 30_000]:
+            self.histogram.record(value)
+
+        copy = metrics.Histogram.from_dict(self.histogram.to_dict())
+
+        self.assertEqual(copy.to_dict(), self.histogram.to_dict())
+        self.assertEqual(copy.percentile(50), self.histogram.percentile(50))
+
+
+class TestMetrics(unittest.TestCase):
+    """Collective testing of counters and timers"""
+
+    def setUp(self):
+        """Test instance factory"""
+
+        self.metrics = metrics.Metrics()
+
+    def test_increment(self):
+        """Ensure counters are created and incremented"""
+
+        self.metrics.increment("saves_total")
+        self.metrics.increment("bytes_written_total", 512)
+        self.metrics.increment("bytes_written_total", 512)
+
+        self.assertEqual(self.metrics.get("saves_total"), 1)
+        self.assertEqual(self.metrics.get("bytes_written_total"), 1024)
+        self.assertEqual(self.metrics.get("absent"), 0)
+
+    def test_timer(self):
+        """Ensure timers accumulate seconds and count"""
+
+        for _ in range(2):
+            with self.metrics.timer("json_dump"):
+                pass
+
+        snapshot = self.metrics.snapshot()
+
+        self.assertEqual(snapshot.get("json_dump_count"), 2)
+        self.assertGreaterEqual(snapshot.get("json_dump_seconds"), 0)
+
+    def test_reset(self):
+        """Ensure counters can be cleared"""
+
+        self.metrics.increment("saves_total")
+        self.metrics.reset()
+
+        self.assertEqual(self.metrics.snapshot(), {})
+
+    def test_to_prometheus(self):
+        """Ensure metrics are typed by their suffix"""
+
+        text = metrics.to_prometheus(
+            {"saves_total": 3, "objects": 10}, "airbnb_storage"
+        )
+
+        self.assertEqual(
+            text.splitlines(),
+            [
+                "# TYPE airbnb_storage_objects gauge",
+                "airbnb_storage_objects 10",
+                "# TYPE airbnb_storage_saves_total counter",
+                "airbnb_storage_saves_total 3",
+            ],
+        )
+
+
+class TestExporter(unittest.TestCase):
+    """Collective testing of the periodic export of metrics"""
+
+    def test_failed_writes_are_counted(self):
+        """Ensure a failed write neither raises nor ends the thread"""
+
+        registry = metrics.Metrics()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(f"{directory}/missing/m.prom")
+            exporter = metrics.Exporter(
+                lambda: "up 1\n", str(path), 0.01, registry
+            )
+            exporter.start()
+            time.sleep(0.05)
+
+            path.parent.mkdir()
+            time.sleep(0.05)
+
+            self.assertTrue(exporter.is_alive())
+            self.assertEqual(path.read_text(), "up 1\n")
+            exporter.stop()
+
+        self.assertGreater(
+            registry.get("metrics_export_failures_total"), 0
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()